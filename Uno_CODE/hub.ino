@@ -14,6 +14,27 @@ const unsigned long GO_SIGNAL_INTERVAL = 10;  // 10 milliseconds
 bool sendToPlayer1 = true;  // Alternate between players
 bool waitingForRoll = false;  // Track if we're waiting for a roll
 
+// Binary protocol (see src/utils/binary_protocol.py) - text mode until Python asks for it
+const uint8_t PROTO_SYNC = 0xA5;
+const uint8_t OP_ROLL = 0x01;
+const uint8_t OP_PROPERTY_INDEX = 0x10;
+const uint8_t OP_PROPERTY_NAME = 0x11;
+const uint8_t MAX_PAYLOAD = 32;
+bool binaryMode = false;
+uint8_t frameBuffer[MAX_PAYLOAD + 4];  // sync, opcode, length, payload, crc
+uint8_t framePos = 0;
+char textLine[40];  // Text received between frames (see readTextByte)
+uint8_t textPos = 0;
+
+// Property names by board position (for property-index frames). This is the default
+// board (src/game_logic/boards/default.json); on other boards Python sends the names.
+const char PROPERTY_NAMES[28][16] PROGMEM = {
+  "GO", "JARVIS", "BONNER", "EDUROAM", "FURNAS", "KNOW", "KETTER",
+  "JAIL", "GOVENORS", "HADLY", "GRIENER", "LOST", "ELLICOTT", "FLINT",
+  "FREE PARKING", "NSC", "DINNING RELOAD", "SILVERMAN", "LOCKWOOD", "SLEE", "ACADEMIC CENTER",
+  "GO TO JAIL", "CAPEN", "TALBERT", "EMON", "BALDY", "DAVIS", "COMMONS"
+};
+
 void setup() {
   Serial.begin(9600);
   // Wait for Serial connection to be established
@@ -38,28 +59,155 @@ void setup() {
   lastGoSignalTime = millis();  // Initialize timer
 }
 
+// CRC-8, polynomial 0x07 (matches crc8() in binary_protocol.py)
+uint8_t crc8Update(uint8_t crc, uint8_t data) {
+  crc ^= data;
+  for (uint8_t i = 0; i < 8; i++) {
+    crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ 0x07) : (uint8_t)(crc << 1);
+  }
+  return crc;
+}
+
+void sendFrame(uint8_t opcode, const uint8_t *payload, uint8_t length) {
+  uint8_t crc = crc8Update(crc8Update(0, opcode), length);
+  Serial.write(PROTO_SYNC);
+  Serial.write(opcode);
+  Serial.write(length);
+  for (uint8_t i = 0; i < length; i++) {
+    Serial.write(payload[i]);
+    crc = crc8Update(crc, payload[i]);
+  }
+  Serial.write(crc);
+}
+
+// Send a roll event to Python ("P<n>,Roll" or a binary frame)
+void sendRoll(uint8_t player) {
+  if (binaryMode) {
+    sendFrame(OP_ROLL, &player, 1);
+  } else {
+    Serial.print("P");
+    Serial.print(player);
+    Serial.println(",Roll");
+  }
+}
+
+// Store and display a new property name
+void setProperty() {
+  propertyNameUpdated = true;
+  updateScreen(String(propertyName));
+  
+  if (!binaryMode) {
+    // Echo back to Serial for confirmation
+    Serial.print("Received property: ");
+    Serial.println(propertyName);
+  }
+}
+
+void handleFrame(uint8_t opcode, const uint8_t *payload, uint8_t length) {
+  if (opcode == OP_PROPERTY_INDEX && length == 1 && payload[0] < 28) {
+    strncpy_P(propertyName, PROPERTY_NAMES[payload[0]], sizeof(propertyName) - 1);
+    propertyName[sizeof(propertyName) - 1] = '\0';
+    setProperty();
+  } else if (opcode == OP_PROPERTY_NAME) {
+    uint8_t n = length < sizeof(propertyName) - 1 ? length : sizeof(propertyName) - 1;
+    memcpy(propertyName, payload, n);
+    propertyName[n] = '\0';
+    setProperty();
+  }
+}
+
+// Binary mode, outside a frame: collect bytes as a text line. Python only sends text
+// when it thinks the hub is in text mode (e.g. it restarted without resetting the board),
+// so a complete text line switches back to text mode and is handled as usual - this
+// lets "READY?" and "PROTO BIN 1" work again.
+void readTextByte(uint8_t b) {
+  if (b == '\n') {
+    textLine[textPos] = '\0';
+    textPos = 0;
+    String message = String(textLine);
+    message.trim();
+    if (message.length() > 0) {
+      binaryMode = false;
+      handleTextLine(message);
+    }
+  } else if ((b >= 0x20 && b < 0x7F) || b == '\r') {
+    if (textPos < sizeof(textLine) - 1) {
+      textLine[textPos++] = b;
+    }
+  } else {
+    textPos = 0;  // Not text - drop the partial line
+  }
+}
+
+// Feed one received byte to the frame parser
+void readFrameByte(uint8_t b) {
+  if (framePos == 0) {
+    if (b == PROTO_SYNC) {
+      frameBuffer[framePos++] = b;
+      textPos = 0;
+    } else {
+      readTextByte(b);
+    }
+    return;
+  }
+  frameBuffer[framePos++] = b;
+  if (framePos == 3 && frameBuffer[2] > MAX_PAYLOAD) {
+    framePos = 0;  // Bad length - wait for the next sync byte
+    return;
+  }
+  if (framePos >= 3 && framePos == 4 + frameBuffer[2]) {
+    uint8_t crc = 0;
+    for (uint8_t i = 1; i < framePos - 1; i++) {
+      crc = crc8Update(crc, frameBuffer[i]);
+    }
+    if (crc == frameBuffer[framePos - 1]) {
+      handleFrame(frameBuffer[1], frameBuffer + 3, frameBuffer[2]);
+    }
+    framePos = 0;
+  }
+}
+
+// Handle one text-mode line from Python
+void handleTextLine(String message) {
+  // Python asks to switch to the binary protocol
+  if (message == "PROTO BIN 1") {
+    Serial.println("PROTO BIN 1 OK");
+    binaryMode = true;
+    framePos = 0;
+    textPos = 0;
+    return;
+  }
+  
+  // Python probing the port (the board may not have reset when it was opened)
+  if (message == "READY?") {
+    Serial.println("Arduino Ready");
+    return;
+  }
+  
+  // Check if message is in format "Property: <name>"
+  if (message.startsWith("Property: ")) {
+    String propName = message.substring(10);  // Extract property name after "Property: "
+    propName.trim();
+    
+    // Copy to propertyName buffer (max 31 chars + null terminator)
+    propName.toCharArray(propertyName, sizeof(propertyName));
+    setProperty();
+  }
+}
+
 // Function to read messages from Serial (from Python)
 void readPropertyFromSerial() {
+  if (binaryMode) {
+    while (binaryMode && Serial.available() > 0) {
+      readFrameByte(Serial.read());
+    }
+    return;
+  }
+  
   if (Serial.available() > 0) {
     String message = Serial.readStringUntil('\n');
     message.trim();
-    
-    // Check if message is in format "Property: <name>"
-    if (message.startsWith("Property: ")) {
-      String propName = message.substring(10);  // Extract property name after "Property: "
-      propName.trim();
-      
-      // Copy to propertyName buffer (max 31 chars + null terminator)
-      propName.toCharArray(propertyName, sizeof(propertyName));
-      propertyNameUpdated = true;
-      
-      // Display property name on OLED screen
-      updateScreen(propName);
-      
-      // Echo back to Serial for confirmation
-      Serial.print("Received property: ");
-      Serial.println(propertyName);
-    }
+    handleTextLine(message);
   }
 }
 
@@ -106,14 +254,16 @@ void loop() {
   waitingForRoll = false;
   
   delay(300);
-  Serial.println("P1,Roll");  // Send roll event to Python
+  sendRoll(1);  // Send roll event to Python
   delay(300);
 
   // Send property name via NRF to player device (if updated)
   if (propertyNameUpdated) {
     send(propertyName);
-    Serial.print("Sent property via NRF: ");
-    Serial.println(propertyName);
+    if (!binaryMode) {
+      Serial.print("Sent property via NRF: ");
+      Serial.println(propertyName);
+    }
     propertyNameUpdated = false;  // Reset flag
     delay(500);
   }
@@ -139,7 +289,7 @@ void loop() {
   waitingForRoll = false;
   
   delay(300);
-  Serial.println("P2,Roll");  // Send roll event to Python
+  sendRoll(2);  // Send roll event to Python
   delay(300);
   
   check++;
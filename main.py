@@ -1,19 +1,39 @@
 """
 Main entry point for the Monopoly game
 """
+import argparse
 import pygame
 from src.graphics.game_window import GameWindow
 from src.graphics.board import BoardRenderer
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Digiware Monopoly")
+    parser.add_argument("--port", action="append", default=None,
+                        help="Arduino Serial port (default: auto-detect); repeat for several controllers")
+    parser.add_argument("--test-mode", action="store_true", help="Run without an Arduino")
+    parser.add_argument("--protocol", choices=["text", "binary"], default="text",
+                        help="Serial protocol (binary needs hub firmware support, falls back to text)")
+    parser.add_argument("--event-log", default=None, help="Record a binary event log of the game to this file")
+    parser.add_argument("--speed", type=float, default=1.0, help="Animation speed factor (e.g. 4 for fast demos)")
+    parser.add_argument("--metrics-file", default=None,
+                        help="Keep frame profiler metrics (Prometheus text format) in this file")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve frame profiler metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--board", default=None,
+                        help="Board definition file (.json or .toml, default: src/game_logic/boards/default.json)")
+    parser.add_argument("--dice", type=int, choices=[1, 2], default=1, help="Dice rolled per turn")
+    args = parser.parse_args()
+
     pygame.init()
 
 
-    game = GameWindow()
+    game = GameWindow(event_log_path=args.event_log, port=args.port, test_mode=args.test_mode,
+                      protocol=args.protocol, animation_speed=args.speed, num_dice=args.dice,
+                      metrics_path=args.metrics_file, metrics_port=args.metrics_port,
+                      board_path=args.board)
     game.run()
     pygame.quit()
 
 if __name__ == "__main__":
     main()
-
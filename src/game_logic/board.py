@@ -0,0 +1,262 @@
+"""
+Board definitions
+A board is a data file (JSON, or TOML on Python 3.11+) listing its spaces in
+board order, starting at GO:
+
+    {
+      "name": "Hackopoly",
+      "go_salary": 200,
+      "starting_money": 1500,
+      "background": "properties/Group 46.png",   (image under images/images, optional)
+      "spaces": [
+        {"name": "GO", "type": "special"},
+        {"name": "JARVIS", "type": "property", "price": 60, "rent": 20, "group": "brown"},
+        ...
+      ]
+    }
+
+load_board() validates the file and compiles it into a Board: flat arrays indexed
+by position (type and group as small integer codes, price, rent, landing rule)
+plus the positions the rules need (Jail, Go To Jail). The game, renderers and
+simulations read the board size and special positions from it instead of
+hard-coding them, so another board is just another file.
+
+Usage:
+    board = load_board()  # the default board (boards/default.json)
+    board = load_board("boards/campus.toml")
+"""
+import hashlib
+import json
+import os
+from array import array
+from enum import IntEnum
+
+BOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "boards")
+DEFAULT_BOARD_PATH = os.path.join(BOARD_DIR, "default.json")
+
+
+class SpaceType(IntEnum):
+    """Kind of space (the type code stored in Board.types)"""
+    PROPERTY = 0
+    UTILITY = 1
+    RAILROAD = 2
+    SPECIAL = 3  # GO, cards, taxes - nothing to buy
+    VISITING = 4  # Jail / Just Visiting
+    PARKING = 5
+    GO_TO_JAIL = 6
+
+
+# Type names as written in board files (and kept in Property.property_type)
+SPACE_TYPE_NAMES = {
+    'property': SpaceType.PROPERTY,
+    'utility': SpaceType.UTILITY,
+    'railroad': SpaceType.RAILROAD,
+    'special': SpaceType.SPECIAL,
+    'visiting': SpaceType.VISITING,
+    'parking': SpaceType.PARKING,
+    'jail': SpaceType.GO_TO_JAIL,
+}
+
+
+class Landing(IntEnum):
+    """What GameState.handle_landing does on a space (the code stored in Board.landing)"""
+    NOTHING = 0
+    SPECIAL = 1  # Report the special space
+    OWNABLE = 2  # Buy if unowned, pay rent if someone else owns it
+
+
+LANDING_BY_TYPE = {
+    SpaceType.PROPERTY: Landing.OWNABLE,
+    SpaceType.UTILITY: Landing.OWNABLE,
+    SpaceType.RAILROAD: Landing.OWNABLE,
+    SpaceType.SPECIAL: Landing.SPECIAL,
+    SpaceType.VISITING: Landing.NOTHING,
+    SpaceType.PARKING: Landing.NOTHING,
+    SpaceType.GO_TO_JAIL: Landing.NOTHING,  # The move itself sends the player to Jail
+}
+
+# Ownership masks are packed into one 64-bit field per player in GameState.snapshot()
+MAX_SPACES = 64
+
+BUYABLE_TYPES = frozenset(name for name, space_type in SPACE_TYPE_NAMES.items()
+                          if LANDING_BY_TYPE[space_type] == Landing.OWNABLE)
+NO_GROUP = -1
+
+
+class BoardError(ValueError):
+    """The board definition is invalid"""
+
+
+class Board:
+    """A compiled board: per-position lookup arrays and the positions the rules need"""
+
+    def __init__(self, name, spaces, go_salary=200, starting_money=1500, background=None, source=None):
+        """
+        Args:
+            name: Board name
+            spaces: List of dicts with name, type and optional price, rent, group (see module docstring)
+            go_salary: Money for passing or landing on GO
+            starting_money: Money each player starts with
+            background: Board image (path under images/images), or None for the default art
+            source: File the definition came from (for error messages)
+
+        Raises:
+            BoardError if the definition is invalid
+        """
+        where = f" in {source}" if source else ""
+        if not isinstance(spaces, list) or not spaces:
+            raise BoardError(f"Board needs a non-empty list of spaces{where}")
+        size = len(spaces)
+        if size < 8 or size % 4 or size > MAX_SPACES:
+            raise BoardError(f"Board needs 4 corners and the same number of spaces on each side"
+                             f" (a multiple of 4, 8 to {MAX_SPACES}), got {size} spaces{where}")
+        for key, value in (('go_salary', go_salary), ('starting_money', starting_money)):
+            if not isinstance(value, int) or value < 0:
+                raise BoardError(f"{key} must be a non-negative integer, got {value!r}{where}")
+
+        self.name = name
+        self.size = size
+        self.cells_per_side = size // 4 - 1  # Spaces between two corners
+        self.go_salary = go_salary
+        self.starting_money = starting_money
+        self.background = background
+        self.source = source
+
+        self.names = []
+        self.type_names = []  # As written in the file ('property', 'special', ...)
+        self.types = array('B')  # SpaceType codes
+        self.prices = array('i')
+        self.rents = array('i')
+        self.groups = array('b')  # Index into group_names, NO_GROUP if none
+        self.group_names = []
+        self.landing = array('B')  # Landing codes
+        group_index = {}
+        for position, space in enumerate(spaces):
+            name, type_name, price, rent, group = _parse_space(space, f"space {position}{where}")
+            space_type = SPACE_TYPE_NAMES[type_name]
+            if group is None:
+                code = NO_GROUP
+            else:
+                code = group_index.get(group)
+                if code is None:
+                    code = group_index[group] = len(self.group_names)
+                    self.group_names.append(group)
+            self.names.append(name)
+            self.type_names.append(type_name)
+            self.types.append(space_type)
+            self.prices.append(price)
+            self.rents.append(rent)
+            self.groups.append(code)
+            self.landing.append(LANDING_BY_TYPE[space_type])
+        self.names = tuple(self.names)
+        self.type_names = tuple(self.type_names)
+        self.group_names = tuple(self.group_names)
+
+        # Identifies the layout and rules (not the file name) - event logs record it
+        self.digest = hashlib.sha256(repr((
+            self.names, bytes(self.types), self.prices.tolist(), self.rents.tolist(),
+            [self.group_of(position) for position in range(size)], go_salary, starting_money,
+        )).encode('utf-8')).digest()[:8]
+
+        self.jail_position = self._single_position(SpaceType.VISITING, "Jail ('visiting')", where)
+        self.go_to_jail_position = self._single_position(SpaceType.GO_TO_JAIL, "Go To Jail ('jail')", where)
+        if self.go_to_jail_position is not None and self.jail_position is None:
+            raise BoardError(f"Board has Go To Jail but no Jail ('visiting') space{where}")
+
+    def _single_position(self, space_type, label, where):
+        """Position of the only space of a type, None if there is none"""
+        positions = [position for position, code in enumerate(self.types) if code == space_type]
+        if len(positions) > 1:
+            raise BoardError(f"Board has more than one {label} space (positions {positions}){where}")
+        return positions[0] if positions else None
+
+    @property
+    def corners(self):
+        """Positions of the four corners, counter-clockwise from GO"""
+        side = self.cells_per_side + 1
+        return (0, side, 2 * side, 3 * side)
+
+    @property
+    def is_default(self):
+        """True for the default board (the layout hub.ino's built-in property name table describes)"""
+        return self.source == DEFAULT_BOARD_PATH
+
+    def is_buyable(self, position):
+        return self.landing[position] == Landing.OWNABLE
+
+    def group_of(self, position):
+        """Group name of a space, or None"""
+        code = self.groups[position]
+        return self.group_names[code] if code != NO_GROUP else None
+
+    def __repr__(self):
+        return f"Board({self.name!r}, {self.size} spaces)"
+
+
+def _parse_space(space, label):
+    """Validated (name, type name, price, rent, group) of one space entry"""
+    if not isinstance(space, dict):
+        raise BoardError(f"{label}: expected an object, got {space!r}")
+    unknown = set(space) - {'name', 'type', 'price', 'rent', 'group'}
+    if unknown:
+        raise BoardError(f"{label}: unknown keys {sorted(unknown)}")
+    name = space.get('name')
+    if not isinstance(name, str) or not name:
+        raise BoardError(f"{label}: needs a name")
+    type_name = space.get('type', 'property')
+    if type_name not in SPACE_TYPE_NAMES:
+        raise BoardError(f"{label} ({name}): unknown type {type_name!r}, expected one of {sorted(SPACE_TYPE_NAMES)}")
+    values = []
+    for key in ('price', 'rent'):
+        value = space.get(key, 0)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise BoardError(f"{label} ({name}): {key} must be a non-negative integer, got {value!r}")
+        values.append(value)
+    group = space.get('group')
+    if group is not None and not isinstance(group, str):
+        raise BoardError(f"{label} ({name}): group must be a string")
+    return name, type_name, values[0], values[1], group
+
+
+_boards = {}  # Absolute path -> Board (boards never change once loaded)
+
+
+def load_board(path=None):
+    """
+    Load, validate and compile a board file (each file is compiled once).
+
+    Args:
+        path: .json or .toml board file (default: DEFAULT_BOARD_PATH)
+
+    Returns:
+        Board
+
+    Raises:
+        BoardError if the file cannot be read or the definition is invalid
+    """
+    path = os.path.abspath(path or DEFAULT_BOARD_PATH)
+    board = _boards.get(path)
+    if board is not None:
+        return board
+    try:
+        if path.endswith(".toml"):
+            import tomllib  # Python 3.11+
+            with open(path, 'rb') as f:
+                definition = tomllib.load(f)
+        else:
+            with open(path) as f:
+                definition = json.load(f)
+    except ImportError:
+        raise BoardError(f"TOML boards need Python 3.11 or newer: {path}")
+    except (OSError, ValueError) as e:
+        raise BoardError(f"Cannot read board {path}: {e}")
+    if not isinstance(definition, dict):
+        raise BoardError(f"Board file must hold an object: {path}")
+    unknown = set(definition) - {'name', 'spaces', 'go_salary', 'starting_money', 'background'}
+    if unknown:
+        raise BoardError(f"Unknown board keys {sorted(unknown)} in {path}")
+    board = Board(definition.get('name', os.path.splitext(os.path.basename(path))[0]), definition.get('spaces'),
+                  definition.get('go_salary', 200), definition.get('starting_money', 1500),
+                  definition.get('background'), source=path)
+    _boards[path] = board
+    return board
@@ -0,0 +1,283 @@
+"""
+Append-only binary event log and deterministic replay
+GameState emits one fixed-size record per state change (see EVENT_* below) into a
+memory-mapped file. EventReplayer rebuilds the game at any event or turn from it.
+
+Record layout (8 bytes, little endian): event type (u8), player index (u8),
+arg a (i16), arg b (i32). Unused records are all zero, so a log from a crashed
+process can still be read up to the last event written.
+
+The header names the board the game was played on (its file, empty for the
+default board, and Board.digest); replay loads that board and refuses one whose
+digest differs. Version 1 logs have no board and replay on the default board.
+
+Usage:
+    python -m src.game_logic.event_log game.evlog --turn 10
+    python -m src.game_logic.event_log game.evlog --board moved/campus.json
+"""
+import argparse
+import mmap
+import os
+import struct
+import time
+from src.game_logic.board import load_board
+
+# Event types (0 is reserved for "no event" / unused space)
+EVENT_ADD_PLAYER = 1  # player
+EVENT_ROLL = 2  # player, a = dice roll
+EVENT_MOVE = 3  # player, a = new position, b = flags (MOVE_PASSED_GO | MOVE_LANDED_ON_GO | MOVE_WENT_TO_JAIL)
+EVENT_JAIL_ENTER = 4  # player
+EVENT_JAIL_SKIP = 5  # player sat out a turn in jail
+EVENT_JAIL_EXIT = 6  # player released from jail
+EVENT_BUY = 7  # player, a = position, b = price
+EVENT_RENT = 8  # player, a = position, b = amount paid to the owner
+EVENT_BANKRUPT = 9  # player
+EVENT_TURN = 10  # a = new current_player_index
+
+EVENT_NAMES = {
+    EVENT_ADD_PLAYER: 'add_player',
+    EVENT_ROLL: 'roll',
+    EVENT_MOVE: 'move',
+    EVENT_JAIL_ENTER: 'jail_enter',
+    EVENT_JAIL_SKIP: 'jail_skip',
+    EVENT_JAIL_EXIT: 'jail_exit',
+    EVENT_BUY: 'buy',
+    EVENT_RENT: 'rent',
+    EVENT_BANKRUPT: 'bankrupt',
+    EVENT_TURN: 'turn',
+}
+
+MOVE_PASSED_GO = 1
+MOVE_LANDED_ON_GO = 2
+MOVE_WENT_TO_JAIL = 4
+
+MAGIC = b'DMEV'
+VERSION = 2
+HEADER = struct.Struct('<4sHHQ')  # magic, version, record size, record count (updated on flush)
+BOARD_HEADER = struct.Struct('<8sH')  # Board.digest, length of the board path that follows (version 2+)
+RECORD = struct.Struct('<BBhi')
+
+
+class EventLog:
+    """Append-only, memory-mapped log of game events"""
+
+    def __init__(self, path, capacity=65536, board=None):
+        """
+        Create a new log file. An existing file is never overwritten - it may be the
+        only record of an earlier (possibly crashed) session.
+
+        Args:
+            path: File to create
+            capacity: Records to preallocate; the file doubles in size when full
+            board: Board the game is played on (default: the default board)
+
+        Raises:
+            FileExistsError if path already exists
+        """
+        board = board if board is not None else load_board()
+        board_path = b'' if board.is_default or board.source is None else board.source.encode('utf-8')
+        self.path = path
+        self.count = 0
+        self.capacity = capacity
+        self._records_offset = HEADER.size + BOARD_HEADER.size + len(board_path)
+        try:
+            self._file = open(path, 'x+b')
+        except FileExistsError:
+            raise FileExistsError(f"Event log {path} already exists - choose another file or move it away")
+        self._file.truncate(self._records_offset + capacity * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, 0)
+        BOARD_HEADER.pack_into(self._map, HEADER.size, board.digest, len(board_path))
+        self._map[HEADER.size + BOARD_HEADER.size:self._records_offset] = board_path
+
+    def append(self, event_type, player=0, a=0, b=0):
+        """Write one event"""
+        if self.count == self.capacity:
+            self._grow()
+        RECORD.pack_into(self._map, self._records_offset + self.count * RECORD.size, event_type, player, a, b)
+        self.count += 1
+
+    def _grow(self):
+        self.capacity *= 2
+        self._map.close()
+        self._file.truncate(self._records_offset + self.capacity * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def flush(self):
+        """Record the event count in the header and flush to disk"""
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, self.count)
+        self._map.flush()
+
+    def close(self):
+        """Flush and trim the unused preallocated space"""
+        if self._map.closed:
+            return
+        self.flush()
+        self._map.close()
+        self._file.truncate(self._records_offset + self.count * RECORD.size)
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+
+def read_events(path):
+    """
+    Load the events of a log file.
+
+    Returns:
+        bytes holding the packed records (use RECORD.iter_unpack to decode)
+    """
+    return read_log(path)[0]
+
+
+def read_log(path):
+    """
+    Load the events of a log file and the board it was recorded on.
+
+    Returns:
+        (records: bytes, board_path: str or None for the default board,
+         board_digest: bytes or None for a version 1 log)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, record_size, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a game event log")
+    if version not in (1, VERSION):
+        raise ValueError(f"Unsupported event log version {version}")
+
+    offset = HEADER.size
+    board_path = board_digest = None
+    if version >= 2:
+        board_digest, path_length = BOARD_HEADER.unpack_from(data, offset)
+        offset += BOARD_HEADER.size
+        board_path = data[offset:offset + path_length].decode('utf-8') or None
+        offset += path_length
+
+    records = data[offset:]
+    records = records[:len(records) - len(records) % RECORD.size]
+    # The header count may lag behind after a crash; unused space is zero-filled
+    end = count * RECORD.size
+    while end < len(records) and records[end] != 0:
+        end += RECORD.size
+    return records[:end], board_path, board_digest
+
+
+class EventReplayer:
+    """Rebuilds a GameState from an event log"""
+
+    def __init__(self, source, board=None):
+        """
+        Args:
+            source: Path to a log file, or packed records (bytes) from read_events
+            board: Board to replay on (default: the board named in the log, or the default
+                   board for packed records and version 1 logs) - e.g. when the board file moved
+
+        Raises:
+            ValueError if the board differs from the one the log was recorded on
+        """
+        board_path = board_digest = None
+        if isinstance(source, (str, os.PathLike)):
+            source, board_path, board_digest = read_log(source)
+        if board is None:
+            board = load_board(board_path)
+        if board_digest is not None and board.digest != board_digest:
+            raise ValueError(f"The log was recorded on another board than {board!r}"
+                             f" ({board_path or 'the default board'} when it was recorded)")
+        self.records = source
+        self.board = board
+
+    def __len__(self):
+        return len(self.records) // RECORD.size
+
+    def replay(self, until_event=None, until_turn=None):
+        """
+        Replay events onto a fresh game on self.board (initialize_all_properties).
+        Player names are not logged, so players are named "Player N".
+
+        Args:
+            until_event: Stop after this many events
+            until_turn: Stop once this many EVENT_TURN events have been applied
+
+        Returns:
+            (game_state: GameState, events_applied: int, turns: int)
+        """
+        from src.game_logic.game_state import GameState, Player
+
+        board = self.board
+        state = GameState(board=board)
+        state.initialize_all_properties()
+        players = state.players
+        by_position = state.properties_by_position
+
+        records = self.records
+        if until_event is not None:
+            records = records[:until_event * RECORD.size]
+
+        applied = 0
+        turns = 0
+        for event_type, index, a, b in RECORD.iter_unpack(records):
+            applied += 1
+            if event_type == EVENT_MOVE:
+                player = players[index]
+                player.position = a
+                if b & (MOVE_PASSED_GO | MOVE_LANDED_ON_GO):
+                    player.money += board.go_salary
+            elif event_type == EVENT_ROLL:
+                pass
+            elif event_type == EVENT_TURN:
+                state.current_player_index = a
+                turns += 1
+                if until_turn is not None and turns >= until_turn:
+                    break
+            elif event_type == EVENT_RENT:
+                player = players[index]
+                player.money -= b
+                by_position[a].owner.money += b
+            elif event_type == EVENT_BUY:
+                player = players[index]
+                player.money -= b
+                by_position[a].set_owner(player)
+            elif event_type == EVENT_JAIL_ENTER:
+                players[index].in_jail = True
+                players[index].jail_turn_skipped = False
+            elif event_type == EVENT_JAIL_SKIP:
+                players[index].jail_turn_skipped = True
+            elif event_type == EVENT_JAIL_EXIT:
+                players[index].in_jail = False
+                players[index].jail_turn_skipped = False
+            elif event_type == EVENT_BANKRUPT:
+                state.declare_bankruptcy(players[index])
+            elif event_type == EVENT_ADD_PLAYER:
+                players.append(Player(f"Player {index + 1}", "replay", board.starting_money))
+            else:
+                raise ValueError(f"Unknown event type {event_type} at event {applied - 1}")
+        return state, applied, turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a binary game event log")
+    parser.add_argument("path", help="Event log file")
+    parser.add_argument("--turn", type=int, default=None, help="Stop after this many turns")
+    parser.add_argument("--event", type=int, default=None, help="Stop after this many events")
+    parser.add_argument("--board", default=None,
+                        help="Board file to replay on (default: the one recorded in the log)")
+    args = parser.parse_args()
+
+    replayer = EventReplayer(args.path, load_board(args.board) if args.board else None)
+    start = time.perf_counter()
+    state, applied, turns = replayer.replay(args.event, args.turn)
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {applied} of {len(replayer)} events ({turns} turns) in {elapsed * 1000:.1f} ms"
+          f" ({applied / elapsed if elapsed > 0 else 0:,.0f} events/sec)")
+    for player in state.players:
+        owned = ", ".join(p.name for p in player.properties)
+        status = " (bankrupt)" if player.bankrupt else " (in jail)" if player.in_jail else ""
+        print(f"{player.name}: ${player.money}, position {player.position}{status} - {owned}")
+    print(f"Current player: {state.current_player_index + 1}")
+
+
+if __name__ == "__main__":
+    main()
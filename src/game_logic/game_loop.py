@@ -0,0 +1,241 @@
+"""
+Fixed-step game logic loop
+The rules run on their own loop (normally a thread), separate from rendering:
+each tick reads Arduino input and queued commands, resolves rolls, moves and
+landings on the GameState, and sends property names to the hub. A slow frame
+no longer delays the rules or the hardware, and slow Serial I/O no longer
+delays a frame.
+
+The loop and the renderer only talk through queues and views:
+  - commands in: request_roll() (keyboard); Arduino input is read by the loop itself
+  - events out: RollEvent / SkipEvent, in order, for the renderer to animate
+  - view: an immutable GameView of the state after the last tick. Each tick that
+    changes something builds a new view and swaps it in with one assignment, so a
+    reader always sees a complete, consistent state - never one being updated.
+
+The GameState belongs to the loop once it has started; nothing else should touch it.
+
+Usage:
+    logic = GameLogic(game_state, input_handler)
+    logic.start()  # or call logic.step() yourself, e.g. once per frame or as fast as possible
+    logic.request_roll()
+    for event in logic.poll_events(): ...
+    view = logic.view
+"""
+import queue
+import threading
+import time
+from collections import namedtuple
+
+PlayerView = namedtuple('PlayerView', 'name token_type money position in_jail bankrupt')
+GameView = namedtuple('GameView', 'tick current_player_index players')
+
+# A resolved roll: faces, the move from start_position to new_position, what happened on landing,
+# and the seed for the dice animation's tumbling faces (derived from the roll, so replaying a game
+# replays the same frames)
+RollEvent = namedtuple('RollEvent', 'player_index faces start_position new_position passed_go landed_on_go '
+                                    'went_to_jail action message animation_seed')
+SkipEvent = namedtuple('SkipEvent', 'player_index reason')
+
+ROLL = 'roll_dice'
+
+
+class GameLogic:
+    """Runs the game rules at a fixed tick rate, talking to the renderer through queues"""
+
+    def __init__(self, game_state, input_handler=None, num_dice=1, tick_rate=60, roll_cooldown=0.0, clock=None):
+        """
+        Args:
+            game_state: GameState the loop owns from now on
+            input_handler: InputHandler / InputMultiplexer to read Arduino actions from and send
+                           property names to (None = keyboard commands only, nothing sent)
+            num_dice: Dice rolled per turn
+            tick_rate: Ticks per second when running as a thread; None = as fast as possible
+                       (automated runs)
+            roll_cooldown: Seconds after a roll during which further roll requests are ignored
+                           (the length of the dice animation, so a held button doesn't queue rolls)
+            clock: Object with now() in seconds for the cooldown, e.g. the animation clock
+                   (default: time.perf_counter)
+        """
+        self.game_state = game_state
+        self.input_handler = input_handler
+        self.num_dice = num_dice
+        self.tick_rate = tick_rate
+        self.roll_cooldown = roll_cooldown
+        self.clock = clock
+        self.commands = queue.SimpleQueue()
+        self.events = queue.SimpleQueue()
+        self.ticks = 0
+        self.stats = {'ticks': 0, 'rolls': 0, 'ignored_rolls': 0, 'max_step': 0.0}
+        self._next_roll_time = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.view = self._build_view()
+
+    # ========== RENDERER SIDE ==========
+
+    def request_roll(self):
+        """Ask for a roll for the current player (resolved on the next tick)"""
+        self.commands.put(ROLL)
+
+    def poll_events(self):
+        """Events published since the last call, oldest first"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    # ========== LOOP ==========
+
+    def start(self):
+        """Run step() on a background thread at tick_rate"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="game-logic", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread (waits for the current tick to finish)"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def _run(self):
+        interval = 1 / self.tick_rate if self.tick_rate else 0
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            self.step()
+            if interval:
+                next_tick += interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    next_tick = time.perf_counter()  # Fell behind - don't try to catch up with a burst
+
+    def step(self):
+        """One tick: read input, resolve commands, publish a new view if anything changed"""
+        started = time.perf_counter()
+        self.ticks += 1
+        changed = False
+
+        if self.input_handler is not None:
+            action = self.input_handler.process_input(self.game_state)
+            if action and action[0] == ROLL:
+                changed |= self._roll()
+
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            if command == ROLL:
+                changed |= self._roll()
+
+        if changed:
+            self.publish_view()
+        self.stats['ticks'] = self.ticks
+        self.stats['max_step'] = max(self.stats['max_step'], time.perf_counter() - started)
+
+    def publish_view(self):
+        """Swap in a new view of the current state (step() does this after every change)"""
+        self.view = self._build_view()
+
+    def _build_view(self):
+        players = tuple(PlayerView(p.name, p.token_type, p.money, p.position, p.in_jail, p.bankrupt)
+                        for p in self.game_state.players)
+        return GameView(self.ticks, self.game_state.current_player_index, players)
+
+    # ========== RULES ==========
+
+    def _roll(self):
+        """Resolve a roll request for the current player. Returns True if the state changed."""
+        now = self.clock.now() if self.clock is not None else time.perf_counter()
+        if self._next_roll_time is not None and now < self._next_roll_time:
+            self.stats['ignored_rolls'] += 1
+            return False
+        game_state = self.game_state
+        current_player = game_state.get_current_player()
+        if not current_player:
+            return False
+        player_index = game_state.current_player_index
+
+        # Check if player should skip turn (e.g., in jail)
+        should_skip, reason = game_state.should_skip_turn(current_player)
+        if should_skip:
+            # Player skips turn
+            print(reason)
+            # In single player mode, just wait for next roll
+            # game_state.next_turn()  # Commented out for single player
+            self.events.put(SkipEvent(player_index, reason))
+            # Send current player's property name
+            self.send_current_property()
+            return True
+
+        # Player can roll dice
+        if reason:  # Released from jail message
+            print(reason)
+        self._next_roll_time = now + self.roll_cooldown
+        self.stats['rolls'] += 1
+
+        faces = game_state.roll_dice_faces(num_dice=self.num_dice)
+        dice_roll = sum(faces)
+        start_position = current_player.position
+
+        # Move player based on dice roll
+        new_position, passed_go, landed_on_go, went_to_jail = game_state.move_player(current_player, dice_roll)
+        if went_to_jail:
+            print(f"{current_player.name} rolled {dice_roll}, landed on Go to Jail!"
+                  f" Sent to Jail (position {game_state.board.jail_position})")
+        else:
+            print(f"{current_player.name} rolled {dice_roll}, moved to position {new_position}")
+
+        # Handle landing on property
+        action, prop, message = game_state.handle_landing(current_player, new_position)
+        if action in ('buy', 'rent'):
+            print(f"{message}")
+        # Everything in the seed is in the event log too (roll count, player, start position, faces);
+        # it does not draw from the game RNG, so the dice stream is the same with or without rendering
+        animation_seed = f"{self.stats['rolls']}:{player_index}:{start_position}:{','.join(map(str, faces))}"
+        self.events.put(RollEvent(player_index, faces, start_position, new_position, passed_go, landed_on_go,
+                                  went_to_jail, action, message, animation_seed))
+
+        # Send property name to Arduino
+        if self.input_handler is not None:
+            if prop:
+                self._send_property(prop)
+            else:
+                # Get property at position even if handle_landing returned None
+                prop_at_pos = game_state.get_property_at_position(new_position)
+                if prop_at_pos:
+                    self._send_property(prop_at_pos)
+
+        # In single player mode, don't advance turn (always same player)
+        # For presentation: just reset for next roll
+        # game_state.next_turn()  # Commented out for single player
+        # Send current player's property name to Arduino
+        self.send_current_property()
+        return True
+
+    def send_current_property(self):
+        """Send the current player's property name to Arduino"""
+        if self.input_handler is None:
+            return
+        current_player = self.game_state.get_current_player()
+        if current_player:
+            prop = self.game_state.get_property_at_position(current_player.position)
+            if prop:
+                self._send_property(prop)
+
+    def _send_property(self, prop):
+        # The hub's built-in name table only describes the default board - on any other
+        # board send the name itself (binary mode then uses a property-name frame)
+        position = prop.position if self.game_state.board.is_default else None
+        self.input_handler.send_property_name(prop.name, position)
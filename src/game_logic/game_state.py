@@ -1,17 +1,60 @@
 """
 Game state management - properties, players, ownership, and transactions
 """
+import random
+from array import array
+from src.game_logic.board import BUYABLE_TYPES, Landing, load_board
+from src.game_logic.event_log import (
+    EVENT_ADD_PLAYER, EVENT_BANKRUPT, EVENT_BUY, EVENT_JAIL_ENTER, EVENT_JAIL_EXIT, EVENT_JAIL_SKIP,
+    EVENT_MOVE, EVENT_RENT, EVENT_ROLL, EVENT_TURN, MOVE_LANDED_ON_GO, MOVE_PASSED_GO, MOVE_WENT_TO_JAIL,
+)
+
+
+MASK_64 = (1 << 64) - 1  # Unsigned view of a snapshot's owned_mask field
+
 
 class Player:
     """Represents a player in the game"""
+    # __slots__ keeps each Player small (no per-instance __dict__)
+    __slots__ = ('name', 'token_type', 'money', 'position', 'owned_mask', '_properties',
+                 'in_jail', 'jail_turn_skipped', 'bankrupt', '_game')
+    
     def __init__(self, name, token_type, starting_money=1500):
         self.name = name
         self.token_type = token_type  # e.g., 'top_hat', 'car', etc.
         self.money = starting_money
-        self.position = 0  # Board position (0-27)
-        self.properties = []  # List of Property objects owned
+        self.position = 0  # Board position (0 = GO)
+        self.owned_mask = 0  # Bit n is set if the player owns the property at position n
+        self._properties = {}  # Owned Property objects in purchase order (dict used as an ordered set)
         self.in_jail = False  # True if player is in jail and must skip next turn
         self.jail_turn_skipped = False  # True if player has already skipped their turn in jail
+        self.bankrupt = False  # True once the player could not pay rent and is out of the game
+        self._game = None  # Set while _properties is None: the clone that builds them on first use
+    
+    @property
+    def properties(self):
+        """
+        Property objects owned, in purchase order, as a live list-like view.
+        append/remove/clear change ownership through Property.set_owner, so the
+        owned_mask and the property's owner always agree with it.
+        """
+        return OwnedProperties(self)
+
+    @properties.setter
+    def properties(self, properties):
+        """Replace the owned properties (kept for code that assigned the old list)"""
+        properties = list(properties)
+        for property_obj in list(self.properties):
+            if property_obj not in properties:
+                property_obj.set_owner(None)
+        for property_obj in properties:
+            property_obj.set_owner(self)
+    
+    def _owned(self):
+        """The ordered set behind properties, building a clone's Property objects if needed"""
+        if self._properties is None:
+            self._game._materialize_properties()
+        return self._properties
         
     def add_money(self, amount):
         """Add money to player"""
@@ -26,18 +69,84 @@ class Player:
     
     def owns_property(self, property_obj):
         """Check if player owns a property"""
-        return property_obj in self.properties
+        return property_obj.owner is self
+    
+    def owns_position(self, position):
+        """Check if player owns the property at a board position"""
+        return (self.owned_mask >> position) & 1 == 1
+
+
+class OwnedProperties:
+    """
+    Player.properties: list-like view of a player's owned Property objects.
+    Reads come from the player's ordered set; writes go through Property.set_owner.
+    """
+    __slots__ = ('player',)
+    __hash__ = None
+    
+    def __init__(self, player):
+        self.player = player
+    
+    def __len__(self):
+        return len(self.player._owned())
+    
+    def __iter__(self):
+        return iter(list(self.player._owned()))
+    
+    def __contains__(self, property_obj):
+        return getattr(property_obj, 'owner', None) is self.player
+    
+    def __getitem__(self, index):
+        return list(self.player._owned())[index]
+    
+    def __eq__(self, other):
+        if isinstance(other, (OwnedProperties, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self):
+        return repr(list(self))
+    
+    def index(self, property_obj):
+        """Position of property_obj in purchase order (ValueError if not owned)"""
+        return list(self.player._owned()).index(property_obj)
+    
+    def append(self, property_obj):
+        """Give property_obj to this player (taking it from any previous owner)"""
+        property_obj.set_owner(self.player)
+    
+    def extend(self, properties):
+        """append each of properties"""
+        for property_obj in list(properties):
+            property_obj.set_owner(self.player)
+    
+    def __iadd__(self, properties):
+        self.extend(properties)
+        return self
+    
+    def remove(self, property_obj):
+        """Make property_obj unowned (ValueError if this player does not own it)"""
+        if property_obj not in self:
+            raise ValueError(f"{self.player.name} does not own {getattr(property_obj, 'name', property_obj)}")
+        property_obj.set_owner(None)
+    
+    def clear(self):
+        """Make every property this player owns unowned"""
+        for property_obj in list(self.player._owned()):
+            property_obj.set_owner(None)
 
 
 class Property:
     """Represents a property on the board"""
+    __slots__ = ('name', 'position', 'price', 'base_rent', 'color', 'property_type', 'owner')
+    
     def __init__(self, name, position, price, base_rent, color=None, property_type='property'):
         self.name = name
-        self.position = position  # Board position (0-27)
+        self.position = position  # Board position (0 = GO)
         self.price = price
         self.base_rent = base_rent  # Rent when owned (no houses/hotels)
         self.color = color  # Property color group
-        self.property_type = property_type  # 'property', 'utility', 'railroad', 'special'
+        self.property_type = property_type  # Space type name (see board.SPACE_TYPE_NAMES)
         self.owner = None  # None if not owned, otherwise Player object
         
     def is_owned(self):
@@ -46,18 +155,24 @@ class Property:
     
     def is_available_to_buy(self):
         """Check if property can be bought (not owned and is a buyable property)"""
-        return self.owner is None and self.property_type in ['property', 'utility', 'railroad']
+        return self.owner is None and self.property_type in BUYABLE_TYPES
     
     def set_owner(self, player):
-        """Set the owner of this property"""
-        if self.owner is not None:
-            # Remove from old owner's properties list
-            if self in self.owner.properties:
-                self.owner.properties.remove(self)
+        """Set the owner of this property (O(1) - updates both players' ownership)"""
+        old_owner = self.owner
+        if old_owner is player:
+            return
+        
+        bit = 1 << self.position
+        if old_owner is not None:
+            # Remove from old owner
+            del old_owner._properties[self]
+            old_owner.owned_mask &= ~bit
         
         self.owner = player
-        if player is not None and self not in player.properties:
-            player.properties.append(self)
+        if player is not None:
+            player._properties[self] = None
+            player.owned_mask |= bit
     
     def get_rent(self):
         """Get the rent amount for this property"""
@@ -70,20 +185,52 @@ class Property:
         return self.is_owned() and self.owner != player
 
 
+class _BuiltOnFirstUse:
+    """
+    GameState.properties / properties_by_position of a clone: the Property objects are
+    built on first access (see GameState.clone). Not a data descriptor, so once they are
+    stored in the instance dict - always, for games that are not clones - this is bypassed.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, game, owner=None):
+        if game is None:
+            return self
+        game._materialize_properties()
+        return game.__dict__[self.name]
+
+
 class GameState:
     """Manages the overall game state"""
-    def __init__(self):
+    properties = _BuiltOnFirstUse()
+    properties_by_position = _BuiltOnFirstUse()
+
+    def __init__(self, rng=None, board=None):
+        """
+        Args:
+            rng: Optional random.Random instance used for dice rolls.
+                 Pass a seeded instance for reproducible games (simulations, tests).
+            board: Board layout and property data (default: load_board(), the default board)
+        """
+        self.rng = rng if rng is not None else random.Random()
+        self.board = board if board is not None else load_board()
+        self.event_log = None  # Optional EventLog; every state change is appended to it
         self.players = []
         self.properties = []  # Flat list of all properties (for iteration)
         # Position-indexed list: properties_by_position[position] = Property object
         # None means no property at that position
-        self.properties_by_position = [None] * 28  # 28 board positions (0-27)
+        self.properties_by_position = [None] * self.board.size
         self.current_player_index = 0
+        self._definitions = None  # Cached property_definitions(), shared with clones
         
     def add_player(self, name, token_type):
         """Add a player to the game"""
-        player = Player(name, token_type)
+        player = Player(name, token_type, self.board.starting_money)
         self.players.append(player)
+        if self.event_log is not None:
+            self.event_log.append(EVENT_ADD_PLAYER, len(self.players) - 1)
         return player
     
     def add_property(self, name, position, price, base_rent, color=None, property_type='property'):
@@ -91,10 +238,11 @@ class GameState:
         Add a property to the game.
         The property is stored at properties_by_position[position] for fast lookup.
         """
-        if position < 0 or position >= 28:
-            raise ValueError(f"Position must be between 0 and 27, got {position}")
+        if position < 0 or position >= self.board.size:
+            raise ValueError(f"Position must be between 0 and {self.board.size - 1}, got {position}")
         
         property_obj = Property(name, position, price, base_rent, color, property_type)
+        self._definitions = None
         
         # Store in position-indexed list
         self.properties_by_position[position] = property_obj
@@ -112,10 +260,10 @@ class GameState:
     
     def get_property_at_position(self, position):
         """
-        Get property at a specific board position (0-27).
+        Get property at a specific board position.
         Returns Property object or None if no property at that position.
         """
-        if position < 0 or position >= 28:
+        if position < 0 or position >= self.board.size:
             return None
         return self.properties_by_position[position]
     
@@ -135,6 +283,8 @@ class GameState:
         # Complete the purchase
         if player.subtract_money(property_obj.price):
             property_obj.set_owner(player)
+            if self.event_log is not None:
+                self.event_log.append(EVENT_BUY, self.players.index(player), property_obj.position, property_obj.price)
             return True, f"{player.name} bought {property_obj.name} for ${property_obj.price}"
         
         return False, "Purchase failed"
@@ -157,11 +307,15 @@ class GameState:
             amount_paid = player.money
             player.subtract_money(amount_paid)
             owner.add_money(amount_paid)
+            if self.event_log is not None:
+                self.event_log.append(EVENT_RENT, self.players.index(player), property_obj.position, amount_paid)
             return True, f"{player.name} paid ${amount_paid} rent to {owner.name} (bankrupt!)", amount_paid
         
         # Normal rent payment
         if player.subtract_money(rent_amount):
             owner.add_money(rent_amount)
+            if self.event_log is not None:
+                self.event_log.append(EVENT_RENT, self.players.index(player), property_obj.position, rent_amount)
             return True, f"{player.name} paid ${rent_amount} rent to {owner.name}", rent_amount
         
         return False, "Rent payment failed", 0
@@ -177,10 +331,17 @@ class GameState:
         if property_obj is None:
             return 'nothing', None, "No property at this position"
         
-        # Special spaces (GO, Jail, Free Parking, etc.)
-        if property_obj.property_type == 'special':
+        # Landing rule for the space type, from the board's compiled table
+        landing = self.board.landing[position]
+        
+        # Special spaces (GO, cards, ...)
+        if landing == Landing.SPECIAL:
             return 'special', property_obj, f"Landed on {property_obj.name}"
         
+        # Jail, Free Parking, Go To Jail (handled by move_player)
+        if landing == Landing.NOTHING:
+            return 'nothing', property_obj, f"Landed on {property_obj.name}"
+        
         # Property is not owned - can buy
         if property_obj.is_available_to_buy():
             return 'buy', property_obj, f"{property_obj.name} is available to buy for ${property_obj.price}"
@@ -196,9 +357,29 @@ class GameState:
         
         return 'nothing', None, "Unknown state"
     
+    def get_active_players(self):
+        """Get players that are still in the game (not bankrupt)"""
+        return [player for player in self.players if not player.bankrupt]
+    
+    def declare_bankruptcy(self, player):
+        """
+        Remove a player from the game.
+        Their properties go back to the bank and can be bought again.
+        """
+        player.bankrupt = True
+        for property_obj in player.properties:
+            property_obj.set_owner(None)
+        if self.event_log is not None:
+            self.event_log.append(EVENT_BANKRUPT, self.players.index(player))
+    
     def next_turn(self):
-        """Move to the next player's turn"""
-        self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        """Move to the next player's turn (bankrupt players are skipped)"""
+        for _ in range(len(self.players)):
+            self.current_player_index = (self.current_player_index + 1) % len(self.players)
+            if not self.players[self.current_player_index].bankrupt:
+                break
+        if self.event_log is not None:
+            self.event_log.append(EVENT_TURN, 0, self.current_player_index)
     
     def should_skip_turn(self, player):
         """
@@ -208,11 +389,15 @@ class GameState:
         if player.in_jail and not player.jail_turn_skipped:
             # Player is in jail and hasn't skipped their turn yet
             player.jail_turn_skipped = True
+            if self.event_log is not None:
+                self.event_log.append(EVENT_JAIL_SKIP, self.players.index(player))
             return True, f"{player.name} is in jail and must skip this turn"
         elif player.in_jail and player.jail_turn_skipped:
             # Player has skipped their turn, release from jail
             player.in_jail = False
             player.jail_turn_skipped = False
+            if self.event_log is not None:
+                self.event_log.append(EVENT_JAIL_EXIT, self.players.index(player))
             return False, f"{player.name} is released from jail"
         
         return False, None
@@ -228,11 +413,20 @@ class GameState:
         Returns:
             Total of all dice rolls (1-6 for single die)
         """
-        import random
-        total = 0
-        for _ in range(num_dice):
-            total += random.randint(1, sides)
-        return total
+        return sum(self.roll_dice_faces(sides, num_dice))
+    
+    def roll_dice_faces(self, sides=6, num_dice=1):
+        """
+        Roll dice and return each die's face (same RNG draws as roll_dice).
+        
+        Args:
+            sides: Number of sides on each die (default 6)
+            num_dice: Number of dice to roll
+        
+        Returns:
+            Tuple of faces, one per die
+        """
+        return tuple(self.rng.randint(1, sides) for _ in range(num_dice))
     
     def move_player(self, player, dice_roll):
         """
@@ -246,22 +440,23 @@ class GameState:
         Returns:
             (new_position: int, passed_go: bool, landed_on_go: bool, went_to_jail: bool)
         """
+        board = self.board
         old_position = player.position
-        new_position = (old_position + dice_roll) % 28
+        new_position = (old_position + dice_roll) % board.size
         
         # Check if player passed GO (wrapped around the board)
-        passed_go = (old_position + dice_roll) >= 28
+        passed_go = (old_position + dice_roll) >= board.size
         
         # Check if player landed on GO
         landed_on_go = (new_position == 0)
         
-        # Check if player landed on Go to Jail (position 21)
-        went_to_jail = (new_position == 21)
+        # Check if player landed on Go to Jail
+        went_to_jail = (new_position == board.go_to_jail_position)
         
         # Handle Go to Jail rule
         if went_to_jail:
-            # Send player to Jail (position 7)
-            new_position = 7
+            # Send player to Jail
+            new_position = board.jail_position
             # Mark player as in jail (must skip next turn)
             player.in_jail = True
             player.jail_turn_skipped = False
@@ -271,8 +466,16 @@ class GameState:
         
         # Handle GO bonuses
         if passed_go or landed_on_go:
-            # Collect $200 for passing or landing on GO
-            player.add_money(200)
+            # Collect the GO salary ($200 on the default board) for passing or landing on GO
+            player.add_money(board.go_salary)
+        
+        if self.event_log is not None:
+            player_index = self.players.index(player)
+            flags = (passed_go * MOVE_PASSED_GO) | (landed_on_go * MOVE_LANDED_ON_GO) | (went_to_jail * MOVE_WENT_TO_JAIL)
+            self.event_log.append(EVENT_ROLL, player_index, dice_roll)
+            self.event_log.append(EVENT_MOVE, player_index, new_position, flags)
+            if went_to_jail:
+                self.event_log.append(EVENT_JAIL_ENTER, player_index)
         
         return new_position, passed_go, landed_on_go, went_to_jail
     
@@ -295,54 +498,148 @@ class GameState:
         
         return dice_roll, new_position, passed_go, landed_on_go, went_to_jail
     
+    # Snapshot layout (array of signed 64-bit ints):
+    #   [current_player_index, num_players,
+    #    then per player: money, position, flags, owned_mask]
+    # flags: bit 0 = in_jail, bit 1 = jail_turn_skipped, bit 2 = bankrupt
+    # owned_mask is stored as two's complement, so position 63 (the sign bit) fits -
+    # boards are limited to board.MAX_SPACES = 64 spaces for this
+    SNAPSHOT_HEADER = 2
+    SNAPSHOT_FIELDS = 4
+    
+    def snapshot(self):
+        """
+        Pack the mutable game state into a flat buffer.
+        Property definitions (names, prices, rents) are not included - they never change.
+        
+        Returns:
+            array('q') that can be passed to restore()
+        """
+        values = [self.current_player_index, len(self.players)]
+        for player in self.players:
+            values += (player.money, player.position,
+                       player.in_jail | (player.jail_turn_skipped << 1) | (player.bankrupt << 2),
+                       player.owned_mask - (player.owned_mask >> 63 << 64))
+        return array('q', values)
+    
+    def restore(self, snapshot):
+        """
+        Restore state saved by snapshot() (from this game or a clone of it).
+        Ownership is only rebuilt if it changed since the snapshot.
+        """
+        if snapshot[1] != len(self.players):
+            raise ValueError(f"Snapshot has {snapshot[1]} players, game has {len(self.players)}")
+        
+        self.current_player_index = snapshot[0]
+        ownership_changed = False
+        index = self.SNAPSHOT_HEADER
+        for player in self.players:
+            player.money = snapshot[index]
+            player.position = snapshot[index + 1]
+            flags = snapshot[index + 2]
+            player.in_jail = bool(flags & 1)
+            player.jail_turn_skipped = bool(flags & 2)
+            player.bankrupt = bool(flags & 4)
+            if player.owned_mask != snapshot[index + 3] & MASK_64:
+                ownership_changed = True
+            index += self.SNAPSHOT_FIELDS
+        
+        if ownership_changed:
+            self._restore_ownership(snapshot)
+    
+    def _restore_ownership(self, snapshot):
+        """Rebuild Property.owner and each player's owned properties from snapshot masks"""
+        if 'properties' not in self.__dict__:
+            # A clone whose Property objects are not built yet - the masks are all there is
+            index = self.SNAPSHOT_HEADER + 3
+            for player in self.players:
+                player.owned_mask = snapshot[index] & MASK_64
+                index += self.SNAPSHOT_FIELDS
+            return
+        for property_obj in self.properties:
+            property_obj.owner = None
+        
+        index = self.SNAPSHOT_HEADER + 3
+        for player in self.players:
+            mask = snapshot[index] & MASK_64
+            player.owned_mask = mask
+            player._properties = {}
+            while mask:
+                low_bit = mask & -mask
+                property_obj = self.properties_by_position[low_bit.bit_length() - 1]
+                property_obj.owner = player
+                player._properties[property_obj] = None
+                mask ^= low_bit
+            index += self.SNAPSHOT_FIELDS
+    
+    def clone(self, rng=None):
+        """
+        Independent copy of this game (players, money, positions, jail flags, ownership, turn).
+        
+        Only the players are copied. The property definitions (which never change) are
+        shared, and the copy's Property objects are built from them and the players'
+        ownership masks the first time it needs them - so clone() followed by
+        snapshot()/restore() never builds them at all.
+        
+        Args:
+            rng: RNG for the copy's dice rolls (default: share this game's RNG)
+        
+        Returns:
+            New GameState
+        """
+        game = GameState.__new__(GameState)
+        game.rng = rng if rng is not None else self.rng
+        game.board = self.board
+        game.event_log = None
+        game.current_player_index = self.current_player_index
+        game._definitions = self.property_definitions()
+        
+        players = []
+        for original in self.players:
+            player = Player(original.name, original.token_type, original.money)
+            player.position = original.position
+            player.in_jail = original.in_jail
+            player.jail_turn_skipped = original.jail_turn_skipped
+            player.bankrupt = original.bankrupt
+            player.owned_mask = original.owned_mask
+            player._properties = None
+            player._game = game
+            players.append(player)
+        game.players = players
+        return game
+    
+    def property_definitions(self):
+        """(name, position, price, base_rent, color, property_type) of every property, in order"""
+        if self._definitions is None:
+            self._definitions = tuple((p.name, p.position, p.price, p.base_rent, p.color, p.property_type)
+                                      for p in self.properties)
+        return self._definitions
+    
+    def _materialize_properties(self):
+        """Build a clone's Property objects from the shared definitions and the ownership masks"""
+        properties = [Property(*definition) for definition in self._definitions]
+        by_position = [None] * self.board.size
+        for property_obj in properties:
+            by_position[property_obj.position] = property_obj
+        for player in self.players:
+            player._properties = {}
+            player._game = None
+            mask = player.owned_mask
+            while mask:
+                low_bit = mask & -mask
+                property_obj = by_position[low_bit.bit_length() - 1]
+                property_obj.owner = player
+                player._properties[property_obj] = None
+                mask ^= low_bit
+        self.properties = properties
+        self.properties_by_position = by_position
+    
     def initialize_all_properties(self):
         """
-        Initialize all 28 properties on the board.
+        Add a property for every space on the board (see src/game_logic/boards/default.json).
         Call this once when setting up a new game.
-        Modify this to add your actual property data.
-        """
-        # Position 0: GO (bottom-left corner)
-        self.add_property("GO", 0, 0, 0, property_type='special')
-        
-        # Positions 1-6: Bottom row (left to right)
-        # TODO: Add your actual properties here
-        self.add_property("JARVIS", 1,60,20, property_type="property")
-        self.add_property("BONNER", 2,60,20, property_type="property")
-        self.add_property("EDUROAM", 3,180,100, property_type="special")
-        self.add_property("FURNAS", 4,100,40, property_type="property")
-        self.add_property("KNOW", 5,100,40, property_type="property")
-        self.add_property("KETTER", 6,120,60, property_type="property")
-
-        # Position 7: Bottom-right corner
-        self.add_property("JAIL", 7, 0, 0, property_type='visiting') #only on with this type
-
-        # Positions 8-13: Right column (bottom to top)
-        self.add_property("GOVENORS", 8, 140, 70, property_type='property')
-        self.add_property("HADLY", 9, 160, 80, property_type='property')
-        self.add_property("GRIENER", 10, 180, 90, property_type='property')
-        self.add_property("LOST", 11, 140, 100, property_type='special')
-        self.add_property("ELLICOTT", 12, 180, 95, property_type='property')
-        self.add_property("FLINT", 13, 200, 100, property_type='property')
-
-        # Position 14: Top-right corner
-        self.add_property("FREE PARKING", 14, 0, 0, property_type='parking')
-        # Positions 15-20: Top row (right to left)
-        self.add_property("NSC", 15, 220, 105, property_type='property')
-        self.add_property("DINNING RELOAD", 16, 220, 105, property_type='special')
-        self.add_property("SILVERMAN", 17, 240, 110, property_type='property')
-        self.add_property("LOCKWOOD", 18, 250, 125, property_type='property')
-        self.add_property("SLEE", 19, 250, 130, property_type='property')
-        self.add_property("ACADEMIC CENTER", 20, 280, 140, property_type='property')
-        
-        # Position 21: Top-left corner
-        self.add_property("GO TO JAIL", 21, 0, 0, property_type='jail')
-        self.add_property("CAPEN", 22, 300, 150, property_type='property')
-        self.add_property("TALBERT", 23, 300, 150, property_type='property')
-        self.add_property("EMON", 24, 180, 100, property_type='special')
-        self.add_property("BALDY", 25, 320, 160, property_type='property')
-        self.add_property("DAVIS", 26, 350, 175, property_type='property')
-        self.add_property("COMMONS", 27, 400, 200, property_type='property')
-
-        # Positions 22-27: Left column (top to bottom)
-        # TODO: Add properties for positions 22-27
-
+        """
+        board = self.board
+        for position in range(board.size):
+            self.add_property(board.names[position], position, board.prices[position], board.rents[position],
+                              board.group_of(position), property_type=board.type_names[position])
@@ -0,0 +1,183 @@
+"""
+Time-based animation scheduler
+Animations are tracks on one scheduler that advances them by elapsed time from a
+clock (monotonic by default), not by frame count, so they run at the same speed
+whatever the frame rate - a slow frame just makes the next update jump further.
+
+speed scales time (2.0 = twice as fast, for demos and automated runs), and
+VirtualClock lets headless code step time by hand.
+
+Usage:
+    scheduler = AnimationScheduler()
+    scheduler.add(Tween(0.5, on_update=lambda t: ..., easing=ease_out_cubic), key='dice')
+    while running:
+        scheduler.update()  # once per frame
+"""
+import time
+
+
+# ========== EASING FUNCTIONS (progress 0-1 -> eased 0-1) ==========
+
+def linear(t):
+    return t
+
+
+def ease_in_quad(t):
+    return t * t
+
+
+def ease_out_quad(t):
+    return t * (2 - t)
+
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_cubic(t):
+    return 4 * t * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+
+# ========== CLOCKS ==========
+
+class MonotonicClock:
+    """Real time (time.perf_counter)"""
+
+    def now(self):
+        return time.perf_counter()
+
+
+class VirtualClock:
+    """Time that only moves when advanced - for headless runs and tests"""
+
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, seconds):
+        self.time += seconds
+
+
+# ========== TRACKS ==========
+
+class Tween:
+    """
+    One animation track: calls on_update(eased progress 0-1) as time passes,
+    then on_complete() once when the duration has elapsed.
+    """
+
+    def __init__(self, duration, on_update=None, on_complete=None, easing=linear):
+        """
+        Args:
+            duration: Seconds (at speed 1.0)
+            on_update: Called with the eased progress on every scheduler update
+            on_complete: Called once when finished (not when cancelled)
+            easing: Function mapping linear progress to eased progress
+        """
+        self.duration = duration
+        self.on_update = on_update
+        self.on_complete = on_complete
+        self.easing = easing
+        self.elapsed = 0.0
+        self.finished = False
+
+    @property
+    def progress(self):
+        """Linear progress 0-1"""
+        if self.duration <= 0:
+            return 1.0
+        return max(0.0, min(1.0, self.elapsed / self.duration))
+
+    def advance(self, dt):
+        """Move the track forward by dt seconds"""
+        if self.finished:
+            return
+        self.elapsed += dt
+        progress = self.progress
+        if self.on_update is not None:
+            self.on_update(self.easing(progress))
+        if progress >= 1.0:
+            self.finished = True
+            if self.on_complete is not None:
+                self.on_complete()
+
+
+class AnimationScheduler:
+    """Advances every active track by the time elapsed since the last update"""
+
+    def __init__(self, clock=None, speed=1.0, max_step=None):
+        """
+        Args:
+            clock: Object with now() in seconds (default: MonotonicClock)
+            speed: Fast-forward factor applied to elapsed time
+            max_step: Optional cap on the seconds one update may advance (e.g. after a stall);
+                      None = always catch up fully
+        """
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.speed = speed
+        self.max_step = max_step
+        self.tracks = {}  # key -> track
+        self.last_time = None
+        self.stats = {'updates': 0, 'max_dt': 0.0}
+
+    def add(self, track, key=None):
+        """
+        Start a track. A track added with the key of a running one replaces it.
+
+        Returns:
+            The track
+        """
+        if key is None:
+            key = id(track)
+        now = self.clock.now()
+        if not self.tracks or self.last_time is None:
+            self.last_time = now
+        else:
+            # The next update advances by the time since the last one; this track only just started
+            track.elapsed -= (now - self.last_time) * self.speed
+        self.tracks[key] = track
+        return track
+
+    def cancel(self, key):
+        """Stop a track without calling its on_complete"""
+        self.tracks.pop(key, None)
+
+    def is_active(self, key):
+        return key in self.tracks
+
+    @property
+    def busy(self):
+        """True while any track is running"""
+        return bool(self.tracks)
+
+    def update(self):
+        """
+        Advance all tracks by the scaled time since the last update.
+
+        Returns:
+            Seconds of animation time advanced
+        """
+        now = self.clock.now()
+        if self.last_time is None:
+            self.last_time = now
+        dt = (now - self.last_time) * self.speed
+        self.last_time = now
+        if self.max_step is not None:
+            dt = min(dt, self.max_step)
+        self.stats['updates'] += 1
+        self.stats['max_dt'] = max(self.stats['max_dt'], dt)
+        if not self.tracks:
+            return dt
+
+        for key, track in list(self.tracks.items()):
+            track.advance(dt)
+            # Completion callbacks may have replaced the track under the same key
+            if track.finished and self.tracks.get(key) is track:
+                del self.tracks[key]
+        return dt
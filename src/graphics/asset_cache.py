@@ -0,0 +1,91 @@
+"""
+Image cache for the renderers
+Each image file is loaded once; every size it is drawn at is scaled once and
+converted to the display's pixel format (convert_alpha), so blits need no per-pixel
+format conversion. Scaled copies are dropped when the window is resized.
+"""
+import os
+import pygame
+
+
+class AssetCache:
+    """Loaded images, scaled once per size and converted to the display format"""
+
+    def __init__(self):
+        self.sources = {}  # path -> Surface as loaded (None if missing or unreadable)
+        self.scaled = {}  # (path, size) -> scaled, display-format Surface
+        self.display_size = None  # Display size the scaled copies were made for
+        self.stats = {'loads': 0, 'scales': 0, 'hits': 0, 'invalidations': 0}
+
+    def load(self, path):
+        """
+        Load an image file once.
+
+        Returns:
+            Surface, or None if the file is missing or unreadable (a warning is printed once)
+        """
+        if path in self.sources:
+            return self.sources[path]
+        surface = None
+        if os.path.exists(path):
+            try:
+                surface = pygame.image.load(path)
+                self.stats['loads'] += 1
+            except pygame.error as e:
+                print(f"Error loading image {path}: {e}")
+        else:
+            print(f"Warning: Image not found: {path}")
+        self.sources[path] = surface
+        return surface
+
+    def get(self, path, size=None):
+        """
+        Image scaled to size (None = original size), in the display pixel format.
+
+        Returns:
+            Surface, or None if the image could not be loaded
+        """
+        self.check_display()
+        key = (path, tuple(size) if size else None)
+        surface = self.scaled.get(key)
+        if surface is not None:
+            self.stats['hits'] += 1
+            return surface
+
+        source = self.load(path)
+        if source is None:
+            return None
+        surface = source
+        if size and tuple(size) != source.get_size():
+            surface = pygame.transform.scale(source, size)
+            self.stats['scales'] += 1
+        surface = to_display_format(surface)
+        self.scaled[key] = surface
+        return surface
+
+    def check_display(self):
+        """Drop the scaled copies if the display size changed. Returns True if it did."""
+        display = pygame.display.get_surface()
+        size = display.get_size() if display is not None else None
+        if size == self.display_size:
+            return False
+        self.display_size = size
+        self.invalidate()
+        return True
+
+    def invalidate(self):
+        """Drop every scaled copy (the loaded originals are kept)"""
+        if self.scaled:
+            self.stats['invalidations'] += 1
+        self.scaled.clear()
+
+
+def _has_display():
+    return pygame.display.get_surface() is not None
+
+
+def to_display_format(surface):
+    """convert_alpha() the surface if a display mode is set (conversion needs one)"""
+    if _has_display():
+        return surface.convert_alpha()
+    return surface
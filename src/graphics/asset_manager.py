@@ -0,0 +1,172 @@
+"""
+Central asset manager with a sprite atlas
+Renderers register the sprites they need (name, image file, size) when they are
+created; nothing is decoded until the first sprite is requested. At that point
+every registered sprite is scaled and packed into one atlas surface, and each
+sprite is a subsurface of it. Registrations with the same file and size share
+one region.
+
+With an atlas_path the packed atlas is saved as one PNG plus a JSON manifest,
+and later starts load that single file instead of decoding every source image.
+The saved atlas is rebuilt when a source file or a registered size changes.
+"""
+import json
+import os
+import pygame
+from src.graphics.asset_cache import AssetCache, to_display_format
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+IMAGE_ROOT = os.path.join(PROJECT_ROOT, "images", "images")
+DEFAULT_ATLAS_PATH = os.path.join(os.path.expanduser("~"), ".cache", "monopoly", "sprite_atlas.png")
+ATLAS_VERSION = 1
+ATLAS_MAX_WIDTH = 1024
+
+
+def asset_path(relative_path):
+    """Absolute path of a file under images/images, independent of the working directory"""
+    return os.path.join(IMAGE_ROOT, relative_path)
+
+
+class AssetManager(AssetCache):
+    """Lazily built sprite atlas on top of the AssetCache image cache"""
+
+    def __init__(self, atlas_path=None, padding=1):
+        """
+        Args:
+            atlas_path: PNG file to save the packed atlas to and load it from (None = don't persist)
+            padding: Transparent pixels between sprites in the atlas
+        """
+        super().__init__()
+        self.atlas_path = atlas_path
+        self.padding = padding
+        self.entries = {}  # sprite name -> (path, (width, height))
+        self.atlas = None
+        self.regions = {}  # (path, (width, height)) -> Rect in the atlas
+        self.sprites = {}  # sprite name -> subsurface of the atlas (None if the file is missing)
+        self.stats['atlas_builds'] = 0
+        self.stats['atlas_loads'] = 0
+
+    def register(self, name, path, size):
+        """
+        Declare a sprite (cheap - nothing is loaded yet).
+
+        Args:
+            name: Sprite name used with sprite()
+            path: Image file (see asset_path)
+            size: (width, height) the sprite is drawn at
+        """
+        entry = (path, tuple(size))
+        if self.entries.get(name) == entry:
+            return
+        self.entries[name] = entry
+        self.sprites.pop(name, None)
+        if self.atlas is not None and entry not in self.regions:
+            self.atlas = None  # New image or size: repack on next use
+
+    def sprite(self, name):
+        """
+        Sprite by name; builds (or loads) the atlas on first use.
+
+        Returns:
+            Surface, or None if the sprite's image file could not be loaded
+        """
+        if name in self.sprites:
+            return self.sprites[name]
+        if name not in self.entries:
+            raise KeyError(f"Sprite not registered: {name}")
+        if self.atlas is None:
+            self._load_or_build_atlas()
+        region = self.regions.get(self.entries[name])
+        sprite = self.atlas.subsurface(region) if region is not None else None
+        self.sprites[name] = sprite
+        return sprite
+
+    def _unique_entries(self):
+        """Registered (path, size) pairs without duplicates, in a stable order"""
+        return sorted(set(self.entries.values()))
+
+    def _manifest(self, entries):
+        """Identifies the sources an atlas was built from (changes if any file or size changes)"""
+        sources = []
+        for path, size in entries:
+            try:
+                info = os.stat(path)
+                stamp = [info.st_mtime_ns, info.st_size]
+            except OSError:
+                stamp = None
+            sources.append({'path': path, 'size': list(size), 'stamp': stamp})
+        return {'version': ATLAS_VERSION, 'padding': self.padding, 'sources': sources}
+
+    def _load_or_build_atlas(self):
+        entries = self._unique_entries()
+        manifest = self._manifest(entries)
+        if self.atlas_path and self._load_atlas(manifest):
+            return
+        self._build_atlas(entries)
+        if self.atlas_path:
+            self._save_atlas(manifest)
+        self.atlas = to_display_format(self.atlas)
+
+    def _load_atlas(self, manifest):
+        """Load the saved atlas if it was built from exactly these sources. Returns True on success."""
+        manifest_path = os.path.splitext(self.atlas_path)[0] + ".json"
+        try:
+            with open(manifest_path) as f:
+                saved = json.load(f)
+            if saved.get('manifest') != manifest:
+                return False
+            atlas = pygame.image.load(self.atlas_path)
+        except (OSError, ValueError, pygame.error):
+            return False
+        self.atlas = to_display_format(atlas)
+        self.regions = {}
+        for source, rect in zip(manifest['sources'], saved['regions']):
+            if rect is not None:
+                self.regions[(source['path'], tuple(source['size']))] = pygame.Rect(rect)
+        self.stats['atlas_loads'] += 1
+        return True
+
+    def _build_atlas(self, entries):
+        """Scale every registered image and shelf-pack them into one surface"""
+        images = []
+        for path, size in entries:
+            source = self.load(path)
+            if source is not None:
+                images.append(((path, size), pygame.transform.scale(source, size)))
+
+        # Shelf packing: tallest first, left to right, new shelf when the row is full
+        images.sort(key=lambda item: -item[1].get_height())
+        pad = self.padding
+        regions = {}
+        x = y = shelf_height = width = 0
+        for key, image in images:
+            w, h = image.get_size()
+            if x and x + w > ATLAS_MAX_WIDTH:
+                x, y = 0, y + shelf_height + pad
+                shelf_height = 0
+            regions[key] = pygame.Rect(x, y, w, h)
+            x += w + pad
+            shelf_height = max(shelf_height, h)
+            width = max(width, x - pad)
+
+        atlas = pygame.Surface((max(width, 1), max(y + shelf_height, 1)), pygame.SRCALPHA)
+        for key, image in images:
+            # MAX onto the zeroed atlas copies RGBA exactly (a normal blit would blend the alpha)
+            atlas.blit(image, regions[key], special_flags=pygame.BLEND_RGBA_MAX)
+        self.regions = regions
+        self.atlas = atlas
+        self.stats['atlas_builds'] += 1
+
+    def _save_atlas(self, manifest):
+        manifest_path = os.path.splitext(self.atlas_path)[0] + ".json"
+        regions = []
+        for source in manifest['sources']:
+            rect = self.regions.get((source['path'], tuple(source['size'])))
+            regions.append(list(rect) if rect is not None else None)
+        try:
+            os.makedirs(os.path.dirname(self.atlas_path) or ".", exist_ok=True)
+            pygame.image.save(self.atlas, self.atlas_path)
+            with open(manifest_path, 'w') as f:
+                json.dump({'manifest': manifest, 'regions': regions}, f)
+        except (OSError, pygame.error) as e:
+            print(f"Could not save sprite atlas: {e}")
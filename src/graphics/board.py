@@ -2,40 +2,74 @@
 Board rendering and layout
 """
 import pygame
+from src.graphics.asset_manager import AssetManager, asset_path
+from src.game_logic.board import load_board
 from src.utils.position_calculator import PositionCalculator
 
+BOARD_BACKGROUND_PATH = asset_path("properties/Group 46.png")
+
 class BoardRenderer:
-    def __init__(self, screen):
+    def __init__(self, screen, assets=None, board=None):
+        """
+        Args:
+            screen: Surface to draw on
+            assets: AssetManager / AssetCache for the background image
+            board: Board being played (default: the default board) - sets the number of spaces
+                   per side and the background image
+        """
         self.screen = screen    #init_ to 800
-        self.board_size = screen.get_width() - 100 #bc the margin is 50
+        self.board = board if board is not None else load_board()
         self.margin = 50
         self.font = pygame.font.SysFont("monospace", 10)
+        self.cell_count = self.board.cells_per_side  # Spaces between two corners (6 on the default board)
+        self.background_path = (asset_path(self.board.background) if self.board.background
+                                else BOARD_BACKGROUND_PATH)
+        self.board_color = (240,235,210)  # light beige board color
+        self.border_color = (0, 0, 0)
+        self._update_layout()
+        
+        # Load board background image (scaled copies are cached per board size)
+        self.assets = assets if assets is not None else AssetManager()
+        self.board_background = None
+        self._load_board_background()
 
-        self.cell_count= 6     #10x10 board
+    def _update_layout(self):
+        """Board geometry for the current screen size"""
+        self.board_size = min(self.screen.get_size()) - 2 * self.margin #bc the margin is 50
         self.corner_size = self.board_size // 6 #makes corners 133.33px
         self.cell_size= (self.board_size - 2 * self.corner_size) /self.cell_count
 
-        # Position calculator for testing positions
-        self.position_calc = PositionCalculator(
-            self.board_size, self.margin, self.corner_size, self.cell_size
-        )
+        # Position calculator (lookup tables are rebuilt only when the geometry changes)
+        if getattr(self, 'position_calc', None) is None:
+            self.position_calc = PositionCalculator(
+                self.board_size, self.margin, self.corner_size, self.cell_size, self.board.size
+            )
+        else:
+            self.position_calc.update(self.board_size, self.margin, self.corner_size, self.cell_size)
 
         #make the board an actual object
         self.board_surface = pygame.Surface((self.board_size, self.board_size))
-        self.board_color = (240,235,210)  # light beige board color
-        self.border_color = (0, 0, 0)
-        
-        # Load board background image
-        self.board_background = None
-        self._load_board_background()
 
-    def render(self):
-        """Render the Monopoly board"""
+    def resize(self, screen):
+        """Lay the board out for a resized window (drops the old scaled background)"""
+        self.screen = screen
+        self._update_layout()
+        self.assets.check_display()
+
+    def render(self, surface=None):
+        """
+        Render the Monopoly board
+        
+        Args:
+            surface: Surface to draw on (default: the screen)
+        """
+        if surface is None:
+            surface = self.screen
         # Draw board background image if available
         if self.board_background:
-            # Scale background to fit board size
-            scaled_bg = pygame.transform.scale(self.board_background, (self.board_size, self.board_size))
-            self.screen.blit(scaled_bg, (self.margin, self.margin))
+            # Background scaled to fit board size (scaled once per size, then cached)
+            scaled_bg = self.assets.get(self.background_path, (self.board_size, self.board_size))
+            surface.blit(scaled_bg, (self.margin, self.margin))
         else:
             # Fallback to colored background if no image
             board_rect = pygame.Rect(
@@ -47,7 +81,7 @@ class BoardRenderer:
             self.board_surface.fill(self.board_color)
             pygame.draw.rect(self.board_surface, self.border_color,
                              (0, 0, self.board_size, self.board_size), 3)
-            self.screen.blit(self.board_surface, (self.margin, self.margin))
+            surface.blit(self.board_surface, (self.margin, self.margin))
 
         # Position numbers removed
 
@@ -69,10 +103,10 @@ class BoardRenderer:
         pass
     
     def draw_position_numbers(self):
-        """Draw position numbers (0-27) on each space for testing/alignment"""
+        """Draw position numbers on each space for testing/alignment"""
         font = pygame.font.SysFont("monospace", 16)
         
-        for position in range(28):
+        for position in range(self.board.size):
             x, y, w, h = self.position_calc.get_position_rect(position)
             
             # Draw position number (no rectangle background)
@@ -82,15 +116,8 @@ class BoardRenderer:
     
     def _load_board_background(self):
         """Load the board background image"""
-        import os
-        try:
-            image_path = "images/images/properties/Group 46.png"
-            if os.path.exists(image_path):
-                self.board_background = pygame.image.load(image_path)
-                print(f"Loaded board background: {image_path}")
-            else:
-                print(f"Warning: Board background image not found: {image_path}")
-        except Exception as e:
-            print(f"Error loading board background: {e}")
+        self.board_background = self.assets.load(self.background_path)
+        if self.board_background:
+            print(f"Loaded board background: {self.background_path}")
 
 
@@ -1,107 +1,187 @@
 """
 Dice rolling animation
 Alternates between random dice images and transition image
+Timing is in seconds on an AnimationScheduler track, independent of the frame rate
+
+The outcome is decided before the roll starts (from the game RNG) and the whole
+roll is precomputed as a schedule: one frame index per face change, ending on
+the outcome. Frames are display-format surfaces - for several dice, one cached
+composite per combination of faces - so each animation update is a list lookup.
+The tumbling faces come from the animation's own RNG, reseeded per roll with
+the seed GameLogic derives from it (RollEvent.animation_seed), so replaying a
+game plays back identical frames.
 """
 import pygame
 import random
-import os
+from src.graphics.animation import AnimationScheduler, Tween
+from src.graphics.asset_cache import to_display_format
+from src.graphics.asset_manager import AssetManager, asset_path
+
+TRANSITION = 0  # Face value that stands for the transition image in a frame key
 
 class DiceAnimation:
     """Handles dice rolling animation"""
-    
-    def __init__(self, screen):
+
+    def __init__(self, screen, assets=None, scheduler=None, num_dice=1, seed=None):
+        """
+        Args:
+            screen: Surface to draw on
+            assets: AssetManager the dice sprites are registered with
+            scheduler: AnimationScheduler driving the roll
+            num_dice: Dice shown side by side
+            seed: Seed for the tumbling faces (None = random); the outcome itself is passed to start_animation
+        """
         self.screen = screen
-        self.dice_images = {}
-        self.transition_image = None
+        self.assets = assets if assets is not None else AssetManager()
+        self.scheduler = scheduler if scheduler is not None else AnimationScheduler()
         self.is_animating = False
-        self.animation_frame = 0
-        self.animation_duration = 50  # Number of frames to animate (longer animation)
-        self.current_dice_value = 1
+        self.animation_step = 0  # Index into schedule of the frame shown
+        self.animation_duration = 50 / 60  # Seconds to animate (50 frames at 60 FPS)
+        self.step_duration = 5 / 60  # Seconds between face changes (5 frames at 60 FPS)
+        self.num_dice = num_dice
+        self.final_faces = (1,) * num_dice
         self.just_finished = False  # Flag to track when animation just finished
         # Position: middle of board (400, 400), then down and right a bit
         self.dice_position = (450, 450)  # Center of board, slightly down and right
         self.dice_size = (100, 100)  # Size of dice display
-        
-        self._load_dice_images()
-    
-    def _load_dice_images(self):
-        """Load all dice images and transition image"""
-        try:
-            # Load dice_1.png through dice_6.png
-            for i in range(1, 7):
-                image_path = f"images/images/dice/dice_{i}.png"
-                if os.path.exists(image_path):
-                    img = pygame.image.load(image_path)
-                    # Scale to dice size
-                    self.dice_images[i] = pygame.transform.scale(img, self.dice_size)
-                else:
-                    print(f"Warning: Dice image not found: {image_path}")
-            
-            # Load transition image
-            transition_path = "images/images/dice/dice_transition.png"
-            if os.path.exists(transition_path):
-                img = pygame.image.load(transition_path)
-                self.transition_image = pygame.transform.scale(img, self.dice_size)
-            else:
-                print(f"Warning: Transition image not found: {transition_path}")
-        except Exception as e:
-            print(f"Error loading dice images: {e}")
-    
-    def start_animation(self):
-        """Start the dice rolling animation"""
+        self.dice_gap = 10  # Pixels between dice when rolling several
+        self.rng = random.Random(seed)  # Tumbling faces only
+
+        self.frames = []  # Frame index -> Surface (None if images are missing)
+        self._frame_indexes = {}  # Faces tuple -> frame index
+        self.schedule = []  # Frame index per step of the current roll; last entry is the outcome
+
+        self._register_dice_images()
+
+    def _register_dice_images(self):
+        """Declare the dice faces and transition image (loaded from the atlas on first render)"""
+        # dice_1.png through dice_6.png
+        for i in range(1, 7):
+            self.assets.register(f"dice_{i}", asset_path(f"dice/dice_{i}.png"), self.dice_size)
+        self.assets.register("dice_transition", asset_path("dice/dice_transition.png"), self.dice_size)
+
+    def get_dice_image(self, value):
+        """Dice face image for value (1-6, or TRANSITION), or None if it could not be loaded"""
+        if value == TRANSITION:
+            return self.assets.sprite("dice_transition")
+        return self.assets.sprite(f"dice_{value}")
+
+    def _frame(self, faces):
+        """Frame index for a tuple of faces, building (and caching) the frame on first use"""
+        index = self._frame_indexes.get(faces)
+        if index is None:
+            index = len(self.frames)
+            self.frames.append(self._compose(faces))
+            self._frame_indexes[faces] = index
+        return index
+
+    def _compose(self, faces):
+        """One surface with the dice for faces side by side (the sprite itself for a single die)"""
+        images = [self.get_dice_image(face) for face in faces]
+        if any(image is None for image in images):
+            return None
+        if len(images) == 1:
+            return images[0]
+        width, height = self.dice_size
+        surface = pygame.Surface((len(images) * width + (len(images) - 1) * self.dice_gap, height), pygame.SRCALPHA)
+        for i, image in enumerate(images):
+            # MAX onto the transparent surface copies RGBA exactly (see AssetManager._build_atlas)
+            surface.blit(image, (i * (width + self.dice_gap), 0), special_flags=pygame.BLEND_RGBA_MAX)
+        return to_display_format(surface)
+
+    def build_schedule(self, final_faces):
+        """
+        Frame indexes for a whole roll: a random face, then the transition image,
+        on every other face change, ending on final_faces
+        """
+        steps = max(1, round(self.animation_duration / self.step_duration))
+        num_dice = len(final_faces)
+        schedule = []
+        for step in range(steps):
+            if step % 2 == 0:  # Show dice for one step
+                faces = tuple(self.rng.randint(1, 6) for _ in range(num_dice))
+            else:  # Show transition for one step
+                faces = (TRANSITION,) * num_dice
+            schedule.append(self._frame(faces))
+        schedule.append(self._frame(tuple(final_faces)))
+        return schedule
+
+    def start_animation(self, faces=None, seed=None):
+        """
+        Start the dice rolling animation
+
+        Args:
+            faces: Outcome, one face per die (e.g. from GameState.roll_dice_faces);
+                   None = pick one with the animation's RNG
+            seed: Seed for this roll's tumbling faces (e.g. RollEvent.animation_seed);
+                  None = continue the animation's RNG
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        if faces is None:
+            faces = tuple(self.rng.randint(1, 6) for _ in range(self.num_dice))
+        self.final_faces = tuple(faces)
+        self.num_dice = len(self.final_faces)
+        self.schedule = self.build_schedule(self.final_faces)
         self.is_animating = True
-        self.animation_frame = 0
+        self.animation_step = 0
         self.just_finished = False
-        self.current_dice_value = random.randint(1, 6)
-    
+        self.scheduler.add(Tween(self.animation_duration, on_update=self._on_roll_progress,
+                                 on_complete=self._on_roll_complete), key=self)
+
     def stop_animation(self, final_value=None):
-        """Stop the animation and set final dice value"""
+        """
+        Stop the animation and show the outcome
+
+        Args:
+            final_value: Faces to show instead (a tuple, or an int for a single die); None = keep the outcome
+        """
+        self.scheduler.cancel(self)
         self.is_animating = False
-        self.animation_frame = 0
         self.just_finished = True
         if final_value is not None:
-            self.current_dice_value = final_value
-    
+            self.final_faces = (final_value,) if isinstance(final_value, int) else tuple(final_value)
+        self.schedule = [self._frame(self.final_faces)]
+        self.animation_step = 0
+
+    def _on_roll_progress(self, progress):
+        # After a slow frame several steps may have passed - the schedule is indexed by time
+        step = int(progress * self.animation_duration / self.step_duration)
+        self.animation_step = min(step, len(self.schedule) - 2)
+
+    def _on_roll_complete(self):
+        self.is_animating = False
+        self.just_finished = True
+        self.animation_step = len(self.schedule) - 1
+
     def update(self):
-        """Update animation frame"""
-        if self.is_animating:
-            self.animation_frame += 1
-            
-            # Change dice value randomly during animation (every 5 frames for slower switching)
-            if self.animation_frame % 5 == 0:  # Every 5 frames
-                self.current_dice_value = random.randint(1, 6)
-            
-            # Stop animation after duration
-            if self.animation_frame >= self.animation_duration:
-                # Set final random dice value when animation ends
-                self.current_dice_value = random.randint(1, 6)
-                self.is_animating = False
-                self.just_finished = True
-                self.animation_frame = 0
-    
+        """Advance the animation to the current time (the scheduler may be shared - updating it twice is harmless)"""
+        self.scheduler.update()
+
     def render(self):
         """Render the dice animation"""
-        if not self.dice_images and not self.transition_image:
-            return  # No images loaded
-        
-        x, y = self.dice_position
-        
-        if self.is_animating:
-            # Alternate between dice and transition (slower switching - every 5 frames)
-            if self.animation_frame % 10 < 5:  # Show dice for 5 frames
-                # Show random dice
-                if self.current_dice_value in self.dice_images:
-                    self.screen.blit(self.dice_images[self.current_dice_value], (x, y))
-            else:
-                # Show transition for 5 frames
-                if self.transition_image:
-                    self.screen.blit(self.transition_image, (x, y))
-        else:
-            # Show final dice value
-            if self.current_dice_value in self.dice_images:
-                self.screen.blit(self.dice_images[self.current_dice_value], (x, y))
-    
-    def get_final_value(self):
-        """Get the final dice value after animation"""
-        return self.current_dice_value
+        for blit in self.get_draw_list():
+            self.screen.blit(*blit)
+
+    def get_draw_list(self):
+        """
+        Dice image to show this frame, without drawing it
 
+        Returns:
+            List of (image, (x, y)) - empty if no images are loaded
+        """
+        if not self.schedule:
+            # Nothing rolled yet - show the resting faces
+            self.schedule = [self._frame(self.final_faces)]
+        image = self.frames[self.schedule[self.animation_step]]
+        if image is None:
+            return []  # Image not loaded
+        return [(image, self.dice_position)]
+
+    def get_final_faces(self):
+        """Faces of the last roll, one per die"""
+        return self.final_faces
+
+    def get_final_value(self):
+        """Get the final dice value (total of all dice) after animation"""
+        return sum(self.final_faces)
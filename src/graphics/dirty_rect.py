@@ -0,0 +1,119 @@
+"""
+Dirty-rectangle rendering
+Keeps a pre-rendered background and the sprites drawn last frame. Each frame only
+the regions where a sprite appeared, disappeared, moved or changed image are
+restored from the background, redrawn and pushed with pygame.display.update(rects).
+A frame where nothing changed draws nothing.
+"""
+import pygame
+
+
+class DirtyRectRenderer:
+    """Redraws only what changed since the previous frame"""
+
+    def __init__(self, screen, background=None):
+        """
+        Args:
+            screen: Display surface
+            background: Surface the size of the screen drawn under all sprites
+                        (e.g. the board); set later with set_background
+        """
+        self.screen = screen
+        self.background = background
+        self.previous = []  # (image, Rect) drawn last frame, in draw order
+        self.full_redraw = True
+        self.stats = {
+            'frames': 0,
+            'idle_frames': 0,  # Nothing changed - nothing drawn
+            'full_redraws': 0,
+            'pixels_updated': 0,
+        }
+
+    def set_background(self, background):
+        """Replace the background (forces a full redraw)"""
+        self.background = background
+        self.invalidate()
+
+    def invalidate(self):
+        """Redraw the whole screen on the next frame"""
+        self.full_redraw = True
+
+    def render(self, draw_list, present=True):
+        """
+        Draw one frame.
+
+        Args:
+            draw_list: List of (image, (x, y)) in back-to-front order
+            present: Push the changed regions to the display; with False the caller
+                     passes the returned rects to present() (e.g. to time the two separately)
+
+        Returns:
+            List of Rects drawn (and pushed to the display; empty on idle frames)
+        """
+        self.stats['frames'] += 1
+        sprites = [(image, image.get_rect(topleft=position)) for image, position in draw_list]
+
+        if self.full_redraw or self.background is None:
+            if self.background is not None:
+                self.screen.blit(self.background, (0, 0))
+            self.screen.blits(sprites, doreturn=False)
+            self.previous = sprites
+            self.full_redraw = False
+            self.stats['full_redraws'] += 1
+            self.stats['pixels_updated'] += self.screen.get_width() * self.screen.get_height()
+            dirty = [self.screen.get_rect()]
+            if present:
+                self.present(dirty)
+            return dirty
+
+        dirty = self._changed_rects(self.previous, sprites)
+        self.previous = sprites
+        if not dirty:
+            self.stats['idle_frames'] += 1
+            return []
+
+        screen = self.screen
+        screen_rect = screen.get_rect()
+        dirty = [rect.clip(screen_rect) for rect in _merge_rects(dirty)]
+        for area in dirty:
+            # Clip so sprites overlapping the area are redrawn only inside it
+            screen.set_clip(area)
+            screen.blit(self.background, area, area)
+            screen.blits([sprite for sprite in sprites if sprite[1].colliderect(area)], doreturn=False)
+            self.stats['pixels_updated'] += area.width * area.height
+        screen.set_clip(None)
+        if present:
+            self.present(dirty)
+        return dirty
+
+    def present(self, rects):
+        """Push drawn regions to the display (the whole screen is a flip)"""
+        if not rects:
+            return
+        if len(rects) == 1 and rects[0] == self.screen.get_rect():
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    @staticmethod
+    def _changed_rects(old, new):
+        """Rects of sprites that are not drawn identically (same image, same place) in both frames"""
+        old_keys = {(id(image), tuple(rect)) for image, rect in old}
+        new_keys = {(id(image), tuple(rect)) for image, rect in new}
+        changed = [rect for image, rect in old if (id(image), tuple(rect)) not in new_keys]
+        changed += [rect for image, rect in new if (id(image), tuple(rect)) not in old_keys]
+        return changed
+
+
+def _merge_rects(rects):
+    """Union overlapping rects so no pixel is redrawn twice"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        while True:
+            index = rect.collidelist(merged)
+            if index < 0:
+                break
+            rect.union_ip(merged.pop(index))
+        merged.append(rect)
+    return merged
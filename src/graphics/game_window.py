@@ -2,23 +2,75 @@
 Main game window and rendering loop
 creates pygame window
 """
+import os
+from collections import deque
 import pygame
+from src.graphics.animation import AnimationScheduler
+from src.graphics.asset_manager import DEFAULT_ATLAS_PATH, AssetManager
 from src.graphics.board import BoardRenderer
 from src.graphics.dice_animation import DiceAnimation
+from src.graphics.dirty_rect import DirtyRectRenderer
+from src.graphics.profiler import FrameProfiler, MetricsExporter, ProfilerOverlay
 from src.graphics.tokens import TokenRenderer
+from src.game_logic.board import load_board
+from src.game_logic.game_loop import GameLogic, RollEvent
 from src.game_logic.game_state import GameState
+from src.game_logic.event_log import EventLog
 from src.utils.input_handler import InputHandler
+from src.utils.input_multiplexer import InputMultiplexer
+
+
+def use_offscreen_display():
+    """
+    Switch pygame to SDL's dummy video driver: no window is opened and the screen
+    is an ordinary Surface, so everything renders on machines without a display.
+    """
+    if pygame.display.get_init() and pygame.display.get_driver() == 'dummy':
+        return
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    pygame.display.quit()
+    pygame.display.init()
 
 class GameWindow:
-    def __init__(self):
+    def __init__(self, event_log_path=None, port=None, test_mode=False, protocol='text', dirty_rects=True,
+                 atlas_path=DEFAULT_ATLAS_PATH, animation_speed=1.0, animation_clock=None, num_dice=1,
+                 headless=False, metrics_path=None, metrics_port=None, threaded=True,
+                 board_path=None):
+        """
+        Args:
+            event_log_path: Optional file to record a binary event log of the game
+                            (replay it with python -m src.game_logic.event_log)
+            port: Arduino Serial port (None = auto-detect), or a list of ports to read
+                  several controllers at once (see InputMultiplexer)
+            test_mode: If True, run without an Arduino (see InputHandler)
+            protocol: 'text' or 'binary' Serial protocol (binary falls back to text on old hubs)
+            dirty_rects: If True, only redraw and push the screen regions that changed;
+                         if False, redraw the whole screen every frame
+            atlas_path: Where the packed sprite atlas is saved for faster starts (None = don't save)
+            animation_speed: Fast-forward factor for all animations (2.0 = twice as fast)
+            animation_clock: Clock driving the animations (default: real time; pass a
+                             VirtualClock to step time by hand in headless runs)
+            num_dice: Dice rolled per turn
+            headless: If True, render offscreen (see use_offscreen_display) - for benchmarks and CI
+            metrics_path: File to keep the profiler's Prometheus metrics in (None = don't write)
+            metrics_port: Serve the metrics on http://127.0.0.1:<port>/metrics (None = no server)
+            threaded: If True, the game rules and Arduino I/O run on their own fixed-step thread
+                      (see GameLogic); if False, they step once per frame (deterministic, for
+                      benchmarks and replays)
+            board_path: Board definition file (default: src/game_logic/boards/default.json)
+        """
+        if headless:
+            use_offscreen_display()
         self.WIDTH, self.HEIGHT = 800, 800
-        self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+        self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT), pygame.RESIZABLE)
         pygame.display.set_caption("Monopoly")
         self.clock = pygame.time.Clock()
         self.running = True
         
         # Create game state (stores all game data in memory)
-        self.game_state = GameState()
+        self.game_state = GameState(board=load_board(board_path) if board_path else None)
+        if event_log_path:
+            self.game_state.event_log = EventLog(event_log_path, board=self.game_state.board)
         
         # Initialize all properties on the board
         self.game_state.initialize_all_properties()
@@ -26,145 +78,183 @@ class GameWindow:
         # Add single player for presentation
         self.game_state.add_player("Player 1", "test")
         
-        # Create renderers
-        self.board_renderer = BoardRenderer(self.screen)
-        self.dice_animation = DiceAnimation(self.screen)
+        # Create renderers (images load on first use, scaled once, in the display pixel format)
+        self.assets = AssetManager(atlas_path)
+        # All animations run as time-based tracks on one scheduler
+        self.animations = AnimationScheduler(animation_clock, speed=animation_speed)
+        self.board_renderer = BoardRenderer(self.screen, self.assets, self.game_state.board)
+        self.dice_animation = DiceAnimation(self.screen, self.assets, self.animations, num_dice=num_dice)
         
         # Create token renderer (needs position calculator from board renderer)
-        self.token_renderer = TokenRenderer(self.screen, self.board_renderer.position_calc)
+        self.token_renderer = TokenRenderer(self.screen, self.board_renderer.position_calc, self.assets,
+                                            self.animations)
         
-        # Track if we've processed the dice roll for this animation
-        self.dice_roll_processed = False
+        # Board is drawn once into a background; each frame only changed regions are redrawn
+        self.dirty_rects = dirty_rects
+        self.frame_renderer = DirtyRectRenderer(self.screen)
+        self._build_background()
+        
+        # Every frame stage is timed; F3 shows the recent frames, metrics go to a file or local socket
+        self.profiler = FrameProfiler()
+        self.profiler.add_counter('dirty_rect_idle_frames_total', "Frames where nothing changed on screen",
+                                  lambda: self.frame_renderer.stats['idle_frames'])
+        self.profiler.add_counter('dirty_rect_full_redraws_total', "Frames that redrew the whole screen",
+                                  lambda: self.frame_renderer.stats['full_redraws'])
+        self.profiler.add_counter('dirty_rect_pixels_total', "Pixels redrawn",
+                                  lambda: self.frame_renderer.stats['pixels_updated'])
+        self.profiler.add_counter('animation_max_step_seconds', "Largest animation time step",
+                                  lambda: self.animations.stats['max_dt'])
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        self.metrics = None
+        if metrics_path or metrics_port is not None:
+            self.metrics = MetricsExporter(self.profiler, path=metrics_path, port=metrics_port)
         
         # Initialize Arduino input handler (test_mode=True for testing without Arduino)
-        self.input_handler = InputHandler(test_mode=False)  # Set to False when Arduino is connected
+        if isinstance(port, (list, tuple)) and len(port) > 1:
+            # Several controllers: route presses to per-player queues
+            self.input_handler = InputMultiplexer()
+            for controller_port in port:
+                self.input_handler.add_port(controller_port, test_mode=test_mode, protocol=protocol)
+        else:
+            if isinstance(port, (list, tuple)):
+                port = port[0] if port else None
+            self.input_handler = InputHandler(port=port, test_mode=test_mode, protocol=protocol)
         self.input_handler.connect()
         
+        # The rules run in GameLogic, which owns game_state from here on; the window reads
+        # its immutable view and animates the rolls it publishes
+        self.logic = GameLogic(self.game_state, self.input_handler, num_dice=num_dice,
+                               roll_cooldown=self.dice_animation.animation_duration / animation_speed,
+                               clock=animation_clock)
         # Send initial property name for starting position (GO)
-        initial_prop = self.game_state.get_property_at_position(0)
-        if initial_prop:
-            self.input_handler.send_property_name(initial_prop.name)
+        self.logic.send_current_property()
+        self.profiler.add_counter('logic_ticks_total', "Game logic ticks", lambda: self.logic.stats['ticks'])
+        self.profiler.add_counter('logic_step_seconds_max', "Slowest game logic tick",
+                                  lambda: self.logic.stats['max_step'])
+        self.pending_rolls = deque()  # RollEvents waiting for their turn on the dice
+        self.shown_roll = None  # RollEvent the dice are animating
+        self.threaded = threaded
+        if threaded:
+            self.logic.start()
         
-    def _send_current_property(self):
-        """Send the current player's property name to Arduino"""
-        current_player = self.game_state.get_current_player()
-        if current_player:
-            prop = self.game_state.get_property_at_position(current_player.position)
-            if prop:
-                self.input_handler.send_property_name(prop.name)
+    def _build_background(self):
+        """Render everything that does not move (window fill and board) into the background"""
+        background = pygame.Surface(self.screen.get_size())
+        background.fill((255, 255, 255))
+        self.board_renderer.render(background)
+        self.frame_renderer.set_background(background.convert())
+    
+    def _handle_resize(self, size):
+        """Re-layout for a new window size; scaled images and the background are rebuilt once"""
+        self.WIDTH, self.HEIGHT = size
+        self.screen = pygame.display.get_surface()
+        self.board_renderer.resize(self.screen)
+        self.token_renderer.screen = self.screen
+        self.token_renderer.position_calc = self.board_renderer.position_calc
+        self.token_renderer.relayout()
+        self.dice_animation.screen = self.screen
+        self.dice_animation.dice_position = (self.WIDTH // 2 + 50, self.HEIGHT // 2 + 50)
+        self.frame_renderer.screen = self.screen
+        self._build_background()
     
     def _handle_roll_request(self):
-        """Handle a request to roll dice (from keyboard or Arduino)"""
-        if not self.dice_animation.is_animating:
-            # Get current player
-            current_player = self.game_state.get_current_player()
-            if current_player:
-                # Check if player should skip turn (e.g., in jail)
-                should_skip, reason = self.game_state.should_skip_turn(current_player)
-                
-                if should_skip:
-                    # Player skips turn
-                    print(reason)
-                    # In single player mode, just wait for next roll
-                    # self.game_state.next_turn()  # Commented out for single player
-                    # Send current player's property name
-                    self._send_current_property()
-                else:
-                    # Player can roll dice
-                    if reason:  # Released from jail message
-                        print(reason)
-                    
-                    # Reset processed flag
-                    self.dice_roll_processed = False
-                    # Start dice animation
-                    self.dice_animation.start_animation()
+        """Handle a request to roll dice from the keyboard (Arduino rolls are read by the logic loop)"""
+        self.logic.request_roll()
     
     def run(self):
-        while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    # Press SPACE to trigger dice roll and move player
-                    if event.key == pygame.K_SPACE:
-                        self._handle_roll_request()
-            
-            # Check for Arduino input
-            arduino_action = self.input_handler.process_input(self.game_state)
-            if arduino_action:
-                action_name, action_data = arduino_action
-                if action_name == 'roll_dice':
-                    # In single player mode, always accept roll requests
+        try:
+            while self.running:
+                self.run_frame()
+        finally:
+            # Also on an exception, so the event log is flushed and the hub released
+            self.close()
+    
+    def close(self):
+        """Stop the logic loop, disconnect from Arduino and close the metrics and event log"""
+        self.logic.stop()
+        self.input_handler.disconnect()
+        if self.metrics is not None:
+            self.metrics.close()
+        if self.game_state.event_log is not None:
+            self.game_state.event_log.close()
+    
+    def run_frame(self):
+        """Process input, update game logic and animations, and draw one frame"""
+        self.profiler.begin_frame()
+        self.process_input()
+        self.update()
+        self.draw(self.compose_frame())
+        if self.metrics is not None:
+            self.metrics.poll()
+            self.profiler.mark('metrics')
+        self.clock.tick(60)
+        self.profiler.mark('wait')
+        self.profiler.end_frame()
+    
+    # run_frame stages - separate so benchmarks and profilers can time each one
+    
+    def process_input(self):
+        """Handle window events (Arduino input is read by the logic loop)"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.VIDEORESIZE:
+                self._handle_resize(event.size)
+            elif event.type == pygame.KEYDOWN:
+                # Press SPACE to trigger dice roll and move player
+                if event.key == pygame.K_SPACE:
                     self._handle_roll_request()
-            
-            # Update animations
-            self.dice_animation.update()
-            self.token_renderer.update_movements()  # Update token movement animations
-            
-            # Check if dice animation just finished (only process once)
-            if self.dice_animation.just_finished and not self.dice_roll_processed:
-                # Mark as processed so we don't do it multiple times
-                self.dice_roll_processed = True
-                self.dice_animation.just_finished = False
-                
-                # Get current player
-                current_player = self.game_state.get_current_player()
-                if current_player:
-                    # Roll dice using game state (single die, 1-6)
-                    dice_roll = self.game_state.roll_dice(num_dice=1)
-                    # Set the animation to show the final value (dice stays visible)
-                    self.dice_animation.stop_animation(final_value=dice_roll)
-                    
-                    # Get starting position before move
-                    start_position = current_player.position
-                    
-                    # Move player based on dice roll (1-6 spaces)
-                    new_position, passed_go, landed_on_go, went_to_jail = self.game_state.move_player(current_player, dice_roll)
-                    
-                    if went_to_jail:
-                        print(f"{current_player.name} rolled {dice_roll}, landed on Go to Jail! Sent to Jail (position 7)")
-                    else:
-                        print(f"{current_player.name} rolled {dice_roll}, moved to position {new_position}")
-                    
-                    # Start smooth movement animation for the token (from start to target)
-                    # If went to jail, animate to position 7
-                    self.token_renderer.start_movement(current_player, new_position, start_position=start_position)
-                    
-                    # Handle landing on property
-                    action, prop, message = self.game_state.handle_landing(current_player, new_position)
-                    if action == 'buy':
-                        print(f"{message}")
-                    elif action == 'rent':
-                        print(f"{message}")
-                    
-                    # Send property name to Arduino
-                    if prop:
-                        self.input_handler.send_property_name(prop.name)
-                    else:
-                        # Get property at position even if handle_landing returned None
-                        prop_at_pos = self.game_state.get_property_at_position(new_position)
-                        if prop_at_pos:
-                            self.input_handler.send_property_name(prop_at_pos.name)
-                    
-                    # In single player mode, don't advance turn (always same player)
-                    # For presentation: just reset for next roll
-                    # self.game_state.next_turn()  # Commented out for single player
-                    # Send current player's property name to Arduino
-                    self._send_current_property()
-            
-            self.screen.fill((255, 255, 255))
-            
-            # Render board (base layer)
-            self.board_renderer.render()
-            
-            # Render tokens (on top of board)
-            self.token_renderer.render_all_tokens(self.game_state.players)
-            
-            # Render dice animation (on top of everything)
-            self.dice_animation.render()
-            
-            pygame.display.flip()
-            self.clock.tick(60)
+                # F3 shows or hides the frame profiler
+                elif event.key == pygame.K_F3:
+                    self.profiler_overlay.toggle()
+        self.profiler.mark('events')
+    
+    def update(self):
+        """Take the rolls the game logic resolved and advance the animations showing them"""
+        if not self.threaded:
+            self.logic.step()
+        for event in self.logic.poll_events():
+            if isinstance(event, RollEvent):
+                self.pending_rolls.append(event)
+        self.profiler.mark('logic')
+        
+        # Roll the dice towards the next resolved outcome
+        if self.shown_roll is None and self.pending_rolls:
+            self.shown_roll = self.pending_rolls.popleft()
+            self.dice_animation.start_animation(self.shown_roll.faces, self.shown_roll.animation_seed)
+        
+        # Update animations (dice and token movement) by the time since the last frame
+        self.animations.update()
+        self.profiler.mark('animation')
         
-        # Cleanup: disconnect from Arduino when game closes
-        self.input_handler.disconnect()
\ No newline at end of file
+        # Once the dice show the outcome, move the token (from start to target)
+        if self.shown_roll is not None and self.dice_animation.just_finished:
+            self.dice_animation.just_finished = False
+            roll, self.shown_roll = self.shown_roll, None
+            # If went to jail, walk to Go to Jail and jump to Jail (the board never changes - safe to read here)
+            jump_from = self.game_state.board.go_to_jail_position if roll.went_to_jail else None
+            self.token_renderer.start_movement(roll.player_index, roll.new_position, start_position=roll.start_position,
+                                               jump_from=jump_from)
+    
+    def compose_frame(self):
+        """
+        Everything drawn over the background this frame
+        
+        Returns:
+            List of (image, (x, y)) in back-to-front order
+        """
+        # Board is the background; tokens on top of it, then dice, then the profiler overlay
+        # (the token draw list is cached by the token renderer - don't extend it in place)
+        draw_list = (self.token_renderer.get_draw_list(self.logic.view.players) + self.dice_animation.get_draw_list()
+                     + self.profiler_overlay.get_draw_list())
+        self.profiler.mark('compose')
+        return draw_list
+    
+    def draw(self, draw_list):
+        """Draw the frame to the screen and push it to the display"""
+        if not self.dirty_rects:
+            self.frame_renderer.invalidate()
+        dirty = self.frame_renderer.render(draw_list, present=False)
+        self.profiler.mark('render')
+        self.frame_renderer.present(dirty)
+        self.profiler.mark('display')
\ No newline at end of file
@@ -0,0 +1,304 @@
+"""
+Per-frame profiler
+GameWindow marks the end of each stage of a frame (events, input, animation, ...);
+the profiler keeps the time between marks for the last few hundred frames, running
+totals, and a histogram of frame times. A mark is one perf_counter() call and a
+dict update, so the profiler stays on in normal play.
+
+  - ProfilerOverlay draws the recent frames as stacked bars (toggle with F3 in the game)
+  - MetricsExporter publishes the counters in the Prometheus text format, to a file
+    and/or over HTTP on localhost
+
+Usage:
+    profiler = FrameProfiler()
+    profiler.begin_frame()
+    handle_events(); profiler.mark('events')
+    draw(); profiler.mark('render')
+    profiler.end_frame()
+"""
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pygame
+
+FRAME_BUDGET = 1 / 60
+# Histogram bucket upper bounds (seconds) for frame times
+FRAME_BUCKETS = (0.001, 0.002, 0.004, 0.008, FRAME_BUDGET, 0.025, 0.033, 0.05, 0.1, 0.25)
+# Stages that are waiting, not working - counted, but not part of the frame time
+IDLE_STAGES = ('wait',)
+METRIC_PREFIX = "monopoly"
+
+
+class FrameProfiler:
+    """Stage timings for recent frames, plus running totals and a frame-time histogram"""
+
+    def __init__(self, history=240, buckets=FRAME_BUCKETS, enabled=True):
+        """
+        Args:
+            history: Frames kept for the overlay and recent percentiles
+            buckets: Histogram bucket upper bounds in seconds
+            enabled: If False, begin_frame/mark/end_frame do nothing
+        """
+        self.enabled = enabled
+        self.stages = []  # Stage names in the order they were first marked
+        self.recent = deque(maxlen=history)  # Per frame: dict of stage -> seconds
+        self.recent_frame_times = deque(maxlen=history)
+        self.stage_totals = {}  # stage -> seconds, since start
+        self.frames = 0
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # Last bucket: slower than every bound
+        self.frame_time_sum = 0.0
+        self.max_frame_time = 0.0
+        self.counters = {}  # metric name -> (help text, function returning the value)
+        self._last = None  # perf_counter() at the last mark, None outside a frame
+        self._current = {}
+
+    def begin_frame(self):
+        if self.enabled:
+            self._last = time.perf_counter()
+            self._current = {}
+
+    def mark(self, stage):
+        """End a stage: the time since the previous mark (or begin_frame) is charged to it"""
+        if self._last is None:
+            return
+        now = time.perf_counter()
+        self._current[stage] = self._current.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Record the frame's stages (call after the last mark)"""
+        if self._last is None:
+            return
+        self._last = None
+        current = self._current
+        frame_time = 0.0
+        for stage, seconds in current.items():
+            if stage not in self.stage_totals:
+                self.stages.append(stage)
+                self.stage_totals[stage] = 0.0
+            self.stage_totals[stage] += seconds
+            if stage not in IDLE_STAGES:
+                frame_time += seconds
+        self.recent.append(current)
+        self.recent_frame_times.append(frame_time)
+        self.frames += 1
+        self.frame_time_sum += frame_time
+        self.max_frame_time = max(self.max_frame_time, frame_time)
+        bucket = 0
+        while bucket < len(self.buckets) and frame_time > self.buckets[bucket]:
+            bucket += 1
+        self.bucket_counts[bucket] += 1
+
+    def add_counter(self, name, help_text, read):
+        """
+        Export another value with the profiler's metrics
+
+        Args:
+            name: Metric name without the prefix (e.g. 'dirty_rect_idle_frames_total')
+            help_text: One line description
+            read: Function returning the current value
+        """
+        self.counters[name] = (help_text, read)
+
+    def recent_percentile(self, fraction):
+        """Frame time (seconds) at a percentile of the recent frames (fraction 0-1)"""
+        if not self.recent_frame_times:
+            return 0.0
+        ordered = sorted(self.recent_frame_times)
+        return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+    def prometheus_text(self):
+        """All counters in the Prometheus text exposition format"""
+        p = METRIC_PREFIX
+        lines = [
+            f"# HELP {p}_frames_total Frames profiled",
+            f"# TYPE {p}_frames_total counter",
+            f"{p}_frames_total {self.frames}",
+            f"# HELP {p}_stage_seconds_total Time spent in each frame stage",
+            f"# TYPE {p}_stage_seconds_total counter",
+        ]
+        for stage, seconds in list(self.stage_totals.items()):
+            lines.append(f'{p}_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}')
+        lines += [
+            f"# HELP {p}_frame_seconds Frame time, without the frame-rate wait",
+            f"# TYPE {p}_frame_seconds histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            cumulative += count
+            lines.append(f'{p}_frame_seconds_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{p}_frame_seconds_bucket{{le="+Inf"}} {cumulative + self.bucket_counts[-1]}')
+        lines.append(f"{p}_frame_seconds_sum {self.frame_time_sum:.6f}")
+        lines.append(f"{p}_frame_seconds_count {self.frames}")
+        lines += [
+            f"# HELP {p}_frame_seconds_max Slowest frame since start",
+            f"# TYPE {p}_frame_seconds_max gauge",
+            f"{p}_frame_seconds_max {self.max_frame_time:.6f}",
+        ]
+        for name, (help_text, read) in list(self.counters.items()):
+            kind = "counter" if name.endswith("_total") else "gauge"
+            lines += [f"# HELP {p}_{name} {help_text}", f"# TYPE {p}_{name} {kind}", f"{p}_{name} {read()}"]
+        return "\n".join(lines) + "\n"
+
+
+# Stage colors for the overlay (stages not listed are grey)
+STAGE_COLORS = {
+    'events': (120, 120, 255),
+    'input': (80, 200, 255),
+    'animation': (80, 220, 120),
+    'logic': (230, 200, 60),
+    'compose': (240, 140, 60),
+    'render': (230, 70, 70),
+    'display': (200, 90, 220),
+}
+
+
+class ProfilerOverlay:
+    """
+    Rolling frame-time graph: one stacked bar per recent frame (a color per stage),
+    the 60 FPS budget line and p50/p99/max. Redrawn into a new surface every few
+    frames, so the dirty-rect renderer sees it change.
+    """
+
+    def __init__(self, profiler, position=(10, 10), size=(360, 120), refresh_every=10, scale=2 * FRAME_BUDGET):
+        """
+        Args:
+            profiler: FrameProfiler to show
+            position: Top-left corner on screen
+            size: (width, height) of the graph
+            refresh_every: Frames between redraws of the graph
+            scale: Frame time (seconds) at the top of the graph
+        """
+        self.profiler = profiler
+        self.position = position
+        self.size = size
+        self.refresh_every = refresh_every
+        self.scale = scale
+        self.visible = False
+        self.font = None
+        self.surface = None
+        self._frames_until_refresh = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._frames_until_refresh = 0
+
+    def get_draw_list(self):
+        """The overlay as [(image, (x, y))] when visible, else []"""
+        if not self.visible:
+            return []
+        self._frames_until_refresh -= 1
+        if self.surface is None or self._frames_until_refresh <= 0:
+            self.surface = self._draw()
+            self._frames_until_refresh = self.refresh_every
+        return [(self.surface, self.position)]
+
+    def _draw(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 16)
+        width, height = self.size
+        text_height = 28
+        graph_height = height - text_height
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+
+        profiler = self.profiler
+        frames = list(profiler.recent)[-width:]
+        x = width - len(frames)
+        for stages in frames:
+            y = height
+            for stage, seconds in stages.items():
+                if stage in IDLE_STAGES:
+                    continue
+                bar = min(graph_height, int(seconds / self.scale * graph_height + 0.5))
+                if bar:
+                    color = STAGE_COLORS.get(stage, (160, 160, 160))
+                    pygame.draw.line(surface, color, (x, y - 1), (x, max(y - bar, text_height)))
+                    y -= bar
+            x += 1
+
+        budget_y = height - int(FRAME_BUDGET / self.scale * graph_height)
+        pygame.draw.line(surface, (255, 255, 255, 200), (0, budget_y), (width - 1, budget_y))
+        summary = (f"frame p50 {profiler.recent_percentile(0.5) * 1000:.2f}  "
+                   f"p99 {profiler.recent_percentile(0.99) * 1000:.2f}  "
+                   f"max {max(profiler.recent_frame_times, default=0) * 1000:.2f} ms")
+        surface.blit(self.font.render(summary, True, (255, 255, 255)), (4, 2))
+        x = 4
+        for stage in profiler.stages:
+            if stage in IDLE_STAGES:
+                continue
+            label = self.font.render(stage, True, STAGE_COLORS.get(stage, (160, 160, 160)))
+            surface.blit(label, (x, 14))
+            x += label.get_width() + 6
+        return surface
+
+
+class MetricsExporter:
+    """Publishes a FrameProfiler's metrics to a text file and/or a local HTTP endpoint"""
+
+    def __init__(self, profiler, path=None, port=None, interval=5.0, host="127.0.0.1"):
+        """
+        Args:
+            profiler: FrameProfiler to export
+            path: File rewritten every interval seconds (e.g. for node_exporter's textfile collector)
+            port: Serve the metrics at http://host:port/metrics (None = no server)
+            interval: Seconds between file writes
+            host: Address the server listens on (localhost only by default)
+        """
+        self.profiler = profiler
+        self.path = path
+        self.interval = interval
+        self.server = None
+        self._next_write = 0.0
+        if port is not None:
+            self.server = ThreadingHTTPServer((host, port), _metrics_handler(profiler))
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True).start()
+
+    def poll(self):
+        """Write the metrics file if interval has passed (call once per frame)"""
+        if self.path is None:
+            return
+        now = time.monotonic()
+        if now >= self._next_write:
+            self._next_write = now + self.interval
+            self.write()
+
+    def write(self):
+        """Write the metrics file now (replaced atomically, so readers never see half a file)"""
+        if self.path is None:
+            return
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(self.profiler.prometheus_text())
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Could not write metrics to {self.path}: {e}")
+            self.path = None
+
+    def close(self):
+        self.write()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def _metrics_handler(profiler):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = profiler.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # No line per scrape on the console
+
+    return MetricsHandler
@@ -0,0 +1,196 @@
+"""
+Render benchmark on an offscreen display
+Replays scripted games (seeded rolls, animation time stepped at 60 FPS on a
+VirtualClock) through GameWindow and reports how long each stage of a frame
+takes. Needs no display or Arduino, so it runs on CI.
+
+Frames can be dumped as PNG or raw RGB buffers, and compared against a
+directory of earlier dumps (golden images) - the replay is deterministic, so
+any difference is a rendering change.
+
+Usage:
+    python -m src.graphics.render_benchmark --games 3 --rolls 20 --players 4
+    python -m src.graphics.render_benchmark --dump-dir frames --dump-every 30
+    python -m src.graphics.render_benchmark --dump-dir new --golden-dir frames --dump-every 30
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+import pygame
+from src.graphics.animation import VirtualClock
+from src.graphics.game_window import GameWindow
+from src.utils.serial_benchmark import percentile
+
+FRAME_TIME = 1 / 60
+STAGES = ('input', 'update', 'compose', 'draw')  # GameWindow.run_frame stages, in order
+
+
+class FrameDumper:
+    """Writes numbered frames as PNG or raw RGB, optionally comparing each with a golden copy"""
+
+    def __init__(self, dump_dir, image_format='png', golden_dir=None):
+        """
+        Args:
+            dump_dir: Directory for the frames (created if needed)
+            image_format: 'png', or 'raw' for the bare RGB bytes (width x height x 3, row by row)
+            golden_dir: Directory of earlier dumps in the same format to compare against (None = don't compare)
+        """
+        self.dump_dir = dump_dir
+        self.image_format = image_format
+        self.golden_dir = golden_dir
+        self.dumped = 0
+        self.mismatches = []  # File names that differ from (or are missing in) golden_dir
+        os.makedirs(dump_dir, exist_ok=True)
+
+    def dump(self, surface, name):
+        filename = f"{name}.{'png' if self.image_format == 'png' else 'rgb'}"
+        path = os.path.join(self.dump_dir, filename)
+        if self.image_format == 'png':
+            pygame.image.save(surface, path)
+        else:
+            with open(path, 'wb') as f:
+                f.write(pygame.image.tobytes(surface, 'RGB'))
+        self.dumped += 1
+        if self.golden_dir is not None and not self._matches_golden(surface, filename):
+            self.mismatches.append(filename)
+
+    def _matches_golden(self, surface, filename):
+        golden_path = os.path.join(self.golden_dir, filename)
+        try:
+            if self.image_format == 'png':
+                golden = pygame.image.load(golden_path)
+                if golden.get_size() != surface.get_size():
+                    return False
+                golden_bytes = pygame.image.tobytes(golden, 'RGB')
+            else:
+                with open(golden_path, 'rb') as f:
+                    golden_bytes = f.read()
+        except (OSError, pygame.error):
+            return False
+        return golden_bytes == pygame.image.tobytes(surface, 'RGB')
+
+
+def replay_game(seed, rolls=20, players=1, num_dice=1, dirty_rects=True, dumper=None, dump_every=0):
+    """
+    Play one scripted game through an offscreen GameWindow, timing every frame stage.
+
+    Each roll is requested, then frames run (1/60 s of animation time each) until
+    the dice and tokens have settled; with several players the turn passes after each roll.
+
+    Args:
+        seed: Seed for the game and dice RNGs (same seed = same frames)
+        rolls: Rolls to play
+        players: Players in the game
+        num_dice: Dice per roll
+        dirty_rects: Passed to GameWindow
+        dumper: Optional FrameDumper
+        dump_every: Dump every Nth frame (0 = none)
+
+    Returns:
+        Dict of stage -> list of seconds per frame (plus 'frame' for the total)
+    """
+    clock = VirtualClock()
+    window = GameWindow(test_mode=True, dirty_rects=dirty_rects, atlas_path=None, animation_clock=clock,
+                        num_dice=num_dice, headless=True, threaded=False)
+    window.game_state.rng = random.Random(seed)  # The dice animation is seeded from each roll
+    for i in range(1, players):
+        window.game_state.add_player(f"Player {i + 1}", "test")
+    window.logic.publish_view()
+
+    stages = [('input', window.process_input), ('update', window.update)]
+    times = {stage: [] for stage in STAGES + ('frame',)}
+    frame = 0
+
+    def run_frame():
+        nonlocal frame
+        clock.advance(FRAME_TIME)
+        start = t = time.perf_counter()
+        for stage, run in stages:
+            run()
+            now = time.perf_counter()
+            times[stage].append(now - t)
+            t = now
+        draw_list = window.compose_frame()
+        now = time.perf_counter()
+        times['compose'].append(now - t)
+        t = now
+        window.draw(draw_list)
+        now = time.perf_counter()
+        times['draw'].append(now - t)
+        times['frame'].append(now - start)
+        if dumper is not None and dump_every and frame % dump_every == 0:
+            dumper.dump(window.screen, f"seed{seed}_frame{frame:05d}")
+        frame += 1
+
+    try:
+        run_frame()  # First frame: full redraw, atlas build
+        for _ in range(rolls):
+            window._handle_roll_request()
+            run_frame()
+            while window.dice_animation.is_animating or window.token_renderer.moving_tokens:
+                run_frame()
+            run_frame()  # Settled frame (the roll has been applied)
+            if players > 1:
+                window.game_state.next_turn()
+                window.logic.publish_view()
+    finally:
+        window.close()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frame rendering on an offscreen display")
+    parser.add_argument("--games", type=int, default=3, help="Scripted games to replay")
+    parser.add_argument("--rolls", type=int, default=20, help="Rolls per game")
+    parser.add_argument("--players", type=int, default=1, help="Players per game")
+    parser.add_argument("--dice", type=int, choices=[1, 2], default=1, help="Dice per roll")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the first game (game i uses seed + i)")
+    parser.add_argument("--full-redraw", action="store_true", help="Redraw the whole screen every frame")
+    parser.add_argument("--dump-dir", default=None, help="Write frames to this directory")
+    parser.add_argument("--dump-format", choices=["png", "raw"], default="png", help="Frame dump format")
+    parser.add_argument("--dump-every", type=int, default=60, help="Dump every Nth frame of each game")
+    parser.add_argument("--golden-dir", default=None,
+                        help="Compare dumped frames with the same frames in this directory (needs --dump-dir)")
+    args = parser.parse_args()
+    if args.golden_dir is not None and args.dump_dir is None:
+        parser.error("--golden-dir needs --dump-dir (frames are compared as they are dumped)")
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    dumper = FrameDumper(args.dump_dir, args.dump_format, args.golden_dir) if args.dump_dir else None
+    totals = {stage: [] for stage in STAGES + ('frame',)}
+    started = time.perf_counter()
+    # The game prints every roll and Arduino message; keep the report readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for game in range(args.games):
+            times = replay_game(args.seed + game, args.rolls, args.players, args.dice,
+                                dirty_rects=not args.full_redraw, dumper=dumper,
+                                dump_every=args.dump_every if dumper else 0)
+            for stage, values in times.items():
+                totals[stage].extend(values)
+    elapsed = time.perf_counter() - started
+    pygame.quit()
+
+    frames = len(totals['frame'])
+    print(f"{args.games} games, {args.rolls} rolls each, {args.players} players: {frames} frames"
+          f" in {elapsed:.2f} s")
+    print(f"  {'stage':<8} {'p50':>9} {'p99':>9} {'max':>9}")
+    for stage in STAGES + ('frame',):
+        values = totals[stage]
+        print(f"  {stage:<8} {percentile(values, 0.5) * 1000:7.3f}ms {percentile(values, 0.99) * 1000:7.3f}ms"
+              f" {max(values) * 1000:7.3f}ms")
+    if dumper is not None:
+        print(f"Dumped {dumper.dumped} frames to {args.dump_dir}")
+        if args.golden_dir is not None:
+            if dumper.mismatches:
+                print(f"{len(dumper.mismatches)} frames differ from {args.golden_dir}:")
+                for name in dumper.mismatches:
+                    print(f"  {name}")
+                raise SystemExit(1)
+            print(f"All frames match {args.golden_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,189 +1,249 @@
 """
 Player tokens rendering
+Tokens glide between spaces along the board path (through the corner spaces, so
+they turn the corners instead of cutting across) and Go To Jail is a jump
+straight to Jail. Resting tokens are kept in an occupancy index (space -> tokens)
+that changes only when a token arrives or leaves, and their screen positions are
+cached, so an idle frame just reuses the previous draw list.
 """
+import math
 import pygame
-import os
+from src.graphics.animation import AnimationScheduler, Tween, ease_in_out_quad
+from src.graphics.asset_manager import AssetManager, asset_path
 from src.utils.position_calculator import PositionCalculator
 
+# Token image per player index; other players use 'default'
+TOKEN_IMAGES = {
+    0: "tokens/image-removebg-preview.png",  # Player 1
+    1: "tokens/image 15.png",  # Player 2
+    'default': "tokens/test.png",
+}
+
 class TokenRenderer:
-    def __init__(self, screen, position_calculator):
+    def __init__(self, screen, position_calculator, assets=None, scheduler=None):
         self.screen = screen
         self.position_calc = position_calculator
-        self.token_images = {}
+        self.assets = assets if assets is not None else AssetManager()
+        self.scheduler = scheduler if scheduler is not None else AnimationScheduler()
         self.token_size = (60, 60)  # Size of token images (increased from 40x40)
         
-        # Track visual positions for smooth movement (player_index -> visual_position)
-        self.visual_positions = {}  # Maps player to their current visual position
-        self.moving_tokens = {}  # Maps player to target position when moving
-        self.movement_timers = {}  # Maps player to frame counter (pauses at each space)
-        self.frames_per_space = 20  # Number of frames to wait at each space (slower movement)
-        
-        self._load_token_images()
-    
-    def _load_token_images(self):
-        """Load token images for each player"""
-        try:
-            # Load image-removebg-preview.png for Player 1 (index 0)
-            player1_path = "images/images/tokens/image-removebg-preview.png"
-            if os.path.exists(player1_path):
-                img = pygame.image.load(player1_path)
-                # Scale to token size
-                self.token_images[0] = pygame.transform.scale(img, self.token_size)
-                print(f"Loaded Player 1 token: {player1_path}")
-            else:
-                print(f"Warning: Player 1 token image not found: {player1_path}")
-            
-            # Load image 15.png for Player 2 (index 1)
-            player2_path = "images/images/tokens/image 15.png"
-            if os.path.exists(player2_path):
-                img = pygame.image.load(player2_path)
-                # Scale to token size
-                self.token_images[1] = pygame.transform.scale(img, self.token_size)
-                print(f"Loaded Player 2 token: {player2_path}")
-            else:
-                print(f"Warning: Player 2 token image not found: {player2_path}")
-            
-            # Load test.png as default for other players
-            default_path = "images/images/tokens/test.png"
-            if os.path.exists(default_path):
-                img = pygame.image.load(default_path)
-                # Scale to token size
-                self.token_images['default'] = pygame.transform.scale(img, self.token_size)
-            else:
-                print(f"Warning: Default token image not found: {default_path}")
-        except Exception as e:
-            print(f"Error loading token images: {e}")
+        # One TokenState per player index
+        self.tokens = []
+        self.occupancy = {}  # space -> resting TokenStates in arrival order (slot = index)
+        self.moving_tokens = {}  # Maps player index to target position when moving
+        self.seconds_per_space = 20 / 60  # Time to hop one space (20 frames at 60 FPS)
+        self.jail_jump_duration = 0.6  # Seconds for the Go To Jail jump
+        self.jail_jump_height = 80  # Pixels the token arcs up during the jump
+        self._draw_list = []
+        self._draw_list_dirty = True
+        
+        self._register_token_images()
+    
+    def _register_token_images(self):
+        """Declare the token images (loaded from the atlas on first render)"""
+        for key, path in TOKEN_IMAGES.items():
+            self.assets.register(f"token_{key}", asset_path(path), self.token_size)
+    
+    def get_token_image(self, player_index):
+        """Token image for a player index (falls back to the default token), or None"""
+        if player_index in TOKEN_IMAGES:
+            image = self.assets.sprite(f"token_{player_index}")
+            if image is not None:
+                return image
+        return self.assets.sprite("token_default")
     
     def update_movements(self):
-        """Update token positions for smooth movement animation - pauses at each space"""
-        # Move tokens one space at a time toward their target, with pause at each space
-        for player_id, target_pos in list(self.moving_tokens.items()):
-            current_vis_pos = self.visual_positions.get(player_id, target_pos)
-            
-            if current_vis_pos != target_pos:
-                # Increment timer
-                if player_id not in self.movement_timers:
-                    self.movement_timers[player_id] = 0
-                
-                self.movement_timers[player_id] += 1
-                
-                # Only move to next space after waiting the required frames
-                if self.movement_timers[player_id] >= self.frames_per_space:
-                    # Reset timer
-                    self.movement_timers[player_id] = 0
-                    
-                    # Move forward one space (always forward movement on board)
-                    current_vis_pos += 1
-                    
-                    # Handle board wrapping (0-27, wraps to 0 after 27)
-                    if current_vis_pos > 27:
-                        current_vis_pos = 0
-                    
-                    self.visual_positions[player_id] = current_vis_pos
-                    
-                    # Check if reached target
-                    if current_vis_pos == target_pos:
-                        del self.moving_tokens[player_id]
-                        if player_id in self.movement_timers:
-                            del self.movement_timers[player_id]
-            else:
-                # Already at target
-                del self.moving_tokens[player_id]
-                if player_id in self.movement_timers:
-                    del self.movement_timers[player_id]
+        """Advance token movements to the current time (the scheduler may be shared - updating it twice is harmless)"""
+        self.scheduler.update()
     
-    def start_movement(self, player, target_position, start_position=None):
+    def sync_players(self, players):
         """
-        Start smooth movement animation for a player token
+        Create token states for new players (placed at their current position)
         
         Args:
-            player: Player object
-            target_position: Target board position (0-27)
-            start_position: Starting position (if None, uses current visual position or player.position)
+            players: Players or player views (anything with a position), by player index
         """
-        player_id = id(player)  # Use player object ID as unique identifier
-        self.moving_tokens[player_id] = target_position
-        self.movement_timers[player_id] = 0  # Reset timer
-        
-        # Set starting visual position
-        if start_position is not None:
-            self.visual_positions[player_id] = start_position
-        elif player_id not in self.visual_positions:
-            # If no visual position exists, use player's current position
-            # But player.position might already be updated, so we need the old position
-            # Better to pass start_position from game_window
-            self.visual_positions[player_id] = player.position
+        for player_index in range(len(self.tokens), len(players)):
+            token = self._token_for(player_index)
+            if token.xy is None:
+                self._place(token, players[player_index].position)
+    
+    def _token_for(self, player_index):
+        while len(self.tokens) <= player_index:
+            self.tokens.append(TokenState(len(self.tokens)))
+        return self.tokens[player_index]
+    
+    def _place(self, token, space):
+        """Put a token at rest on a space (updates the occupancy index)"""
+        self._lift(token)
+        group = self.occupancy.setdefault(space, [])
+        group.append(token)
+        token.space = space
+        self._update_slots(group, start=len(group) - 1)
+    
+    def _lift(self, token):
+        """Take a token off its space; the tokens after it on that space move up a slot"""
+        if token.space is None:
+            return
+        group = self.occupancy[token.space]
+        slot = group.index(token)
+        del group[slot]
+        if not group:
+            del self.occupancy[token.space]
+        else:
+            self._update_slots(group, start=slot)
+        token.space = None
+    
+    def _update_slots(self, group, start=0):
+        for slot in range(start, len(group)):
+            token = group[slot]
+            center = self.position_calc.get_token_anchor(token.space, slot)
+            self._set_center(token, center)
+    
+    def _set_center(self, token, center):
+        xy = (round(center[0]) - self.token_size[0] // 2, round(center[1]) - self.token_size[1] // 2)
+        if xy != token.xy:
+            token.xy = xy
+            self._draw_list_dirty = True
+    
+    def relayout(self):
+        """Recompute resting token positions after the board geometry changed"""
+        for group in self.occupancy.values():
+            self._update_slots(group)
+    
+    def start_movement(self, player_index, target_position, start_position=None, jump_from=None):
+        """
+        Start smooth movement animation for a player token along the board path,
+        as a track on the animation scheduler
+        
+        Args:
+            player_index: Index of the player in the players list
+            target_position: Target board position
+            start_position: Starting position (if None, uses the token's current space)
+            jump_from: Space to walk to before jumping straight to target_position
+                       (the Go To Jail space when the player was sent to Jail)
+        """
+        token = self._token_for(player_index)
+        
+        # Starting space
+        if start_position is None:
+            start_position = token.space if token.space is not None else target_position
+        
+        # Spaces walked (always forward movement on board, wraps from the last space to GO), then the optional jump
+        num_spaces = self.position_calc.num_spaces
+        walk_end = target_position if jump_from is None else jump_from
+        path = [(start_position + i) % num_spaces
+                for i in range((walk_end - start_position) % num_spaces + 1)]
+        walk_time = (len(path) - 1) * self.seconds_per_space
+        jump_time = self.jail_jump_duration if jump_from is not None else 0.0
+        if walk_time + jump_time == 0:
+            self.moving_tokens.pop(player_index, None)
+            self.scheduler.cancel(('token', player_index))
+            self._place(token, target_position)
+            return
+        
+        self._lift(token)
+        self.moving_tokens[player_index] = target_position
+        centers = self.position_calc.centers
+        jump_height = self.jail_jump_height
+        seconds_per_space = self.seconds_per_space
+        
+        def on_update(progress):
+            t = progress * (walk_time + jump_time)
+            if t < walk_time:
+                # Hop from path[hop] to path[hop + 1], easing in and out of every space
+                hop = min(int(t / seconds_per_space), len(path) - 2)
+                fraction = ease_in_out_quad(min(1.0, t / seconds_per_space - hop))
+                center = _lerp(centers[path[hop]], centers[path[hop + 1]], fraction)
+            else:
+                # Jump in an arc from the Go To Jail space to Jail
+                fraction = ease_in_out_quad(min(1.0, (t - walk_time) / jump_time)) if jump_time else 1.0
+                x, y = _lerp(centers[path[-1]], centers[target_position], fraction)
+                center = (x, y - math.sin(math.pi * fraction) * jump_height)
+            self._set_center(token, center)
+        
+        def on_complete():
+            self.moving_tokens.pop(player_index, None)
+            self._place(token, target_position)
+        
+        self.scheduler.add(Tween(walk_time + jump_time, on_update, on_complete), key=('token', player_index))
     
     def render_token(self, player, player_index, offset_index=0):
         """
-        Render a player token at their current visual position (for smooth movement)
+        Render a player token at its current (possibly in-between spaces) position
         
         Args:
             player: Player object with position attribute
             player_index: Index of player in players list (0 for Player 1, 1 for Player 2, etc.)
-            offset_index: Index for offsetting multiple tokens on same space (0, 1, 2, etc.)
+            offset_index: Unused - tokens sharing a space get their slot from the occupancy index
         """
-        player_id = id(player)
-        # Use visual position if moving, otherwise use actual position
-        if player_id in self.visual_positions:
-            render_position = self.visual_positions[player_id]
-        else:
-            render_position = player.position
-            self.visual_positions[player_id] = render_position
-        
-        # Get board position coordinates for visual position
-        x, y, w, h = self.position_calc.get_position_rect(render_position)
-        
-        # Calculate center of the space
-        center_x = x + w // 2
-        center_y = y + h // 2
-        
-        # Offset multiple tokens if they're on the same space
-        # Arrange tokens in a small grid pattern (only if multiple tokens)
-        if offset_index == 0:
-            # First token: perfectly centered
-            offset_x = 0
-            offset_y = 0
-        else:
-            # Additional tokens: small offset to avoid overlap
-            offset_x = (offset_index % 2) * 15 - 7  # -7 or +8
-            offset_y = (offset_index // 2) * 15 - 7  # -7 or +8
-        
-        token_x = center_x - self.token_size[0] // 2 + offset_x
-        token_y = center_y - self.token_size[1] // 2 + offset_y
-        
-        # Get the correct token image for this player
-        # Player 1 (index 0) uses image-removebg-preview.png
-        # Player 2 (index 1) uses image 15.png
-        if player_index == 0 and 0 in self.token_images:
-            token_image = self.token_images[0]
-        elif player_index == 1 and 1 in self.token_images:
-            token_image = self.token_images[1]
-        elif 'default' in self.token_images:
-            token_image = self.token_images['default']
-        else:
-            return  # No token image available
+        blit = self.get_token_blit(player, player_index)
+        if blit:
+            # Draw token
+            self.screen.blit(*blit)
+    
+    def get_token_blit(self, player, player_index, offset_index=0):
+        """
+        Image and top-left screen position of a player token, without drawing it
+        (see render_token for the arguments)
+        
+        Returns:
+            (image, (x, y)) or None if there is no image for this player
+        """
+        token = self._token_for(player_index)
+        if token.xy is None:
+            self._place(token, player.position)
+        
+        # Get the correct token image for this player (see TOKEN_IMAGES)
+        token_image = self.get_token_image(player_index)
+        if token_image is None:
+            return None  # No token image available
         
-        # Draw token
-        self.screen.blit(token_image, (token_x, token_y))
+        return token_image, token.xy
     
     def render_all_tokens(self, players):
         """
-        Render all player tokens, handling multiple tokens on same space
+        Render all player tokens in one batched blit
         
         Args:
-            players: List of Player objects
+            players: List of Player objects or player views (see GameView)
         """
-        # Group players by position
-        position_groups = {}
-        for i, player in enumerate(players):
-            pos = player.position
-            if pos not in position_groups:
-                position_groups[pos] = []
-            position_groups[pos].append((i, player))
-        
-        # Render tokens with offsets
-        for position, player_list in position_groups.items():
-            for offset_index, (player_index, player) in enumerate(player_list):
-                self.render_token(player, player_index, offset_index)
+        self.screen.blits(self.get_draw_list(players), doreturn=False)
+    
+    def get_draw_list(self, players):
+        """
+        All token blits in draw order (player order). Rebuilt only when a token moved,
+        so on idle frames this returns the same list as last time.
+        
+        Args:
+            players: List of Player objects or player views (see GameView)
+        
+        Returns:
+            List of (image, (x, y))
+        """
+        if len(players) != len(self.tokens):
+            self.sync_players(players)
+        if self._draw_list_dirty:
+            draw_list = []
+            for token in self.tokens[:len(players)]:
+                image = self.get_token_image(token.index)
+                if image is not None and token.xy is not None:
+                    draw_list.append((image, token.xy))
+            self._draw_list = draw_list
+            self._draw_list_dirty = False
+        return self._draw_list
+
+
+class TokenState:
+    """Where one player's token is: resting on a space (space, slot) or in motion (space None)"""
+    
+    __slots__ = ('index', 'space', 'xy')
+    
+    def __init__(self, index):
+        self.index = index  # Player index (picks the token image)
+        self.space = None  # Space it rests on, None while moving
+        self.xy = None  # Top-left screen position
+
 
+def _lerp(a, b, fraction):
+    return (a[0] + (b[0] - a[0]) * fraction, a[1] + (b[1] - a[1]) * fraction)
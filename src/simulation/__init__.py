@@ -0,0 +1 @@
+# Headless simulation of the game rules (no pygame / Arduino needed)
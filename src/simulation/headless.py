@@ -0,0 +1,228 @@
+"""
+Headless game simulation
+Drives the GameState rules without pygame, a window, or an InputHandler,
+so thousands of games can be played to completion from a script.
+
+Usage:
+    python -m src.simulation.headless --games 10000 --players 4 --seed 1
+"""
+import argparse
+import random
+import time
+from src.game_logic.game_state import GameState
+from src.simulation.policies import AlwaysBuyPolicy, CashReservePolicy, NeverBuyPolicy, RandomBuyPolicy
+
+
+class TurnResult:
+    """What happened during a single player turn"""
+    def __init__(self, player_index, skipped=False, dice_roll=0, new_position=None, action='nothing',
+                 property_obj=None, bought=False, rent_paid=0, went_to_jail=False, went_bankrupt=False):
+        self.player_index = player_index
+        self.skipped = skipped  # True if the player sat out the turn in jail
+        self.dice_roll = dice_roll
+        self.new_position = new_position  # Position after the move (7 if sent to jail)
+        self.action = action  # Action returned by GameState.handle_landing
+        self.property_obj = property_obj
+        self.bought = bought
+        self.rent_paid = rent_paid
+        self.went_to_jail = went_to_jail
+        self.went_bankrupt = went_bankrupt
+
+
+class HeadlessGame:
+    """Plays one game using GameState and a buy/pass policy per player"""
+
+    def __init__(self, num_players=2, policies=None, rng=None, max_turns=1000, event_log=None, board=None):
+        """
+        Args:
+            num_players: Number of players in the game
+            policies: A single policy for every player, or a list with one policy per player
+                      (default: AlwaysBuyPolicy)
+            rng: Optional random.Random instance for dice rolls (seed it for reproducible games)
+            max_turns: Stop the game after this many turns even if nobody has won
+            event_log: Optional EventLog that records every state change for replay
+            board: Board to play on (default: the default board)
+        """
+        if policies is None:
+            policies = AlwaysBuyPolicy()
+        if not isinstance(policies, (list, tuple)):
+            policies = [policies] * num_players
+        if len(policies) != num_players:
+            raise ValueError(f"Need one policy per player, got {len(policies)} for {num_players} players")
+
+        self.policies = list(policies)
+        self.max_turns = max_turns
+        self.turns_played = 0
+
+        self.game_state = GameState(rng=rng, board=board)
+        self.game_state.event_log = event_log
+        self.game_state.initialize_all_properties()
+        for i in range(num_players):
+            self.game_state.add_player(f"Player {i + 1}", "sim")
+
+    def is_over(self):
+        """Game ends when one player is left or the turn limit is reached"""
+        return len(self.game_state.get_active_players()) <= 1 or self.turns_played >= self.max_turns
+
+    def play_turn(self):
+        """
+        Play the current player's turn and advance to the next player.
+        Mirrors the roll -> move -> land -> buy/rent flow of GameWindow.run.
+
+        Returns:
+            TurnResult describing the turn
+        """
+        state = self.game_state
+        player_index = state.current_player_index
+        player = state.players[player_index]
+        result = TurnResult(player_index)
+
+        should_skip, reason = state.should_skip_turn(player)
+        if should_skip:
+            result.skipped = True
+        else:
+            dice_roll, new_position, passed_go, landed_on_go, went_to_jail = state.roll_and_move(player)
+            result.dice_roll = dice_roll
+            result.new_position = new_position
+            result.went_to_jail = went_to_jail
+
+            # handle_landing pays rent itself, so remember the cash and the rent owed beforehand
+            money_before = player.money
+            property_obj = state.get_property_at_position(new_position)
+            rent_owed = 0
+            if property_obj is not None and property_obj.can_collect_rent_from(player):
+                rent_owed = property_obj.get_rent()
+
+            action, property_obj, message = state.handle_landing(player, new_position)
+            result.action = action
+            result.property_obj = property_obj
+
+            if action == 'buy':
+                if self.policies[player_index].should_buy(state, player, property_obj):
+                    result.bought, message = state.buy_property(player, property_obj)
+            elif action == 'rent':
+                result.rent_paid = money_before - player.money
+                if money_before < rent_owed:
+                    state.declare_bankruptcy(player)
+                    result.went_bankrupt = True
+
+        self.turns_played += 1
+        state.next_turn()
+        return result
+
+    def play(self):
+        """
+        Play until the game is over.
+
+        Returns:
+            Index of the winning player (richest active player if the turn limit was hit)
+        """
+        while not self.is_over():
+            self.play_turn()
+        return self.get_winner_index()
+
+    def get_winner_index(self):
+        """Index of the richest player still in the game, or None if nobody is left"""
+        active = [i for i, player in enumerate(self.game_state.players) if not player.bankrupt]
+        if not active:
+            return None
+        return max(active, key=lambda i: self.game_state.players[i].money)
+
+
+class BatchResult:
+    """Summary of a batch of headless games"""
+    def __init__(self, num_games, total_turns, finished_games, wins, elapsed):
+        self.num_games = num_games
+        self.total_turns = total_turns
+        self.finished_games = finished_games  # Games that ended by bankruptcy (not the turn limit)
+        self.wins = wins  # wins[i] = games won by player i
+        self.elapsed = elapsed  # Wall-clock seconds
+
+    @property
+    def games_per_sec(self):
+        return self.num_games / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def turns_per_sec(self):
+        return self.total_turns / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        """Human readable summary"""
+        lines = [
+            f"Games: {self.num_games} ({self.finished_games} ended by bankruptcy)",
+            f"Turns: {self.total_turns} ({self.total_turns / max(self.num_games, 1):.1f} per game)",
+            f"Time: {self.elapsed:.2f}s",
+            f"Throughput: {self.games_per_sec:,.0f} games/sec, {self.turns_per_sec:,.0f} turns/sec",
+        ]
+        for i, count in enumerate(self.wins):
+            lines.append(f"Player {i + 1} wins: {count}")
+        return "\n".join(lines)
+
+
+def game_rng(seed, game_index):
+    """
+    Independent, reproducible dice RNG for one game of a batch.
+    Seeding from a string is deterministic across processes and Python runs.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f"{seed}:{game_index}")
+
+
+def run_games(num_games, num_players=2, policies=None, seed=None, max_turns=1000):
+    """
+    Play a batch of headless games to completion and measure throughput.
+
+    Args:
+        num_games: Number of games to play
+        num_players: Players per game
+        policies: Policy or list of per-player policies (see HeadlessGame)
+        seed: Base seed; game i uses game_rng(seed, i). None for unseeded games.
+        max_turns: Per-game turn limit
+
+    Returns:
+        BatchResult
+    """
+    total_turns = 0
+    finished_games = 0
+    wins = [0] * num_players
+
+    start = time.perf_counter()
+    for game_index in range(num_games):
+        game = HeadlessGame(num_players, policies, game_rng(seed, game_index), max_turns)
+        winner = game.play()
+        total_turns += game.turns_played
+        if len(game.game_state.get_active_players()) <= 1:
+            finished_games += 1
+        if winner is not None:
+            wins[winner] += 1
+    elapsed = time.perf_counter() - start
+
+    return BatchResult(num_games, total_turns, finished_games, wins, elapsed)
+
+
+POLICIES = {
+    'always': lambda args: AlwaysBuyPolicy(),
+    'never': lambda args: NeverBuyPolicy(),
+    'reserve': lambda args: CashReservePolicy(args.reserve),
+    'random': lambda args: RandomBuyPolicy(0.5),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Monopoly games and report throughput")
+    parser.add_argument("--games", type=int, default=1000, help="Number of games to play")
+    parser.add_argument("--players", type=int, default=2, help="Players per game")
+    parser.add_argument("--seed", type=int, default=None, help="Base RNG seed for reproducible runs")
+    parser.add_argument("--max-turns", type=int, default=1000, help="Turn limit per game")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default='always', help="Buy/pass policy for every player")
+    parser.add_argument("--reserve", type=int, default=200, help="Cash kept back by the 'reserve' policy")
+    args = parser.parse_args()
+
+    policy = POLICIES[args.policy](args)
+    result = run_games(args.games, args.players, policy, args.seed, args.max_turns)
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
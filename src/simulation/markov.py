@@ -0,0 +1,277 @@
+"""
+Exact Markov-chain model of token movement on the board
+Builds the turn-to-turn transition matrix implied by GameState.move_player and
+GameState.should_skip_turn, then solves for landing probabilities, expected rent
+and payback times analytically instead of sampling games.
+
+States are the start-of-turn situation of one player:
+    0..board_size-1   free, standing on that position
+    board_size        in jail, must skip this turn (just sent there by Go To Jail)
+    board_size + 1    in jail, already skipped (released and rolls this turn)
+On a board without Jail or Go To Jail the two jail states are left out.
+
+Price and rent edits only recompute the derived per-property numbers; changing a
+movement rule (dice, jail positions) rebuilds the matrix and re-solves.
+
+Usage:
+    python -m src.simulation.markov --players 4
+"""
+import argparse
+import numpy as np
+from src.game_logic.game_state import BUYABLE_TYPES, GameState
+
+# Parameters that change the transition matrix (everything else is per-property data)
+MOVEMENT_RULES = ('board_size', 'jail_position', 'go_to_jail_position', 'dice_sides', 'num_dice')
+
+
+def dice_distribution(sides=6, num_dice=1):
+    """
+    Probability of each dice total.
+
+    Returns:
+        NumPy array where dist[total] = probability (index 0 unused)
+    """
+    dist = np.zeros(1)
+    dist[0] = 1.0
+    face = np.zeros(sides + 1)
+    face[1:] = 1.0 / sides
+    for _ in range(num_dice):
+        dist = np.convolve(dist, face)
+    return dist
+
+
+def _scipy_sparse():
+    """scipy.sparse and its linalg module, with an install hint if scipy is missing"""
+    try:
+        from scipy import sparse
+        from scipy.sparse import linalg
+    except ImportError as e:
+        raise ImportError("MarkovBoardModel(sparse=True) / --sparse needs scipy: "
+                          "pip install -r requirements.txt (or pip install scipy)") from e
+    return sparse, linalg
+
+
+class MarkovBoardModel:
+    """Analytic landing-probability model for one token"""
+
+    def __init__(self, game_state=None, num_players=2, sparse=False, board_size=None, jail_position=None,
+                 go_to_jail_position=None, dice_sides=6, num_dice=1):
+        """
+        Args:
+            game_state: GameState to take property prices/rents from (default: initialize_all_properties board)
+            num_players: Players in the game (rent comes from num_players - 1 opponents)
+            sparse: Build the transition matrix as a scipy.sparse matrix (needs scipy)
+            board_size, jail_position, go_to_jail_position: Board layout (see GameState.move_player;
+                default: game_state's board)
+            dice_sides, num_dice: Dice rolled each turn (see GameState.roll_dice)
+        """
+        if game_state is None:
+            game_state = GameState()
+            game_state.initialize_all_properties()
+
+        board = game_state.board
+        if board_size is None:
+            board_size = board.size
+        if jail_position is None:
+            jail_position = board.jail_position
+        if go_to_jail_position is None:
+            go_to_jail_position = board.go_to_jail_position
+
+        if sparse:
+            _scipy_sparse()  # Fail here, not on first use, if scipy is missing
+        self.num_players = num_players
+        self.sparse = sparse
+        self.board_size = board_size
+        self.jail_position = jail_position
+        self.go_to_jail_position = go_to_jail_position
+        self.dice_sides = dice_sides
+        self.num_dice = num_dice
+
+        self.price = np.zeros(board_size)
+        self.rent = np.zeros(board_size)
+        self.rentable = np.zeros(board_size, dtype=bool)
+        for property_obj in game_state.properties:
+            self.price[property_obj.position] = property_obj.price
+            self.rent[property_obj.position] = property_obj.base_rent
+            self.rentable[property_obj.position] = property_obj.property_type in BUYABLE_TYPES
+
+        # Cached results, invalidated by set_rule / set_property_values
+        self._transition = None
+        self._landing = None
+        self._stationary = None
+        self._landing_probabilities = None
+
+    @property
+    def has_jail(self):
+        """True if Go To Jail can send the token to Jail (the chain then has the two jail states)"""
+        return self.jail_position is not None and self.go_to_jail_position is not None
+
+    @property
+    def num_states(self):
+        return self.board_size + 2 if self.has_jail else self.board_size
+
+    def set_rule(self, name, value):
+        """
+        Change one movement rule and drop the cached solution.
+
+        Args:
+            name: One of MOVEMENT_RULES
+            value: New value
+        """
+        if name not in MOVEMENT_RULES:
+            raise ValueError(f"Unknown rule '{name}', expected one of {MOVEMENT_RULES}")
+        if getattr(self, name) == value:
+            return
+        if name == 'board_size':
+            self._resize(value)
+        setattr(self, name, value)
+        self._transition = None
+        self._landing = None
+        self._stationary = None
+        self._landing_probabilities = None
+
+    def _resize(self, board_size):
+        """Keep per-property data for positions that still exist"""
+        keep = min(board_size, self.board_size)
+        for name in ('price', 'rent', 'rentable'):
+            old = getattr(self, name)
+            new = np.zeros(board_size, dtype=old.dtype)
+            new[:keep] = old[:keep]
+            setattr(self, name, new)
+
+    def set_property_values(self, position, price=None, rent=None):
+        """
+        Change a property's price and/or rent. Landing probabilities are unaffected,
+        so nothing is re-solved.
+        """
+        if price is not None:
+            self.price[position] = price
+        if rent is not None:
+            self.rent[position] = rent
+
+    def _build(self):
+        """Build the start-of-turn transition matrix and the state -> landing position matrix"""
+        n = self.board_size
+        has_jail = self.has_jail
+        jailed = n if has_jail else None
+        released = n + 1 if has_jail else None
+        dist = dice_distribution(self.dice_sides, self.num_dice)
+
+        rows, cols, probs = [], [], []  # transition entries
+        land_rows, land_cols, land_probs = [], [], []  # landing entries
+        for state in range(self.num_states):
+            if state == jailed:
+                # should_skip_turn: sit out this turn, released on the next one
+                rows.append(state)
+                cols.append(released)
+                probs.append(1.0)
+                continue
+            start = self.jail_position if state == released else state
+            for roll in range(1, len(dist)):
+                if dist[roll] == 0:
+                    continue
+                landed = (start + roll) % n
+                next_state = landed
+                if has_jail and landed == self.go_to_jail_position:
+                    landed = self.jail_position
+                    next_state = jailed
+                rows.append(state)
+                cols.append(next_state)
+                probs.append(dist[roll])
+                land_rows.append(state)
+                land_cols.append(landed)
+                land_probs.append(dist[roll])
+
+        shape = (self.num_states, self.num_states)
+        landing_shape = (self.num_states, n)
+        if self.sparse:
+            sparse, _ = _scipy_sparse()
+            self._transition = sparse.csr_matrix((probs, (rows, cols)), shape=shape)
+            self._landing = sparse.csr_matrix((land_probs, (land_rows, land_cols)), shape=landing_shape)
+        else:
+            self._transition = np.zeros(shape)
+            np.add.at(self._transition, (rows, cols), probs)
+            self._landing = np.zeros(landing_shape)
+            np.add.at(self._landing, (land_rows, land_cols), land_probs)
+
+    def transition_matrix(self):
+        """Start-of-turn transition matrix P (P[i, j] = probability of going from state i to j)"""
+        if self._transition is None:
+            self._build()
+        return self._transition
+
+    def stationary_distribution(self):
+        """
+        Long-run probability of each start-of-turn state.
+        Solves pi (P - I) = 0 with sum(pi) = 1, replacing one equation by the normalisation.
+        """
+        if self._stationary is not None:
+            return self._stationary
+
+        P = self.transition_matrix()
+        n = self.num_states
+        if self.sparse:
+            sparse, linalg = _scipy_sparse()
+            A = (P.T - sparse.identity(n, format='csr')).tolil()
+            A[n - 1, :] = np.ones(n)
+            b = np.zeros(n)
+            b[n - 1] = 1.0
+            pi = linalg.spsolve(A.tocsr(), b)
+        else:
+            A = P.T - np.eye(n)
+            A[n - 1, :] = 1.0
+            b = np.zeros(n)
+            b[n - 1] = 1.0
+            pi = np.linalg.solve(A, b)
+
+        self._stationary = np.asarray(pi).ravel()
+        return self._stationary
+
+    def landing_probabilities(self):
+        """
+        Probability that a turn ends with the token on each position (turns skipped
+        in jail land nowhere, so this sums to less than 1).
+        """
+        if self._landing_probabilities is None:
+            pi = self.stationary_distribution()  # also builds self._landing
+            self._landing_probabilities = np.asarray(self._landing.T @ pi).ravel()
+        return self._landing_probabilities
+
+    def expected_rent_per_turn(self):
+        """Expected rent an owned property collects per opponent turn (0 for non-rentable spaces)"""
+        return np.where(self.rentable, self.landing_probabilities() * self.rent, 0.0)
+
+    def expected_rent_per_round(self):
+        """Expected rent per property per round (every opponent takes one turn)"""
+        return self.expected_rent_per_turn() * (self.num_players - 1)
+
+    def payback_rounds(self):
+        """Rounds until a property's rent income covers its price (inf if it never earns rent)"""
+        income = self.expected_rent_per_round()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(income > 0, self.price / income, np.inf)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve landing probabilities and rent payback exactly")
+    parser.add_argument("--players", type=int, default=2, help="Players in the game")
+    parser.add_argument("--sparse", action="store_true", help="Use scipy.sparse matrices")
+    args = parser.parse_args()
+
+    game_state = GameState()
+    game_state.initialize_all_properties()
+    model = MarkovBoardModel(game_state, num_players=args.players, sparse=args.sparse)
+
+    landing = model.landing_probabilities()
+    rent = model.expected_rent_per_round()
+    payback = model.payback_rounds()
+    print("Pos  Name              Landing %  Rent/round  Payback (rounds)")
+    for position in range(model.board_size):
+        property_obj = game_state.get_property_at_position(position)
+        name = property_obj.name if property_obj else ""
+        payback_text = f"{payback[position]:.1f}" if np.isfinite(payback[position]) else "-"
+        print(f"{position:3d}  {name:16s}  {landing[position] * 100:8.2f}  {rent[position]:10.2f}  {payback_text:>16s}")
+
+
+if __name__ == "__main__":
+    main()
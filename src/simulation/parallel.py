@@ -0,0 +1,169 @@
+"""
+Multi-core simulation runner
+Splits a large headless simulation job into fixed-size shards of games and runs
+them on a process pool.
+
+Game i always uses game_rng(seed, i) no matter which worker plays it, and the
+aggregate statistics are integer counts merged by addition, so the output is
+bit-identical for any number of workers.
+
+Usage:
+    python -m src.simulation.parallel --games 100000 --players 4 --seed 1 --workers 32
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from src.game_logic.board import load_board
+from src.simulation.headless import HeadlessGame, game_rng
+
+BOARD_SIZE = load_board().size  # HeadlessGame plays on the default board
+DEFAULT_SHARD_SIZE = 250
+
+
+class SimulationStats:
+    """Aggregate statistics for a set of games (mergeable across shards)"""
+    def __init__(self, num_players):
+        self.num_players = num_players
+        self.games = 0
+        self.turns = 0
+        self.wins = [0] * num_players
+        self.landings = [0] * BOARD_SIZE  # landings[position] = times a turn ended there
+        self.rent_income = [0] * BOARD_SIZE  # rent_income[position] = total rent collected there
+        self.bankruptcy_turns = {}  # game turn number -> number of bankruptcies on that turn
+
+    def record_game(self, game):
+        """Play a HeadlessGame to completion, recording every turn"""
+        while not game.is_over():
+            result = game.play_turn()
+            if result.skipped:
+                continue
+            self.landings[result.new_position] += 1
+            if result.rent_paid:
+                self.rent_income[result.new_position] += result.rent_paid
+            if result.went_bankrupt:
+                turn = game.turns_played
+                self.bankruptcy_turns[turn] = self.bankruptcy_turns.get(turn, 0) + 1
+
+        self.games += 1
+        self.turns += game.turns_played
+        winner = game.get_winner_index()
+        if winner is not None:
+            self.wins[winner] += 1
+
+    def merge(self, other):
+        """Add another SimulationStats into this one"""
+        self.games += other.games
+        self.turns += other.turns
+        for i in range(self.num_players):
+            self.wins[i] += other.wins[i]
+        for position in range(BOARD_SIZE):
+            self.landings[position] += other.landings[position]
+            self.rent_income[position] += other.rent_income[position]
+        for turn, count in other.bankruptcy_turns.items():
+            self.bankruptcy_turns[turn] = self.bankruptcy_turns.get(turn, 0) + count
+        return self
+
+    def landing_frequencies(self):
+        """Fraction of all landings that ended on each position"""
+        total = sum(self.landings)
+        if total == 0:
+            return [0.0] * BOARD_SIZE
+        return [count / total for count in self.landings]
+
+    def to_dict(self):
+        """Plain dict of the statistics (sorted histogram keys, for stable output)"""
+        return {
+            'games': self.games,
+            'turns': self.turns,
+            'wins': list(self.wins),
+            'landings': list(self.landings),
+            'rent_income': list(self.rent_income),
+            'bankruptcy_turns': {turn: self.bankruptcy_turns[turn] for turn in sorted(self.bankruptcy_turns)},
+        }
+
+
+def run_shard(shard):
+    """
+    Worker entry point: play games [first, first + count) of the job.
+
+    Args:
+        shard: (first, count, num_players, policies, seed, max_turns) tuple
+
+    Returns:
+        SimulationStats for the shard
+    """
+    first, count, num_players, policies, seed, max_turns = shard
+    stats = SimulationStats(num_players)
+    for game_index in range(first, first + count):
+        stats.record_game(HeadlessGame(num_players, policies, game_rng(seed, game_index), max_turns))
+    return stats
+
+
+def make_shards(num_games, num_players, policies, seed, max_turns, shard_size=DEFAULT_SHARD_SIZE):
+    """Split a job into shards; the split depends only on num_games and shard_size"""
+    shards = []
+    for first in range(0, num_games, shard_size):
+        count = min(shard_size, num_games - first)
+        shards.append((first, count, num_players, policies, seed, max_turns))
+    return shards
+
+
+def run_parallel(num_games, num_players=2, policies=None, seed=0, max_turns=1000, workers=None,
+                 shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Run a simulation job across a process pool.
+
+    Args:
+        num_games: Total number of games
+        num_players: Players per game
+        policies: Policy or list of per-player policies (must be picklable and keep no
+                  state between games for results to be independent of the worker count)
+        seed: Base seed (required for reproducible output)
+        max_turns: Per-game turn limit
+        workers: Number of worker processes (default: all cores, 1 = run in this process)
+        shard_size: Games per shard; smaller shards balance load better
+
+    Returns:
+        SimulationStats merged over all shards
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    shards = make_shards(num_games, num_players, policies, seed, max_turns, shard_size)
+
+    stats = SimulationStats(num_players)
+    if workers <= 1:
+        for shard in shards:
+            stats.merge(run_shard(shard))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_stats in executor.map(run_shard, shards):
+            stats.merge(shard_stats)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Monopoly games on all cores")
+    parser.add_argument("--games", type=int, default=10000, help="Number of games to play")
+    parser.add_argument("--players", type=int, default=2, help="Players per game")
+    parser.add_argument("--seed", type=int, default=0, help="Base RNG seed")
+    parser.add_argument("--max-turns", type=int, default=1000, help="Turn limit per game")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="Games per shard")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = run_parallel(args.games, args.players, None, args.seed, args.max_turns, args.workers, args.shard_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"Games: {stats.games}, turns: {stats.turns}, time: {elapsed:.2f}s")
+    print(f"Throughput: {stats.games / elapsed:,.0f} games/sec, {stats.turns / elapsed:,.0f} turns/sec")
+    print("Position  Landing %  Rent income")
+    for position, frequency in enumerate(stats.landing_frequencies()):
+        print(f"{position:8d}  {frequency * 100:8.2f}  {stats.rent_income[position]:11d}")
+    print("Bankruptcies by turn (first 10):", list(stats.to_dict()['bankruptcy_turns'].items())[:10])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Buy/pass policies for headless simulation
+A policy decides whether a player buys the property they landed on
+"""
+
+
+class AlwaysBuyPolicy:
+    """Buy every property the player can afford"""
+    def should_buy(self, game_state, player, property_obj):
+        return player.money >= property_obj.price
+
+
+class NeverBuyPolicy:
+    """Always pass"""
+    def should_buy(self, game_state, player, property_obj):
+        return False
+
+
+class CashReservePolicy:
+    """Buy only if the player keeps at least `reserve` dollars after the purchase"""
+    def __init__(self, reserve=200):
+        self.reserve = reserve
+    
+    def should_buy(self, game_state, player, property_obj):
+        return player.money - property_obj.price >= self.reserve
+
+
+class RandomBuyPolicy:
+    """Buy affordable properties with a fixed probability"""
+    def __init__(self, probability=0.5, rng=None):
+        """
+        Args:
+            probability: Chance (0-1) of buying an affordable property
+            rng: Optional random.Random instance. If None, the game's own RNG
+                 (game_state.rng) is used, so seeded games stay reproducible.
+        """
+        self.probability = probability
+        self.rng = rng
+    
+    def should_buy(self, game_state, player, property_obj):
+        if player.money < property_obj.price:
+            return False
+        rng = self.rng if self.rng is not None else game_state.rng
+        return rng.random() < self.probability
@@ -0,0 +1,305 @@
+"""
+Vectorized Monte Carlo engine
+Advances thousands of games in lockstep using NumPy arrays (struct-of-arrays)
+instead of one Player/Property object graph per game.
+
+Each step plays one turn in every unfinished game: jail skip/release, dice roll,
+the board wrap, the GO bonus, the Go-To-Jail redirect, buying and
+rent transfers are all batched array operations. The rules match
+GameState.should_skip_turn / move_player / handle_landing / buy_property / pay_rent
+exactly; run_reference() replays the same dice through HeadlessGame to check it.
+Board size, special positions and prices come from the GameState's Board.
+
+Usage:
+    python -m src.simulation.vectorized --games 10000 --players 4 --seed 1
+"""
+import argparse
+import time
+import numpy as np
+from src.game_logic.board import Board, load_board
+from src.game_logic.game_state import GameState
+from src.simulation.headless import HeadlessGame
+from src.simulation.policies import CashReservePolicy, NeverBuyPolicy
+
+# Jail states (mirror Player.in_jail / Player.jail_turn_skipped)
+JAIL_FREE = 0  # in_jail=False
+JAIL_MUST_SKIP = 1  # in_jail=True, jail_turn_skipped=False
+JAIL_SKIPPED = 2  # in_jail=True, jail_turn_skipped=True
+
+
+def build_board_tables(game_state=None):
+    """
+    Extract price, rent and buyable arrays from a GameState's properties.
+
+    Args:
+        game_state: GameState with properties (default: a fresh initialize_all_properties board)
+
+    Returns:
+        (price, rent, buyable) NumPy arrays indexed by board position
+    """
+    if game_state is None:
+        game_state = GameState()
+        game_state.initialize_all_properties()
+
+    board = game_state.board
+    price = np.zeros(board.size, dtype=np.int64)
+    rent = np.zeros(board.size, dtype=np.int64)
+    buyable = np.array([board.is_buyable(position) for position in range(board.size)], dtype=bool)
+    for property_obj in game_state.properties:
+        price[property_obj.position] = property_obj.price
+        rent[property_obj.position] = property_obj.base_rent
+    return price, rent, buyable
+
+
+class VectorizedSimulation:
+    """Many concurrent games stored as NumPy arrays"""
+
+    def __init__(self, num_games, num_players=2, reserve=0, seed=None, max_turns=1000, game_state=None):
+        """
+        Args:
+            num_games: Number of games advanced in lockstep
+            num_players: Players per game
+            reserve: Buy only if at least this much cash is left afterwards
+                     (0 = buy whenever affordable, None = never buy)
+            seed: Seed for the NumPy dice generator
+            max_turns: Per-game turn limit
+            game_state: Optional GameState to take the board and property prices/rents from
+        """
+        if game_state is None:
+            game_state = GameState()
+            game_state.initialize_all_properties()
+        board = game_state.board
+        self.num_games = num_games
+        self.num_players = num_players
+        self.reserve = reserve
+        self.max_turns = max_turns
+        self.rng = np.random.default_rng(seed)
+        self.board_size = board.size
+        self.go_bonus = board.go_salary
+        self.jail_position = board.jail_position
+        self.go_to_jail_position = board.go_to_jail_position  # None: the board has no Go To Jail
+        self.price, self.rent, self.buyable = build_board_tables(game_state)
+
+        shape = (num_games, num_players)
+        self.position = np.zeros(shape, dtype=np.int64)
+        self.money = np.full(shape, board.starting_money, dtype=np.int64)
+        self.jail = np.zeros(shape, dtype=np.int8)
+        self.bankrupt = np.zeros(shape, dtype=bool)
+        self.owner = np.full((num_games, self.board_size), -1, dtype=np.int64)  # -1 = bank
+        self.current = np.zeros(num_games, dtype=np.int64)
+        self.turns = np.zeros(num_games, dtype=np.int64)
+        self.landings = np.zeros(self.board_size, dtype=np.int64)
+        self.done = self._finished()
+
+    def _finished(self):
+        active = self.num_players - self.bankrupt.sum(axis=1)
+        return (active <= 1) | (self.turns >= self.max_turns)
+
+    def step(self):
+        """
+        Play one turn in every unfinished game.
+        Dice are drawn for all games every step so the stream does not depend on
+        which games have finished.
+
+        Returns:
+            Number of turns played this step
+        """
+        rolls = self.rng.integers(1, 7, size=self.num_games)
+        games = np.nonzero(~self.done)[0]
+        if games.size == 0:
+            return 0
+        players = self.current[games]
+
+        # should_skip_turn: skip once, then release on the following turn
+        jail = self.jail[games, players]
+        skip = jail == JAIL_MUST_SKIP
+        self.jail[games, players] = np.where(skip, JAIL_SKIPPED, JAIL_FREE)
+
+        g = games[~skip]
+        p = players[~skip]
+
+        # move_player: wrap, GO bonus, Go To Jail redirect
+        moved = self.position[g, p] + rolls[g]
+        new_position = moved % self.board_size
+        self.money[g, p] += np.where(moved >= self.board_size, self.go_bonus, 0)
+        if self.go_to_jail_position is not None:
+            to_jail = new_position == self.go_to_jail_position
+            new_position[to_jail] = self.jail_position
+            self.jail[g[to_jail], p[to_jail]] = JAIL_MUST_SKIP
+        self.position[g, p] = new_position
+        self.landings += np.bincount(new_position, minlength=self.board_size)
+
+        # handle_landing + buy_property
+        owner = self.owner[g, new_position]
+        money = self.money[g, p]
+        price = self.price[new_position]
+        if self.reserve is not None:
+            buy = (owner < 0) & self.buyable[new_position] & (money >= price) & (money - price >= self.reserve)
+            self.owner[g[buy], new_position[buy]] = p[buy]
+            self.money[g[buy], p[buy]] -= price[buy]
+
+        # handle_landing + pay_rent (a bankrupt player pays everything they have)
+        rent = (owner >= 0) & (owner != p)
+        rg, rp, ro = g[rent], p[rent], owner[rent]
+        owed = self.rent[new_position[rent]]
+        cash = self.money[rg, rp]
+        paid = np.minimum(cash, owed)
+        self.money[rg, rp] -= paid
+        self.money[rg, ro] += paid
+
+        # declare_bankruptcy: properties go back to the bank
+        broke = cash < owed
+        if broke.any():
+            bg, bp = rg[broke], rp[broke]
+            self.bankrupt[bg, bp] = True
+            owners = self.owner[bg]
+            owners[owners == bp[:, None]] = -1
+            self.owner[bg] = owners
+
+        # next_turn: advance to the next player who is not bankrupt
+        current = self.current[games]
+        found = np.zeros(games.size, dtype=bool)
+        for offset in range(1, self.num_players + 1):
+            candidate = (current + offset) % self.num_players
+            pick = ~found & ~self.bankrupt[games, candidate]
+            self.current[games[pick]] = candidate[pick]
+            found |= pick
+
+        self.turns[games] += 1
+        self.done = self._finished()
+        return games.size
+
+    def run(self):
+        """
+        Step until every game is finished.
+
+        Returns:
+            Total number of turns played
+        """
+        total = 0
+        while not self.done.all():
+            total += self.step()
+        return total
+
+    def winners(self):
+        """Index of the richest non-bankrupt player in each game"""
+        money = np.where(self.bankrupt, -1, self.money)
+        return money.argmax(axis=1)
+
+
+class ScheduledDice:
+    """Stand-in for random.Random that returns a preset roll (used by run_reference)"""
+    def __init__(self):
+        self.value = 1
+
+    def randint(self, a, b):
+        return self.value
+
+
+def run_reference(num_games, num_players=2, reserve=0, seed=None, max_turns=1000, board=None):
+    """
+    Play the same games as VectorizedSimulation, one GameState per game, fed the
+    identical dice stream (on board, default: the default board).
+
+    Returns:
+        List of finished HeadlessGame objects
+    """
+    if reserve is None:
+        policy = NeverBuyPolicy()
+    else:
+        policy = CashReservePolicy(reserve)
+
+    rng = np.random.default_rng(seed)
+    dice = [ScheduledDice() for _ in range(num_games)]
+    games = [HeadlessGame(num_players, policy, dice[i], max_turns, board=board) for i in range(num_games)]
+    while True:
+        live = [i for i, game in enumerate(games) if not game.is_over()]
+        if not live:
+            break
+        rolls = rng.integers(1, 7, size=num_games)
+        for i in live:
+            dice[i].value = int(rolls[i])
+            games[i].play_turn()
+    return games
+
+
+def verify_against_game_state(num_games=200, num_players=3, reserve=0, seed=0, max_turns=500, board=None):
+    """
+    Check that the vectorized engine matches GameState turn for turn.
+
+    Args:
+        board: Board to play on (default: the default board)
+
+    Raises:
+        AssertionError describing the first game that differs
+    """
+    game_state = GameState(board=board)
+    game_state.initialize_all_properties()
+    sim = VectorizedSimulation(num_games, num_players, reserve, seed, max_turns, game_state=game_state)
+    sim.run()
+    games = run_reference(num_games, num_players, reserve, seed, max_turns, board=game_state.board)
+
+    for i, game in enumerate(games):
+        state = game.game_state
+        money = [player.money for player in state.players]
+        positions = [player.position for player in state.players]
+        owners = [-1] * sim.board_size
+        for property_obj in state.properties:
+            if property_obj.owner is not None:
+                owners[property_obj.position] = state.players.index(property_obj.owner)
+        assert game.turns_played == sim.turns[i], f"game {i}: turns {game.turns_played} != {sim.turns[i]}"
+        assert money == sim.money[i].tolist(), f"game {i}: money {money} != {sim.money[i].tolist()}"
+        assert positions == sim.position[i].tolist(), f"game {i}: positions differ"
+        assert owners == sim.owner[i].tolist(), f"game {i}: ownership differs"
+        assert state.current_player_index == sim.current[i], f"game {i}: current player differs"
+
+
+def without_jail(board):
+    """Copy of board with its Jail and Go To Jail spaces turned into Free Parking (for --verify)"""
+    spaces = []
+    for position in range(board.size):
+        type_name = board.type_names[position]
+        space = {'name': board.names[position], 'type': 'parking' if type_name in ('visiting', 'jail') else type_name,
+                 'price': board.prices[position], 'rent': board.rents[position]}
+        if board.group_of(position) is not None:
+            space['group'] = board.group_of(position)
+        spaces.append(space)
+    return Board(f"{board.name} (no jail)", spaces, board.go_salary, board.starting_money, board.background)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run vectorized Monte Carlo games and report throughput")
+    parser.add_argument("--games", type=int, default=10000, help="Number of concurrent games")
+    parser.add_argument("--players", type=int, default=2, help="Players per game")
+    parser.add_argument("--seed", type=int, default=None, help="Dice RNG seed")
+    parser.add_argument("--max-turns", type=int, default=1000, help="Turn limit per game")
+    parser.add_argument("--reserve", type=int, default=0, help="Cash kept back when buying")
+    parser.add_argument("--board", default=None, help="Board file to play on (default: the default board)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check results against GameState first (on the board and a copy without jail)")
+    args = parser.parse_args()
+
+    board = load_board(args.board)
+    if args.verify:
+        for verify_board in (board, without_jail(board)):
+            verify_against_game_state(num_players=args.players, reserve=args.reserve, seed=args.seed or 0,
+                                      board=verify_board)
+            print(f"Vectorized engine matches GameState on {verify_board.name}")
+
+    game_state = GameState(board=board)
+    game_state.initialize_all_properties()
+    sim = VectorizedSimulation(args.games, args.players, args.reserve, args.seed, args.max_turns,
+                               game_state=game_state)
+    start = time.perf_counter()
+    total_turns = sim.run()
+    elapsed = time.perf_counter() - start
+
+    print(f"Games: {args.games}, turns: {total_turns}, time: {elapsed:.2f}s")
+    print(f"Throughput: {args.games / elapsed:,.0f} games/sec, {total_turns / elapsed:,.0f} turns/sec")
+    wins = np.bincount(sim.winners(), minlength=args.players)
+    for i, count in enumerate(wins):
+        print(f"Player {i + 1} wins: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+asyncio transport for the Arduino hub Serial protocol
+Same line protocol as InputHandler ("Roll", "P1,Roll", "Property: <name>"), but
+driven by an event loop on non-blocking file descriptors (Linux/macOS), so one
+process can serve several hubs and a network front end at once.
+
+Usage:
+    async def main():
+        link = await open_arduino_link('/dev/ttyACM0')
+        async for action, data in link.read_actions():
+            print(action, data)
+            link.send_property_name("JARVIS")
+"""
+import asyncio
+import os
+import termios
+import tty
+from src.utils.input_handler import ACTIONS, InputHandler
+
+
+def open_serial_fd(port, baud_rate=9600):
+    """
+    Open a Serial device (or pty) as a raw, non-blocking file descriptor.
+
+    Args:
+        port: Device path, e.g. '/dev/ttyACM0' or a pty slave from os.openpty()
+        baud_rate: Line speed (ignored by ptys)
+
+    Returns:
+        File descriptor
+    """
+    fd = os.open(port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    try:
+        tty.setraw(fd)
+        speed = getattr(termios, f"B{baud_rate}", None)
+        if speed is not None:
+            attrs = termios.tcgetattr(fd)
+            attrs[4] = speed  # input speed
+            attrs[5] = speed  # output speed
+            termios.tcsetattr(fd, termios.TCSANOW, attrs)
+    except termios.error:
+        pass  # Not a terminal (e.g. a pipe in tests) - nothing to configure
+    return fd
+
+
+class ArduinoProtocol(asyncio.Protocol):
+    """Frames incoming bytes into lines and hands them to the ArduinoLink"""
+
+    def __init__(self, link):
+        self.link = link
+        self.buffer = bytearray()
+
+    def data_received(self, data):
+        self.buffer += data
+        while True:
+            newline = self.buffer.find(b'\n')
+            if newline < 0:
+                break
+            line = self.buffer[:newline].decode('utf-8', errors='ignore').strip()
+            del self.buffer[:newline + 1]
+            if line:
+                self.link._line_received(line)
+
+    def connection_lost(self, exc):
+        self.link._connection_lost(exc)
+
+
+class ArduinoLink:
+    """One hub connection on an asyncio event loop"""
+
+    def __init__(self, port, baud_rate=9600, queue_size=64):
+        """
+        Args:
+            port: Device path of the hub
+            baud_rate: Serial speed (default 9600, same as hub.ino)
+            queue_size: Max parsed actions buffered before the oldest is dropped
+        """
+        self.port = port
+        self.baud_rate = baud_rate
+        self.actions = asyncio.Queue(maxsize=queue_size)
+        self.lines_received = 0
+        self.is_open = False
+        self._read_transport = None
+        self._write_transport = None
+        self._outbox = []  # Messages waiting for the next batched write
+        self._pending_property = None  # Latest property name waiting to be sent
+        self._flush_scheduled = False
+
+    async def open(self):
+        """Open the device and start reading"""
+        loop = asyncio.get_running_loop()
+        fd = open_serial_fd(self.port, self.baud_rate)
+        read_file = os.fdopen(fd, 'rb', buffering=0)
+        write_file = os.fdopen(os.dup(fd), 'wb', buffering=0)
+        self._read_transport, _ = await loop.connect_read_pipe(lambda: ArduinoProtocol(self), read_file)
+        self._write_transport, _ = await loop.connect_write_pipe(asyncio.Protocol, write_file)
+        self.is_open = True
+        return self
+
+    def close(self):
+        """Close the connection (pending writes are flushed first)"""
+        if not self.is_open:
+            return
+        self._flush()
+        self.is_open = False
+        self._read_transport.close()
+        self._write_transport.close()
+        self._end_actions()
+
+    def _line_received(self, line):
+        self.lines_received += 1
+        has_input, player_num, action = InputHandler.parse_arduino_message(line)
+        if not has_input or action is None or action.upper() not in ACTIONS:
+            return
+        if self.actions.full():
+            self.actions.get_nowait()  # Drop the oldest action rather than block the reader
+        self.actions.put_nowait((ACTIONS[action.upper()], {'player_num': player_num or 1, 'port': self.port}))
+
+    def _connection_lost(self, exc):
+        if self.is_open:
+            self.is_open = False
+            if exc is not None:
+                print(f"Arduino on {self.port} disconnected: {exc}")
+            self._end_actions()
+
+    def _end_actions(self):
+        """Queue the end-of-stream marker that wakes up read_actions() (dropping the oldest action if full)"""
+        if self.actions.full():
+            self.actions.get_nowait()
+        self.actions.put_nowait(None)
+
+    async def read_actions(self):
+        """
+        Async stream of (action, data) tuples, e.g. ('roll_dice', {'player_num': 1, 'port': ...}).
+        Ends when the link is closed.
+        """
+        while True:
+            item = await self.actions.get()
+            if item is None:
+                return
+            yield item
+
+    def send_to_arduino(self, message):
+        """Queue a message; everything queued in one loop iteration is written at once"""
+        self._outbox.append(message)
+        self._schedule_flush()
+
+    def send_property_name(self, property_name):
+        """
+        Queue "Property: <name>". If several names are sent before the next write,
+        only the latest one goes out.
+        """
+        if property_name:
+            self._pending_property = property_name
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self._flush_scheduled and self.is_open:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if self._pending_property is not None:
+            self._outbox.append(f"Property: {self._pending_property}")
+            self._pending_property = None
+        if not self._outbox or not self.is_open:
+            return
+        data = "".join(f"{message}\n" for message in self._outbox).encode('utf-8')
+        self._outbox = []
+        self._write_transport.write(data)
+
+
+async def open_arduino_link(port, baud_rate=9600, queue_size=64):
+    """Open a hub connection on the running event loop"""
+    link = ArduinoLink(port, baud_rate, queue_size)
+    return await link.open()
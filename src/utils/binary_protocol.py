@@ -0,0 +1,135 @@
+"""
+Compact binary framing for the InputHandler <-> hub Serial link
+Optional replacement for the text lines ("P1,Roll", "Property: <name>").
+Both sides start in text mode; the game sends HANDSHAKE_REQUEST as a text line
+and switches to binary only if the hub answers HANDSHAKE_REPLY. Hubs that do not
+know the handshake simply ignore it, so old firmware keeps working in text mode.
+A hub in binary mode that receives a text line between frames (the game restarted
+without resetting the board) switches back to text mode and handles the line, so
+"READY?" and the handshake work again.
+
+Frame layout:
+    SYNC (0xA5) | opcode | payload length | payload ... | CRC-8 of opcode, length and payload
+
+A roll from player 1 is 5 bytes (vs 9 for "P1,Roll\\r\\n") and a property update is
+5 bytes (vs up to 28 for "Property: ACADEMIC CENTER\\n").
+"""
+
+PROTOCOL_VERSION = 1
+HANDSHAKE_REQUEST = f"PROTO BIN {PROTOCOL_VERSION}"
+HANDSHAKE_REPLY = f"PROTO BIN {PROTOCOL_VERSION} OK"
+
+SYNC = 0xA5
+MAX_PAYLOAD = 32
+
+# Hub -> game (payload: player number, 0 = single player mode)
+OP_ROLL = 0x01
+OP_BUY = 0x02
+OP_PASS = 0x03
+# Game -> hub
+OP_PROPERTY_INDEX = 0x10  # payload: board position (hub looks up the name - default board only)
+OP_PROPERTY_NAME = 0x11  # payload: name bytes (other boards, or when the position is unknown)
+
+# Opcode -> action word used by InputHandler.parse_arduino_message
+ACTION_OPCODES = {OP_ROLL: "ROLL", OP_BUY: "BUY", OP_PASS: "PASS"}
+
+
+def _build_crc_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+
+CRC_TABLE = _build_crc_table()  # CRC-8, polynomial 0x07 (same as crc8() in hub.ino)
+
+
+def crc8(data):
+    """CRC-8 (poly 0x07, init 0) of a bytes-like object"""
+    crc = 0
+    for byte in data:
+        crc = CRC_TABLE[crc ^ byte]
+    return crc
+
+
+def encode_frame(opcode, payload=b''):
+    """
+    Build one frame.
+
+    Args:
+        opcode: One of the OP_* constants
+        payload: bytes (at most MAX_PAYLOAD)
+
+    Returns:
+        bytes ready to write to Serial
+    """
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload too long ({len(payload)} > {MAX_PAYLOAD})")
+    body = bytes((opcode, len(payload))) + bytes(payload)
+    return bytes((SYNC,)) + body + bytes((crc8(body),))
+
+
+def encode_property(property_name, position=None):
+    """Property update frame: board index if known, otherwise the (truncated) name"""
+    if position is not None and 0 <= position < 256:
+        return encode_frame(OP_PROPERTY_INDEX, bytes((position,)))
+    return encode_frame(OP_PROPERTY_NAME, property_name.encode('utf-8')[:MAX_PAYLOAD])
+
+
+class FrameDecoder:
+    """Incremental frame parser; resynchronises on the next SYNC byte after garbage or a bad CRC"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.errors = 0  # Frames dropped for a bad CRC or length
+
+    def feed(self, data):
+        """
+        Add received bytes.
+
+        Returns:
+            List of (opcode, payload bytes) for every complete, valid frame
+        """
+        self.buffer += data
+        frames = []
+        buffer = self.buffer
+        while True:
+            start = buffer.find(SYNC)
+            if start < 0:
+                buffer.clear()
+                break
+            if start:
+                del buffer[:start]
+            if len(buffer) < 3:
+                break
+            length = buffer[2]
+            if length > MAX_PAYLOAD:
+                self.errors += 1
+                del buffer[:1]
+                continue
+            end = 3 + length + 1
+            if len(buffer) < end:
+                break
+            body = bytes(buffer[1:end - 1])
+            if crc8(body) != buffer[end - 1]:
+                self.errors += 1
+                del buffer[:1]
+                continue
+            frames.append((body[0], body[2:]))
+            del buffer[:end]
+        return frames
+
+
+def frame_to_input(opcode, payload):
+    """
+    Convert a hub frame to InputHandler's (has_input, player_num, action) format.
+    Player 0 means no player named, like the bare text "Roll" message.
+    """
+    action = ACTION_OPCODES.get(opcode)
+    if action is None:
+        return False, 0, None
+    player_num = payload[0] if payload else 0
+    return True, player_num, action
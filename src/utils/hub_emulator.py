@@ -0,0 +1,201 @@
+"""
+Arduino hub emulator over a pseudo-terminal (Linux/macOS)
+Stands in for Uno_CODE/hub.ino: prints "Arduino Ready" (again when asked with
+READY_QUERY), sends "Roll" / "P1,Roll" style inputs and echoes
+"Received property: <name>" for every "Property: <name>" it receives.
+Point InputHandler(port=emulator.port) at it.
+
+Both directions are paced like a real UART at the configured baud rate; writes
+to the game can add random jitter before each line or be sent as unpaced bursts.
+With binary=True it also answers the binary protocol handshake (binary_protocol.py),
+and a text line received in binary mode switches it back to text, like hub.ino.
+"""
+import os
+import random
+import select
+import threading
+import time
+import tty
+from src.utils.binary_protocol import (
+    ACTION_OPCODES, HANDSHAKE_REPLY, HANDSHAKE_REQUEST, OP_PROPERTY_INDEX, OP_PROPERTY_NAME, SYNC,
+    FrameDecoder, encode_frame,
+)
+from src.utils.port_discovery import READY_BANNER, READY_QUERY
+
+BITS_PER_BYTE = 10  # 8 data bits + start + stop
+
+
+class HubEmulator:
+    """Fake hub on the master side of a pty; the slave path is self.port"""
+
+    def __init__(self, baud_rate=9600, jitter=0.0, echo=True, seed=None, binary=False, property_names=None):
+        """
+        Args:
+            baud_rate: Simulated line speed in both directions (None = no pacing)
+            jitter: Max random delay in seconds added before each line
+            echo: Echo "Received property: <name>" like hub.ino
+            seed: Seed for the jitter RNG
+            binary: Accept the binary protocol handshake (like updated hub.ino firmware)
+            property_names: Names by board position, for property-index frames
+                            (default: the board from GameState.initialize_all_properties)
+        """
+        self.baud_rate = baud_rate
+        self.jitter = jitter
+        self.echo = echo
+        self.rng = random.Random(seed)
+        self.binary = binary
+        self.binary_mode = False  # True once the handshake has switched the link to frames
+        self.frame_decoder = FrameDecoder()
+        if property_names is None:
+            from src.game_logic.game_state import GameState
+            game_state = GameState()
+            game_state.initialize_all_properties()
+            property_names = [prop.name if prop else "" for prop in game_state.properties_by_position]
+        self.property_names = property_names
+        self.port = None
+        self.master_fd = None
+        self.slave_fd = None
+        self.received_lines = []  # (timestamp, line) for every line from the game
+        self.received_properties = []  # (timestamp, name) for every "Property: <name>"
+        self.bytes_received = 0
+        self._write_lock = threading.Lock()
+        self._reader_thread = None
+        self._running = False
+
+    def start(self, announce=True):
+        """Create the pty and start listening. Returns the port path."""
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)
+        self.port = os.ttyname(self.slave_fd)
+        self._running = True
+        self._reader_thread = threading.Thread(target=self._reader_loop, name="hub-emulator", daemon=True)
+        self._reader_thread.start()
+        if announce:
+            self.send_line(READY_BANNER)
+        return self.port
+
+    def stop(self):
+        """Close the pty (the game sees the hub unplugged)"""
+        self._running = False
+        if self._reader_thread is not None:
+            self._reader_thread.join(timeout=1.0)
+        for fd in (self.master_fd, self.slave_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self.master_fd = self.slave_fd = None
+
+    def _transmit_time(self, num_bytes):
+        if not self.baud_rate:
+            return 0.0
+        return num_bytes * BITS_PER_BYTE / self.baud_rate
+
+    def send_line(self, line):
+        """
+        Send one line to the game, paced at the baud rate.
+
+        Returns:
+            time.perf_counter() when the last byte was "on the wire"
+        """
+        if self.jitter:
+            time.sleep(self.rng.uniform(0, self.jitter))
+        data = f"{line}\r\n".encode('utf-8')  # Serial.println ends lines with \r\n
+        with self._write_lock:
+            if self.baud_rate:
+                # Pace byte by byte so partial lines reach the reader like a real UART
+                delay = self._transmit_time(1)
+                for i in range(len(data)):
+                    os.write(self.master_fd, data[i:i + 1])
+                    time.sleep(delay)
+            else:
+                os.write(self.master_fd, data)
+        return time.perf_counter()
+
+    def send_frame(self, frame):
+        """Send one binary frame to the game, paced at the baud rate"""
+        if self.jitter:
+            time.sleep(self.rng.uniform(0, self.jitter))
+        with self._write_lock:
+            os.write(self.master_fd, frame)
+            time.sleep(self._transmit_time(len(frame)))
+        return time.perf_counter()
+
+    def send_burst(self, lines):
+        """Write several lines in one go (no pacing or jitter), like a buffered burst"""
+        data = "".join(f"{line}\r\n" for line in lines).encode('utf-8')
+        with self._write_lock:
+            os.write(self.master_fd, data)
+        return time.perf_counter()
+
+    def press(self, action="Roll", player_num=None):
+        """Simulate an encoder press: "Roll" or, with player_num, "P<n>,Roll" (or the binary frame)"""
+        if self.binary_mode:
+            opcode = {word: op for op, word in ACTION_OPCODES.items()}[action.upper()]
+            return self.send_frame(encode_frame(opcode, bytes((player_num or 0,))))
+        if player_num is None:
+            return self.send_line(action)
+        return self.send_line(f"P{player_num},{action}")
+
+    def _reader_loop(self):
+        buffer = bytearray()
+        while self._running:
+            try:
+                # Wake up regularly so stop() can join before closing the pty
+                readable, _, _ = select.select([self.master_fd], [], [], 0.1)
+                if not readable:
+                    continue
+                data = os.read(self.master_fd, 1024)
+            except OSError:
+                break
+            if not data:
+                break
+            # Drain no faster than the UART could deliver, so the game's writes back up realistically
+            time.sleep(self._transmit_time(len(data)))
+            self.bytes_received += len(data)
+            if self.binary_mode:
+                if data[0] == SYNC or self.frame_decoder.buffer:
+                    self._handle_frames(data)
+                    continue
+                # Text between frames: the game restarted in text mode - switch back (like hub.ino)
+                self.binary_mode = False
+                buffer.clear()
+            buffer += data
+            while True:
+                newline = buffer.find(b'\n')
+                if newline < 0:
+                    break
+                line = buffer[:newline].decode('utf-8', errors='ignore').strip()
+                del buffer[:newline + 1]
+                self._handle_line(line)
+                if self.binary_mode:
+                    # Everything after the handshake is binary
+                    self._handle_frames(bytes(buffer))
+                    buffer.clear()
+                    break
+
+    def _handle_line(self, line):
+        now = time.perf_counter()
+        self.received_lines.append((now, line))
+        if line == HANDSHAKE_REQUEST and self.binary:
+            self.send_line(HANDSHAKE_REPLY)
+            self.binary_mode = True
+        elif line == READY_QUERY:
+            self.send_line(READY_BANNER)
+        elif line.startswith("Property: "):
+            self._property_received(now, line[len("Property: "):].strip())
+
+    def _handle_frames(self, data):
+        now = time.perf_counter()
+        for opcode, payload in self.frame_decoder.feed(data):
+            if opcode == OP_PROPERTY_INDEX and payload and payload[0] < len(self.property_names):
+                self._property_received(now, self.property_names[payload[0]])
+            elif opcode == OP_PROPERTY_NAME:
+                self._property_received(now, payload.decode('utf-8', errors='ignore'))
+
+    def _property_received(self, now, name):
+        name = name[:31]  # hub.ino keeps 31 chars
+        self.received_properties.append((now, name))
+        if self.echo and not self.binary_mode:
+            self.send_line(f"Received property: {name}")
@@ -2,9 +2,19 @@
 Input handler for reading rotary encoder data from Arduino via Serial
 Maps hardware input to game actions
 """
+import os
 import serial
-import serial.tools.list_ports
+import threading
 import time
+from collections import deque
+from src.utils.binary_protocol import (
+    HANDSHAKE_REPLY, HANDSHAKE_REQUEST, FrameDecoder, encode_property, frame_to_input,
+)
+from src.utils.outbound_queue import OutboundQueue
+from src.utils.port_discovery import DEFAULT_CACHE_PATH, PortDiscovery, wait_for_ready
+
+# Hub action words -> game actions returned by process_input
+ACTIONS = {"ROLL": "roll_dice", "BUY": "buy", "PASS": "pass"}
 
 class InputHandler:
     """Handles input from Arduino rotary encoders"""
@@ -15,7 +25,8 @@ class InputHandler:
     STATE_PLAYER_TURN = "player_turn"
     STATE_MENU_NAVIGATION = "menu_navigation"
     
-    def __init__(self, port=None, baud_rate=9600, test_mode=False):
+    def __init__(self, port=None, baud_rate=9600, test_mode=False, use_reader_thread=True, queue_size=64,
+                 protocol='text', async_writes=True, auto_reconnect=True, port_cache=DEFAULT_CACHE_PATH):
         """
         Initialize input handler with Serial connection
         
@@ -24,16 +35,48 @@ class InputHandler:
                    If None, will try to auto-detect
             baud_rate: Serial communication speed (default 9600)
             test_mode: If True, simulates input for testing without Arduino
+            use_reader_thread: If True, a background thread reads and parses Serial lines
+                               so read_input never blocks the render loop
+            queue_size: Max parsed inputs buffered by the reader thread (oldest dropped when full)
+            protocol: 'text' for the line protocol, or 'binary' to negotiate compact binary frames
+                      at connect time (falls back to text if the hub does not answer)
+            async_writes: If True, outgoing messages go through a coalescing, rate-limited
+                          queue written by a background thread (see OutboundQueue)
+            auto_reconnect: If True, the reader thread reopens the hub after it is unplugged
+            port_cache: File remembering the last hub that answered (None = don't cache)
         """
         self.port = port
         self.baud_rate = baud_rate
         self.serial_connection = None
         self.current_state = self.STATE_WAITING_FOR_ROLL
-        self.last_input_time = 0
-        self.input_debounce = 0.1  # Minimum time between inputs (seconds)
+        self.last_input_times = {}  # player_num -> time of that player's last accepted input
+        self.input_debounce = 0.1  # Minimum time between inputs from the same player (seconds)
         self.test_mode = test_mode
         self.test_input_queue = []  # For testing without Arduino
         
+        # Background reader thread: parsed (has_input, player_num, action) tuples go into a
+        # bounded deque (append/popleft are atomic, so no lock is needed)
+        self.use_reader_thread = use_reader_thread
+        self.input_queue = deque(maxlen=queue_size)
+        self.reader_thread = None
+        self._stop_reader = threading.Event()
+        
+        # Optional binary framing (see binary_protocol.py)
+        self.protocol = protocol
+        self.binary_mode = False
+        self.frame_decoder = FrameDecoder()
+        
+        # Outbound message queue (created on connect)
+        self.async_writes = async_writes
+        self.outbound = None
+        
+        # Port discovery, readiness detection and hot-plug reconnect (see port_discovery.py)
+        self.discovery = PortDiscovery(baud_rate, cache_path=port_cache)
+        self.ready_timeout = 2.5  # Max wait for "Arduino Ready" after opening the port
+        self.auto_reconnect = auto_reconnect
+        self.reconnect_interval = 1.0  # Seconds between reconnect attempts
+        self.device_fingerprint = None  # USB identity of the connected hub, for finding it again
+        
     def connect(self):
         """Connect to Arduino via Serial"""
         if self.test_mode:
@@ -42,69 +85,258 @@ class InputHandler:
             
         try:
             if self.port is None:
-                # Try to auto-detect Arduino port
-                self.port = self._find_arduino_port()
+                # Try to auto-detect Arduino port (probes candidates for "Arduino Ready")
+                # discover() already saved the fingerprint of a port that answered
+                self.port, self.serial_connection, ready, self.device_fingerprint = self.discovery.discover()
                 if self.port is None:
-                    print("Could not find Arduino port. Please specify port manually.")
+                    print("Could not find Arduino port. Please specify port manually (--port).")
                     return False
-            
-            self.serial_connection = serial.Serial(self.port, self.baud_rate, timeout=0.1)
-            time.sleep(2)  # Wait for Arduino to reset
+            else:
+                self.serial_connection = serial.Serial(self.port, self.baud_rate, timeout=0.1)
+                # Wait for the Arduino to reset and announce itself (instead of a fixed sleep)
+                ready = wait_for_ready(self.serial_connection, self.ready_timeout, on_line=self._queue_line)
+                if ready:
+                    self.device_fingerprint = self.discovery.remember(self.port)
+            if not ready:
+                print(f"No \"Arduino Ready\" from {self.port} - continuing anyway")
             print(f"Connected to Arduino on {self.port}")
+            if self.protocol == 'binary':
+                self._negotiate_binary()
+            if self.use_reader_thread:
+                self.start_reader()
+            if self.async_writes:
+                self.outbound = OutboundQueue(self._write, self.baud_rate)
+                self.outbound.start()
             return True
         except Exception as e:
             print(f"Failed to connect to Arduino: {e}")
             return False
     
-    def _find_arduino_port(self):
-        """Try to find Arduino port automatically"""
-        ports = serial.tools.list_ports.comports()
-        for port in ports:
-            # Common Arduino identifiers
-            if 'arduino' in port.description.lower() or 'usb' in port.description.lower():
-                return port.device
-        # If no Arduino found, return first available port (for testing)
-        if ports:
-            return ports[0].device
+    def _queue_line(self, line):
+        """Parse a line received outside the reader thread and queue the input"""
+        parsed = self._parse_line(line)
+        if parsed is not None:
+            self.input_queue.append(parsed)
+    
+    def reconnect(self):
+        """
+        Reopen the hub after it was unplugged: the last port used, or wherever the same
+        USB device shows up again (its path may change after re-plugging).
+        
+        Returns:
+            True if the hub is connected again
+        """
+        if self.serial_connection is not None:
+            self._close_serial()
+        device = self.port
+        if not os.path.exists(device):
+            device = self.discovery.find_device(self.device_fingerprint) or device
+        try:
+            connection = serial.Serial(device, self.baud_rate, timeout=0.1)
+            if not wait_for_ready(connection, self.ready_timeout, on_line=self._queue_line):
+                connection.close()
+                return False
+        except (serial.SerialException, OSError):
+            return False
+        
+        self.port = device
+        self.binary_mode = False  # The hub restarted in text mode
+        self.frame_decoder = FrameDecoder()
+        self.serial_connection = connection
+        if self.outbound is not None:
+            self.outbound.reset()  # The hub restarted - resend even what it showed before
+        print(f"Reconnected to Arduino on {device}")
+        if self.protocol == 'binary':
+            self._negotiate_binary()
+        return True
+    
+    def _negotiate_binary(self, timeout=1.0):
+        """
+        Ask the hub to switch to binary frames. Lines received meanwhile are still
+        parsed, so no input is lost. Stays in text mode if the hub does not reply.
+        """
+        self.serial_connection.write(f"{HANDSHAKE_REQUEST}\n".encode('utf-8'))
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            line = self.serial_connection.readline().decode('utf-8', errors='ignore').strip()
+            if line == HANDSHAKE_REPLY:
+                self.binary_mode = True
+                print("Using binary protocol")
+                return True
+            self._queue_line(line)
+        print("Hub did not answer binary handshake - using text protocol")
+        return False
+    
+    def start_reader(self):
+        """Start the background thread that reads and parses Serial input"""
+        if self.reader_thread is not None and self.reader_thread.is_alive():
+            return
+        self._stop_reader.clear()
+        self.reader_thread = threading.Thread(target=self._reader_loop, name="arduino-reader", daemon=True)
+        self.reader_thread.start()
+    
+    def stop_reader(self):
+        """Stop the background reader thread"""
+        self._stop_reader.set()
+        if self.reader_thread is not None:
+            self.reader_thread.join(timeout=1.0)
+            self.reader_thread = None
+    
+    def _reader_loop(self):
+        """
+        Reader thread: frame bytes into lines, parse them, queue the inputs.
+        Partial lines stay buffered here instead of stalling the render loop.
+        """
+        buffer = bytearray()
+        while not self._stop_reader.is_set():
+            try:
+                # Blocks for at most the Serial timeout (0.1 s) - only this thread waits
+                data = self.serial_connection.read(self.serial_connection.in_waiting or 1)
+            except Exception as e:
+                print(f"Error reading Serial: {e}")
+                if not self.auto_reconnect:
+                    # Nothing will reopen the port - close it so read_input stops using it
+                    self._close_serial()
+                    break
+                if not self._wait_for_reconnect():
+                    break
+                buffer.clear()
+                continue
+            if not data:
+                continue
+            
+            if self.binary_mode:
+                self._handle_frames(data)
+                continue
+            
+            buffer += data
+            while True:
+                newline = buffer.find(b'\n')
+                if newline < 0:
+                    break
+                line = buffer[:newline].decode('utf-8', errors='ignore').strip()
+                del buffer[:newline + 1]
+                self._queue_line(line)
+    
+    def _close_serial(self):
+        """Close the Serial port, ignoring errors from a device that is already gone"""
+        try:
+            self.serial_connection.close()
+        except Exception:
+            pass
+    
+    def _wait_for_reconnect(self):
+        """Reader thread: retry reconnect() until it works or the reader is stopped"""
+        print("Arduino disconnected - waiting for it to come back")
+        while not self._stop_reader.is_set():
+            if self.reconnect():
+                return True
+            self._stop_reader.wait(self.reconnect_interval)
+        return False
+    
+    def _parse_line(self, line):
+        """
+        Debounce and parse one line from the Arduino.
+        
+        Returns:
+            (True, player_num, action) or None if the line is not an input
+        """
+        if not line:
+            return None
+        
+        # Parse the message using helper function
+        has_input, player_num, action = self.parse_arduino_message(line)
+        if has_input and self._debounce(player_num):
+            return True, player_num, action
         return None
     
+    def _handle_frames(self, data):
+        """Decode binary frames from received bytes and queue the inputs"""
+        for opcode, payload in self.frame_decoder.feed(data):
+            has_input, player_num, action = frame_to_input(opcode, payload)
+            if has_input and self._debounce(player_num):
+                self.input_queue.append((True, player_num, action))
+    
+    def _debounce(self, player_num=0):
+        """
+        Returns False if this input is too close to the previous one from the same player.
+        Presses from different players on the same hub never debounce each other.
+        """
+        current_time = time.time()
+        if current_time - self.last_input_times.get(player_num, 0) < self.input_debounce:
+            return False
+        self.last_input_times[player_num] = current_time
+        return True
+    
     def disconnect(self):
         """Close Serial connection"""
+        self.stop_reader()
+        if self.outbound is not None:
+            self.outbound.stop()  # Writes whatever is still queued
+            self.outbound = None
         if self.serial_connection and self.serial_connection.is_open:
             self.serial_connection.close()
             print("Disconnected from Arduino")
     
-    def send_to_arduino(self, message):
+    def send_to_arduino(self, message, key=None):
         """
         Send a message to Arduino via Serial.
         
         Args:
             message: String message to send to Arduino
+            key: Optional coalescing key - a newer message with the same key replaces a
+                 pending one, and a repeat of the last message written for the key is skipped
         """
         if self.test_mode:
             print(f"[TEST MODE] Would send to Arduino: {message}")
             return
         
-        if self.serial_connection is None or not self.serial_connection.is_open:
-            return
-        
-        try:
-            # Send message with newline (Arduino typically reads line by line)
-            message_with_newline = f"{message}\n"
-            self.serial_connection.write(message_with_newline.encode('utf-8'))
-        except Exception as e:
-            print(f"Error sending message to Arduino: {e}")
+        # Send message with newline (Arduino typically reads line by line)
+        self._send(f"{message}\n".encode('utf-8'), key)
     
-    def send_property_name(self, property_name):
+    def send_property_name(self, property_name, position=None):
         """
         Send the current property name to Arduino.
-        Format: "Property: <name>"
+        Format: "Property: <name>" (text mode), or a property-index frame (binary mode)
         
         Args:
             property_name: Name of the property the player is on
+            position: Board position of the property (lets binary mode send one byte instead of the name);
+                      None to send the name, e.g. on a board hub.ino's name table does not describe
         """
-        if property_name:
-            self.send_to_arduino(f"Property: {property_name}")
+        if not property_name:
+            return
+        if self.binary_mode:
+            self._send(encode_property(property_name, position), key='property')
+        else:
+            self.send_to_arduino(f"Property: {property_name}", key='property')
+    
+    def _send(self, data, key=None):
+        """Queue bytes on the outbound queue, or write them now if there is none"""
+        if self.outbound is not None and self.outbound.is_running():
+            if key is None:
+                self.outbound.put(data, data, dedup=False, keyed=False)  # Only merges identical pending messages
+            else:
+                self.outbound.put(key, data)
+        else:
+            self._write(data)
+    
+    def get_outbound_stats(self):
+        """Write/coalescing counters and latencies of the outbound queue (empty if not running)"""
+        if self.outbound is None:
+            return {}
+        return dict(self.outbound.stats)
+    
+    def _write(self, data):
+        """Write raw bytes to the Arduino. Returns False if nothing was written."""
+        if self.serial_connection is None or not self.serial_connection.is_open:
+            return False
+        try:
+            self.serial_connection.write(data)
+            return True
+        except Exception as e:
+            print(f"Error sending message to Arduino: {e}")
+            return False
     
     def set_state(self, state):
         """Set the current game state"""
@@ -114,7 +346,8 @@ class InputHandler:
         """Get current game state"""
         return self.current_state
     
-    def parse_arduino_message(self, message):
+    @staticmethod
+    def parse_arduino_message(message):
         """
         Parse message from Arduino.
         Format: "Roll", "Buy", "Pass" (single player mode)
@@ -126,7 +359,8 @@ class InputHandler:
         Returns:
             (has_input: bool, player_num: int, action: str)
             - has_input: True if message contains valid input
-            - player_num: Player number (1 for single player, or from message)
+            - player_num: Player number from a "P<n>," message, or 0 if the message names no
+                          player (a bare "Roll" belongs to whoever's turn it is)
             - action: Action string (e.g., "Roll", "Buy", "Pass") or None
         """
         message = message.strip()
@@ -153,8 +387,8 @@ class InputHandler:
         # Single player mode: just action words like "Roll", "Buy", "Pass"
         message_upper = message.upper()
         if message_upper in ["ROLL", "BUY", "PASS"]:
-            # Single player mode - always player 1
-            return True, 1, message_upper
+            # Not addressed to a player - process_input gives it to the current player
+            return True, 0, message_upper
         
         # Fallback: try to parse old format for backwards compatibility
         message_lower = message.lower()
@@ -193,6 +427,27 @@ class InputHandler:
                 return self.test_input_queue.pop(0)
             return False, 0, None
         
+        if self.reader_thread is not None and not self.reader_thread.is_alive():
+            # The reader gave up after a read error - say so once, then poll (nothing, if the port is closed)
+            print("Arduino reader stopped - Serial input is disconnected" if not self.serial_connection.is_open
+                  else "Arduino reader stopped - polling Serial instead")
+            self.reader_thread = None
+        
+        if self.reader_thread is None and self.binary_mode and self.serial_connection is not None:
+            # Polling mode with binary frames: decode whatever has arrived
+            try:
+                waiting = self.serial_connection.in_waiting
+                if waiting:
+                    self._handle_frames(self.serial_connection.read(waiting))
+            except Exception as e:
+                print(f"Error reading Serial: {e}")
+        
+        if self.reader_thread is not None or self.input_queue:
+            # Input already parsed (reader thread, handshake or binary frames) - take the next one
+            if self.input_queue:
+                return self.input_queue.popleft()
+            return False, 0, None
+        
         if self.serial_connection is None or not self.serial_connection.is_open:
             return False, 0, None
         
@@ -201,21 +456,9 @@ class InputHandler:
             if self.serial_connection.in_waiting > 0:
                 # Read line from Serial
                 line = self.serial_connection.readline().decode('utf-8', errors='ignore').strip()
-                
-                if not line:
-                    return False, 0, None
-                
-                # Debounce: ignore inputs too close together
-                current_time = time.time()
-                if current_time - self.last_input_time < self.input_debounce:
-                    return False, 0, None
-                self.last_input_time = current_time
-                
-                # Parse the message using helper function
-                has_input, player_num, action = self.parse_arduino_message(line)
-                
-                if has_input:
-                    return True, player_num, action
+                parsed = self._parse_line(line)
+                if parsed is not None:
+                    return parsed
                 
         except Exception as e:
             print(f"Error reading Serial: {e}")
@@ -240,37 +483,25 @@ class InputHandler:
         if not has_input:
             return None
         
-        # Single player mode: if we have an action, process it (always for player 1)
-        if action:
-            action_upper = action.upper()
-            
-            # In single player mode, always accept actions (only one player)
-            if action_upper == "ROLL":
-                return ('roll_dice', {'player_num': 1})
-            elif action_upper == "BUY":
-                return ('buy', {'player_num': 1})
-            elif action_upper == "PASS":
-                return ('pass', {'player_num': 1})
-        
-        # Multi-player format: "P1,Roll" style messages (for compatibility)
-        if player_num > 0 and action:
-            action_upper = action.upper()
-            
-            # Check if this is for the current player
-            current_player_index = 0
-            if game_state:
-                current_player_index = game_state.current_player_index
-            
-            # Player numbers are 1-indexed, current_player_index is 0-indexed
-            if player_num == (current_player_index + 1):
-                # This message is for the current player
-                if action_upper == "ROLL":
-                    return ('roll_dice', {'player_num': player_num})
-                elif action_upper == "BUY":
-                    return ('buy', {'player_num': player_num})
-                elif action_upper == "PASS":
-                    return ('pass', {'player_num': player_num})
+        if not action or action.upper() not in ACTIONS:
+            return None
+        action_name = ACTIONS[action.upper()]
+        
+        # Single player mode: always accept actions (only one player)
+        if game_state is None or len(game_state.players) <= 1:
+            return (action_name, {'player_num': 1})
+        
+        # Player numbers are 1-indexed, current_player_index is 0-indexed
+        current_player_num = game_state.current_player_index + 1
+        # A bare "Roll" / "Buy" / "Pass" (one hub for the table) is the current player's
+        if player_num == 0:
+            return (action_name, {'player_num': current_player_num})
+        
+        # Multi-player format: "P1,Roll" style messages are only accepted on that player's turn
+        if player_num == current_player_num:
+            return (action_name, {'player_num': player_num})
         
+        # Another player's press is dropped here - InputMultiplexer queues it per player instead
         return None
     
     # ========== TESTING HELPER FUNCTIONS ==========
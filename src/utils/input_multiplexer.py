@@ -0,0 +1,174 @@
+"""
+Input multiplexer for several Arduino controllers at one table
+Reads every controller's InputHandler, routes each press to the player it belongs
+to and keeps a small bounded queue per player, so presses from different players
+that land close together are all kept (debounce is per controller and player).
+
+Usage:
+    mux = InputMultiplexer()
+    mux.add_controller(InputHandler(port='/dev/ttyACM0'))             # "P1,Roll" ... "P6,Roll"
+    mux.add_controller(InputHandler(port='/dev/ttyACM1'), player_num=3)  # one controller per player
+    mux.connect()
+    action = mux.process_input(game_state)  # Next action for the current player
+"""
+from collections import deque
+from src.utils.input_handler import ACTIONS, InputHandler
+
+
+class Controller:
+    """One input source (an InputHandler) and the player it is bound to, if any"""
+
+    __slots__ = ('handler', 'player_num', 'index', 'presses', 'connected')
+
+    def __init__(self, handler, player_num=None, index=0):
+        self.handler = handler
+        self.index = index
+        self.player_num = player_num  # None = take the player from the message ("P2,Roll")
+        self.presses = 0
+        self.connected = False
+
+    @property
+    def name(self):
+        return self.handler.port or f"controller-{self.index}"
+
+
+class InputMultiplexer:
+    """Routes actions from several controllers to per-player queues"""
+
+    def __init__(self, queue_size=4):
+        """
+        Args:
+            queue_size: Max actions kept per player (the oldest is dropped when full)
+        """
+        self.queue_size = queue_size
+        self.controllers = []
+        self.player_queues = {}  # player_num -> deque of (action, data)
+        self.dropped = 0  # Actions lost to full player queues
+        self.ignored = 0  # Inputs without a known action or player
+        self.stale = 0  # Actions discarded because they were made before the player's turn
+        self.turn_player = None  # Player whose turn process_input last served
+
+    def add_controller(self, handler, player_num=None):
+        """
+        Add an input source.
+
+        Args:
+            handler: InputHandler for the controller's Serial port (or one in test mode)
+            player_num: Bind every press from this controller to one player (1-indexed).
+                        If None, the player number comes from the message ("P2,Roll"),
+                        and bare "Roll" / "Buy" / "Pass" go to player 1.
+
+        Returns:
+            The Controller entry
+        """
+        controller = Controller(handler, player_num, len(self.controllers))
+        self.controllers.append(controller)
+        return controller
+
+    def add_port(self, port, player_num=None, **handler_args):
+        """Create an InputHandler for port and add it (see add_controller)"""
+        return self.add_controller(InputHandler(port=port, **handler_args), player_num)
+
+    def connect(self):
+        """Connect every controller. Returns True if at least one connected."""
+        for controller in self.controllers:
+            controller.connected = controller.handler.connect()
+        return any(controller.connected for controller in self.controllers)
+
+    def disconnect(self):
+        """Disconnect every controller"""
+        for controller in self.controllers:
+            controller.handler.disconnect()
+            controller.connected = False
+
+    def get_queue(self, player_num):
+        """Bounded action queue for a player (created on first use)"""
+        queue = self.player_queues.get(player_num)
+        if queue is None:
+            queue = self.player_queues[player_num] = deque(maxlen=self.queue_size)
+        return queue
+
+    def poll(self):
+        """
+        Drain every controller's pending input into the player queues.
+        Debouncing already happened per controller and player in each InputHandler.
+
+        Returns:
+            Number of actions routed
+        """
+        routed = 0
+        for controller in self.controllers:
+            handler = controller.handler
+            while True:
+                has_input, player_num, action = handler.read_input()
+                if not has_input:
+                    break
+                game_action = ACTIONS.get(action.upper()) if action else None
+                player_num = controller.player_num or player_num or 1  # Bare "Roll" -> player 1
+                if game_action is None or player_num <= 0:
+                    self.ignored += 1
+                    continue
+                queue = self.get_queue(player_num)
+                if len(queue) == queue.maxlen:
+                    self.dropped += 1
+                queue.append((game_action, {'player_num': player_num, 'controller': controller.name}))
+                controller.presses += 1
+                routed += 1
+        return routed
+
+    def next_action(self, player_num):
+        """Pop the oldest queued action for a player, or None"""
+        queue = self.player_queues.get(player_num)
+        if queue:
+            return queue.popleft()
+        return None
+
+    def clear_player(self, player_num):
+        """Discard a player's queued actions (e.g. presses made while it was not their turn)"""
+        queue = self.player_queues.get(player_num)
+        if queue:
+            queue.clear()
+
+    def process_input(self, game_state=None):
+        """
+        The next action for the current player, or None (returns the same tuples as
+        InputHandler.process_input). Unlike InputHandler, which drops other players'
+        presses, these stay queued while the turn lasts; when a player's turn starts,
+        the presses they made before it are discarded, so they never replay as stale rolls.
+
+        Returns:
+            (action: str, data: dict) or None
+            data contains: 'player_num' (1-indexed) and 'controller' (port it came from)
+        """
+        player_num = 1
+        if game_state:
+            player_num = game_state.current_player_index + 1
+        if player_num != self.turn_player:
+            # A new turn: whatever this player pressed while waiting is stale
+            self.turn_player = player_num
+            queue = self.player_queues.get(player_num)
+            if queue:
+                self.stale += len(queue)
+                queue.clear()
+        self.poll()
+        return self.next_action(player_num)
+
+    def send_to_arduino(self, message, key=None):
+        """Send a message to every connected controller"""
+        for controller in self.controllers:
+            controller.handler.send_to_arduino(message, key)
+
+    def send_property_name(self, property_name, position=None):
+        """Send the current property name to every connected controller"""
+        for controller in self.controllers:
+            controller.handler.send_property_name(property_name, position)
+
+    def get_stats(self):
+        """Per-controller press counts and per-player queue depths"""
+        return {
+            'controllers': {controller.name: controller.presses for controller in self.controllers},
+            'queued': {player_num: len(queue) for player_num, queue in self.player_queues.items()},
+            'dropped': self.dropped,
+            'ignored': self.ignored,
+            'stale': self.stale,
+        }
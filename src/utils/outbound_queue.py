@@ -0,0 +1,160 @@
+"""
+Outbound message queue for the Arduino Serial link
+Messages are queued by key and written by a background thread:
+  - a newer message replaces a pending one with the same key (coalescing)
+  - a keyed message identical to the last one written for that key is dropped (dedup)
+  - writes are paced to what the link can carry at its baud rate
+  - when the queue is full, the oldest one-off unkeyed message is dropped; the
+    pending message for a key is the only copy of that key's latest state, so
+    it is never dropped - if every pending message is keyed, the new one is refused
+"""
+import threading
+import time
+from collections import OrderedDict
+
+BITS_PER_BYTE = 10  # 8 data bits + start + stop
+
+
+class OutboundQueue:
+    """Coalescing, rate-limited writer for one Serial connection"""
+
+    def __init__(self, write, baud_rate=9600, max_pending=32):
+        """
+        Args:
+            write: Function that writes bytes to the link; returns False (or raises) if the write failed
+            baud_rate: Link speed used for pacing (None = no pacing)
+            max_pending: Max queued messages; when full the oldest unkeyed message is dropped
+                         (the new message is refused if all pending ones are keyed)
+        """
+        self.write = write
+        self.baud_rate = baud_rate
+        self.max_pending = max_pending
+        self.pending = OrderedDict()  # key -> (data, time queued, keyed)
+        self.last_sent = {}  # key -> data last written
+        self.stats = {
+            'queued': 0,
+            'written': 0,
+            'coalesced': 0,  # Replaced by a newer message before being written
+            'deduplicated': 0,  # Same as what the hub already has
+            'dropped': 0,  # Queue full (dropped or refused)
+            'failed': 0,  # write() failed
+            'bytes_written': 0,
+            'write_time': 0.0,  # Seconds spent inside write()
+            'last_latency': 0.0,  # Seconds from put() to write completion
+            'max_latency': 0.0,
+        }
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._next_free = 0.0  # When the link will have drained the previous write
+
+    def put(self, key, data, dedup=True, keyed=True):
+        """
+        Queue a message.
+
+        Args:
+            key: Coalescing key (e.g. 'property')
+            data: bytes to write
+            dedup: Drop the message if it equals the last one written for this key
+            keyed: False for one-off messages (key is then just the data, merging identical
+                   pending copies) - these are dropped first when the queue is full
+
+        Returns:
+            True if the message will be written
+        """
+        with self._condition:
+            if dedup and self.last_sent.get(key) == data:
+                # The hub already shows this - also cancel anything still pending for the key
+                if self.pending.pop(key, None) is not None:
+                    self.stats['coalesced'] += 1
+                self.stats['deduplicated'] += 1
+                return False
+
+            self.stats['queued'] += 1
+            if key in self.pending:
+                self.stats['coalesced'] += 1
+                queued_at = self.pending[key][1]
+                self.pending[key] = (data, queued_at, keyed)  # Keeps its place in the queue
+            else:
+                if len(self.pending) >= self.max_pending and not self._drop_one():
+                    self.stats['dropped'] += 1
+                    return False
+                self.pending[key] = (data, time.perf_counter(), keyed)
+            self._condition.notify()
+            return True
+
+    def _drop_one(self):
+        """Make room by dropping the oldest unkeyed message. Returns False if every pending message is keyed."""
+        for key, (_, _, keyed) in self.pending.items():
+            if not keyed:
+                del self.pending[key]
+                self.stats['dropped'] += 1
+                return True
+        return False
+
+    def reset(self):
+        """
+        Forget what was last written (call after the link reconnects - the hub restarted
+        and shows nothing, so the same message must be sent again)
+        """
+        with self._condition:
+            self.last_sent.clear()
+
+    def start(self):
+        """Start the writer thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._writer_loop, name="arduino-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Write what is still pending (up to timeout) and stop the writer thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _writer_loop(self):
+        while True:
+            with self._condition:
+                while not self.pending and not self._stopping:
+                    self._condition.wait()
+                if not self.pending:
+                    return
+                key, (data, queued_at, _) = self.pending.popitem(last=False)
+
+            # Don't hand the link more than it can carry
+            now = time.perf_counter()
+            if self._next_free > now:
+                time.sleep(self._next_free - now)
+
+            start = time.perf_counter()
+            try:
+                written = self.write(data) is not False
+            except Exception as e:
+                print(f"Outbound write failed: {e}")
+                written = False
+            end = time.perf_counter()
+            if self.baud_rate:
+                self._next_free = max(start, self._next_free) + len(data) * BITS_PER_BYTE / self.baud_rate
+
+            latency = end - queued_at
+            with self._condition:
+                if not written:
+                    # The hub's state is unknown now - don't let dedup skip the next message for the key
+                    self.last_sent.pop(key, None)
+                    self.stats['failed'] += 1
+                    continue
+                # Only what actually reached the link counts for dedup
+                self.last_sent[key] = data
+                self.stats['written'] += 1
+                self.stats['bytes_written'] += len(data)
+                self.stats['write_time'] += end - start
+                self.stats['last_latency'] = latency
+                self.stats['max_latency'] = max(self.stats['max_latency'], latency)
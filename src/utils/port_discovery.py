@@ -0,0 +1,238 @@
+"""
+Serial port discovery for the Arduino hub
+Finds the hub by probing candidate ports in parallel for the "Arduino Ready" banner
+instead of guessing from port descriptions, and remembers the device that answered
+(USB VID/PID/serial number) on disk so the next start tries it first - even if it
+comes back under a different device path.
+
+Opening a Serial port resets an Uno, which then prints "Arduino Ready" from setup().
+Boards that do not reset are asked with READY_QUERY, which hub.ino answers with the
+same banner, so readiness is detected either way instead of sleeping a fixed time.
+"""
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import serial
+import serial.tools.list_ports
+
+READY_BANNER = "Arduino Ready"
+READY_QUERY = "READY?"
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".monopoly_arduino.json")
+
+# USB vendor IDs of Arduino boards and the USB-serial chips used on clones
+ARDUINO_VIDS = {
+    0x2341: "Arduino",
+    0x2A03: "Arduino.org",
+    0x1A86: "CH340",
+    0x0403: "FTDI",
+    0x10C4: "CP210x",
+}
+
+
+def fingerprint(port_info):
+    """Identity of a USB serial device that survives re-plugging (device path may change)"""
+    return {
+        'device': port_info.device,
+        'vid': port_info.vid,
+        'pid': port_info.pid,
+        'serial_number': port_info.serial_number,
+    }
+
+
+def matches_fingerprint(port_info, cached):
+    """True if port_info is the cached device (by USB identity, or by path if it has none)"""
+    if not cached:
+        return False
+    if cached.get('vid') is not None:
+        if (port_info.vid, port_info.pid) != (cached['vid'], cached['pid']):
+            return False
+        if cached.get('serial_number'):
+            return port_info.serial_number == cached['serial_number']
+    return port_info.device == cached.get('device')
+
+
+def score_port(port_info, cached=None):
+    """How likely a port is the hub (0 = not worth probing)"""
+    if matches_fingerprint(port_info, cached):
+        return 100
+    if port_info.vid in ARDUINO_VIDS:
+        return 50
+    description = (port_info.description or "").lower()
+    if 'arduino' in description:
+        return 40
+    if 'usb' in description or 'acm' in port_info.device.lower():
+        return 10
+    return 0
+
+
+def wait_for_ready(connection, timeout=2.5, query_interval=0.5, on_line=None):
+    """
+    Wait until the hub prints READY_BANNER.
+
+    Args:
+        connection: Open serial.Serial (with a short read timeout)
+        timeout: Seconds to wait before giving up
+        query_interval: Seconds between READY_QUERY messages
+        on_line: Optional callback for other lines received meanwhile
+
+    Returns:
+        True if the banner arrived
+    """
+    deadline = time.perf_counter() + timeout
+    next_query = 0.0
+    while time.perf_counter() < deadline:
+        now = time.perf_counter()
+        if now >= next_query:
+            connection.write(f"{READY_QUERY}\n".encode('utf-8'))
+            next_query = now + query_interval
+        line = connection.readline().decode('utf-8', errors='ignore').strip()
+        if line == READY_BANNER:
+            return True
+        if line and on_line is not None:
+            on_line(line)
+    return False
+
+
+def probe_port(device, baud_rate=9600, timeout=2.5):
+    """
+    Open a port and wait for the banner.
+
+    Returns:
+        (open serial.Serial or None, ready: bool)
+    """
+    try:
+        connection = serial.Serial(device, baud_rate, timeout=0.1)
+    except (serial.SerialException, OSError):
+        return None, False
+    try:
+        return connection, wait_for_ready(connection, timeout)
+    except (serial.SerialException, OSError):
+        connection.close()
+        return None, False
+
+
+class PortDiscovery:
+    """Finds the hub's port and remembers it between runs"""
+
+    def __init__(self, baud_rate=9600, cache_path=DEFAULT_CACHE_PATH, timeout=2.5, max_workers=4):
+        """
+        Args:
+            baud_rate: Serial speed used for probing
+            cache_path: JSON file with the last device that answered (None = no cache)
+            timeout: Max seconds to wait for a banner on each port
+            max_workers: Ports probed at the same time
+        """
+        self.baud_rate = baud_rate
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+    def load_cached(self):
+        """Last known good device fingerprint, or None"""
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def remember(self, device):
+        """
+        Save the fingerprint of device (a port path) as the last known good hub.
+
+        Returns:
+            The fingerprint, or None if device is not a listed Serial port (e.g. a pty)
+        """
+        port_info = self.find_port_info(device)
+        if port_info is None:
+            return None
+        cached = fingerprint(port_info)
+        if not self.cache_path or cached == self.load_cached():
+            return cached
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump(cached, f)
+        except OSError as e:
+            print(f"Could not save Arduino port cache: {e}")
+        return cached
+
+    @staticmethod
+    def find_port_info(device):
+        for port_info in serial.tools.list_ports.comports():
+            if port_info.device == device:
+                return port_info
+        return None
+
+    def candidates(self):
+        """
+        Ports worth probing, most likely first. Ports that do not look like a USB-serial
+        device are never probed (writing READY_QUERY to arbitrary devices is not safe) -
+        pass the port explicitly for those.
+        """
+        cached = self.load_cached()
+        scored = [(score_port(port_info, cached), port_info) for port_info in serial.tools.list_ports.comports()]
+        scored = [item for item in scored if item[0] > 0]
+        scored.sort(key=lambda item: -item[0])
+        return [port_info.device for _, port_info in scored]
+
+    @staticmethod
+    def find_device(device_fingerprint):
+        """Current path of a device if it is plugged in (it may have moved after re-plugging), else None"""
+        if not device_fingerprint:
+            return None
+        for port_info in serial.tools.list_ports.comports():
+            if matches_fingerprint(port_info, device_fingerprint):
+                return port_info.device
+        return None
+
+    def discover(self):
+        """
+        Probe every candidate in parallel; the first port to print the banner wins.
+        If none does, the most likely candidate is used (old firmware without a banner reply).
+
+        Returns:
+            (device, open serial.Serial, ready: bool, fingerprint), or (None, None, False, None) if
+            no candidate opened. fingerprint is what remember() saved for a ready device, else None.
+        """
+        devices = self.candidates()
+        if not devices:
+            return None, None, False, None
+
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(devices)),
+                                      thread_name_prefix="port-probe")
+        futures = {executor.submit(probe_port, device, self.baud_rate, self.timeout): device
+                   for device in devices}
+        try:
+            for future in as_completed(futures):
+                device = futures[future]
+                connection, ready = future.result()
+                if ready:
+                    # Close the ports still being probed once they finish
+                    for other, other_device in futures.items():
+                        if other is not future and other_device not in results:
+                            other.add_done_callback(_close_probe)
+                    for other_connection, _ in results.values():
+                        other_connection.close()
+                    return device, connection, True, self.remember(device)
+                if connection is not None:
+                    results[device] = (connection, ready)
+        finally:
+            executor.shutdown(wait=False)
+
+        # Nobody answered - fall back to the best ranked port that opened
+        chosen = next((device for device in devices if device in results), None)
+        for device, (connection, _) in results.items():
+            if device != chosen:
+                connection.close()
+        if chosen is None:
+            return None, None, False, None
+        return chosen, results[chosen][0], False, None
+
+
+def _close_probe(future):
+    connection, _ = future.result()
+    if connection is not None:
+        connection.close()
@@ -1,103 +1,222 @@
 """
 Calculate screen positions for Monopoly board spaces
-Maps board position (0-27) to screen coordinates
-28 total spaces: 4 corners + 6 properties per side
+Maps board position to screen coordinates
+A board has 4 corners and the same number of spaces on each side
+(28 spaces = 4 corners + 6 properties per side on the default board)
+
+Rects, centers and token anchors are computed once per board size into integer
+lookup tables, so every query is a list read. Rect edges are snapped to whole
+pixels so neighbouring spaces tile without gaps or overlaps.
 """
+from bisect import bisect_right
+from src.game_logic.board import load_board
+
+MAX_TOKEN_SLOTS = 8  # Tokens that can share a space without sharing an anchor
+
 
 class PositionCalculator:
     """Calculates screen coordinates for board positions"""
-    
-    def __init__(self, board_size, margin, corner_size, cell_size):
+
+    def __init__(self, board_size, margin, corner_size, cell_size, num_spaces=None):
         """
         Initialize position calculator
-        
+
         Args:
             board_size: Size of the board square
             margin: Margin from screen edge
             corner_size: Size of corner spaces
             cell_size: Size of regular property spaces
+            num_spaces: Spaces on the board, a multiple of 4 (default: the default board's size)
         """
+        self.num_spaces = num_spaces if num_spaces is not None else load_board().size
+        self.cells_per_side = self.num_spaces // 4 - 1  # Spaces between two corners
+        self._geometry = None
+        self.update(board_size, margin, corner_size, cell_size)
+
+    def update(self, board_size, margin, corner_size, cell_size):
+        """Rebuild the lookup tables if the board geometry changed"""
+        geometry = (board_size, margin, corner_size, cell_size)
+        if geometry == self._geometry:
+            return
+        self._geometry = geometry
         self.board_size = board_size
         self.margin = margin
         self.corner_size = corner_size
         self.cell_size = cell_size
-        
-    def get_position_rect(self, board_position):
-        """
-        Get the screen rectangle for a board position (0-27)
-        
-        Board layout (starting from bottom-right, going counter-clockwise):
-        - Position 0: Bottom-right corner
-        - Positions 1-6: Bottom row (right to left) - 6 properties
-        - Position 7: Bottom-left corner
-        - Positions 8-13: Left column (bottom to top) - 6 properties
-        - Position 14: Top-left corner
-        - Positions 15-20: Top row (left to right) - 6 properties
-        - Position 21: Top-right corner
-        - Positions 22-27: Right column (top to bottom) - 6 properties
-        
-        Returns:
-            (x, y, width, height) tuple for the property space
-        """
+        self._build_tables()
+
+    def _build_tables(self):
+        """Integer-snapped rect, center, anchor and hit-test tables for every space"""
+        # The board is a grid (corner, cells, corner on each side) with the spaces around the rim.
+        # Snapping the grid lines once keeps shared edges identical on opposite sides.
+        m = self.margin
+        c = self.corner_size
+        t = self.cell_size
+        float_edges = [m] + [m + c + i * t for i in range(self.cells_per_side + 1)] + [m + self.board_size]
+        self.x_edges = self.y_edges = [round(edge) for edge in float_edges]
+
+        self.rects = []
+        self.centers = []
+        self.anchors = []  # position -> list of token centers, one per slot
+        self.grid = {}  # (column, row) -> position
+        for position in range(self.num_spaces):
+            fx, fy, fw, fh = self._compute_rect(position)
+            column, end_column = _nearest_edge(float_edges, fx), _nearest_edge(float_edges, fx + fw)
+            row, end_row = _nearest_edge(float_edges, fy), _nearest_edge(float_edges, fy + fh)
+            x, y = self.x_edges[column], self.y_edges[row]
+            rect = (x, y, self.x_edges[end_column] - x, self.y_edges[end_row] - y)
+            self.rects.append(rect)
+            self.grid[(column, row)] = position
+            center = (rect[0] + rect[2] // 2, rect[1] + rect[3] // 2)
+            self.centers.append(center)
+            self.anchors.append([(center[0] + dx, center[1] + dy) for dx, dy in token_slot_offsets()])
+        self._array = None
+
+    def _compute_rect(self, board_position):
+        """Unsnapped (float) rectangle of a space - used to build the tables"""
         m = self.margin
         c = self.corner_size
         t = self.cell_size
         bs = self.board_size
-        
+        side = self.cells_per_side + 1  # Positions from one corner to the next
+
         # Position 0: Bottom-right corner
         if board_position == 0:
             return (m + bs - c, m + bs - c, c, c)
-        
-        # Positions 1-6: Bottom row (right to left)
-        elif 1 <= board_position <= 6:
+
+        # Bottom row (right to left)
+        elif board_position < side:
             idx = board_position - 1
             x = m + bs - c - (idx + 1) * t
             return (x, m + bs - c, t, c)
-        
-        # Position 7: Bottom-left corner
-        elif board_position == 7:
+
+        # Bottom-left corner (Jail on the default board)
+        elif board_position == side:
             return (m, m + bs - c, c, c)
-        
-        # Positions 8-13: Left column (bottom to top)
-        elif 8 <= board_position <= 13:
-            idx = board_position - 8
+
+        # Left column (bottom to top)
+        elif board_position < 2 * side:
+            idx = board_position - side - 1
             y = m + bs - c - (idx + 1) * t
             return (m, y, c, t)
-        
-        # Position 14: Top-left corner
-        elif board_position == 14:
+
+        # Top-left corner
+        elif board_position == 2 * side:
             return (m, m, c, c)
-        
-        # Positions 15-20: Top row (left to right)
-        elif 15 <= board_position <= 20:
-            idx = board_position - 15
+
+        # Top row (left to right)
+        elif board_position < 3 * side:
+            idx = board_position - 2 * side - 1
             x = m + c + idx * t
             return (x, m, t, c)
-        
-        # Position 21: Top-right corner
-        elif board_position == 21:
+
+        # Top-right corner (Go To Jail on the default board)
+        elif board_position == 3 * side:
             return (m + bs - c, m, c, c)
-        
-        # Positions 22-27: Right column (top to bottom)
-        elif 22 <= board_position <= 27:
-            idx = board_position - 22
+
+        # Right column (top to bottom)
+        else:
+            idx = board_position - 3 * side - 1
             y = m + c + idx * t
             return (m + bs - c, y, c, t)
-        
-        else:
-            # Invalid position
-            return (0, 0, 0, 0)
-    
+
+    def get_position_rect(self, board_position):
+        """
+        Get the screen rectangle for a board position
+
+        Board layout (starting from bottom-right, going counter-clockwise), on the default 28-space board:
+        - Position 0: Bottom-right corner
+        - Positions 1-6: Bottom row (right to left) - 6 properties
+        - Position 7: Bottom-left corner
+        - Positions 8-13: Left column (bottom to top) - 6 properties
+        - Position 14: Top-left corner
+        - Positions 15-20: Top row (left to right) - 6 properties
+        - Position 21: Top-right corner
+        - Positions 22-27: Right column (top to bottom) - 6 properties
+
+        Returns:
+            (x, y, width, height) tuple of ints for the property space
+        """
+        if 0 <= board_position < self.num_spaces:
+            return self.rects[board_position]
+        # Invalid position
+        return (0, 0, 0, 0)
+
     def get_all_positions(self):
-        """Get all 28 positions for testing - returns list of (position, x, y, width, height)"""
-        positions = []
-        for pos in range(28):
-            x, y, w, h = self.get_position_rect(pos)
-            positions.append((pos, x, y, w, h))
-        return positions
-    
+        """Get all positions for testing - returns list of (position, x, y, width, height)"""
+        return [(pos,) + rect for pos, rect in enumerate(self.rects)]
+
     def get_position_center(self, board_position):
         """Get the center point (x, y) of a board position"""
-        x, y, w, h = self.get_position_rect(board_position)
-        return (x + w // 2, y + h // 2)
+        if 0 <= board_position < self.num_spaces:
+            return self.centers[board_position]
+        return (0, 0)
+
+    def get_token_anchor(self, board_position, slot=0):
+        """
+        Center point for a token on a space
+
+        Args:
+            board_position: Space
+            slot: Index among the tokens on that space (0 = centered); wraps after MAX_TOKEN_SLOTS
+        """
+        if 0 <= board_position < self.num_spaces:
+            return self.anchors[board_position][slot % MAX_TOKEN_SLOTS]
+        return (0, 0)
+
+    def hit_test(self, x, y):
+        """
+        Board position under a screen point (e.g. a click or touch)
+
+        Returns:
+            Position, or None if the point is not on a space
+        """
+        column = bisect_right(self.x_edges, x) - 1
+        row = bisect_right(self.y_edges, y) - 1
+        return self.grid.get((column, row))
+
+    def as_array(self):
+        """
+        Geometry tables as a NumPy int32 array of shape (num_spaces, 4 + 2 + 2 * MAX_TOKEN_SLOTS):
+        x, y, width, height, center x, center y, then x, y of each token anchor slot.
+        Built on first use (NumPy is only needed by callers of this method).
+        """
+        if self._array is None:
+            import numpy as np
+            rows = [list(rect) + list(center) + [v for anchor in anchors for v in anchor]
+                    for rect, center, anchors in zip(self.rects, self.centers, self.anchors)]
+            self._array = np.array(rows, dtype=np.int32)
+            self._array.flags.writeable = False
+        return self._array
+
+    def hit_test_many(self, points):
+        """
+        Vectorized hit_test for many points
+
+        Args:
+            points: Sequence or array of (x, y), shape (N, 2)
+
+        Returns:
+            NumPy int array of N positions (-1 where a point is not on a space)
+        """
+        import numpy as np
+        table = self.as_array()
+        points = np.asarray(points)
+        px = points[:, 0:1]
+        py = points[:, 1:2]
+        inside = ((px >= table[:, 0]) & (px < table[:, 0] + table[:, 2]) &
+                  (py >= table[:, 1]) & (py < table[:, 1] + table[:, 3]))
+        return np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+
+
+def _nearest_edge(edges, value):
+    """Index of the grid line closest to value"""
+    return min(range(len(edges)), key=lambda i: abs(edges[i] - value))
+
 
+def token_slot_offsets():
+    """(dx, dy) from a space's center for each token slot - first token centered"""
+    offsets = [(0, 0)]
+    for slot in range(1, MAX_TOKEN_SLOTS):
+        offsets.append(((slot % 2) * 15 - 7, (slot // 2) * 15 - 7))  # -7 or +8
+    return offsets
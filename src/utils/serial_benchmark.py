@@ -0,0 +1,195 @@
+"""
+Serial path benchmark against the pty hub emulator
+Measures:
+  - latency from an encoder "Roll" leaving the hub to GameWindow starting the dice animation
+  - throughput of InputHandler.send_property_name to the hub: raw (direct writes,
+    every message delivered) and through the coalescing outbound queue (only the
+    latest name matters - reports how soon the hub shows it)
+  - a burst of presses from several players arriving in one read
+
+Runs without a display (SDL dummy video driver) or an Arduino.
+
+Usage:
+    python -m src.utils.serial_benchmark --rolls 50 --baud 9600 --jitter 0.01
+"""
+import argparse
+import os
+import time
+from src.utils.hub_emulator import HubEmulator
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list (fraction 0-1)"""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure_roll_latency(emulator, rolls=20, timeout=2.0):
+    """
+    Press "Roll" on the emulator and time how long until GameWindow starts animating.
+
+    Returns:
+        (latencies in seconds, number of presses that never started an animation)
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from src.graphics.game_window import GameWindow
+
+    pygame.init()
+    window = GameWindow(port=emulator.port)
+    latencies = []
+    missed = 0
+    try:
+        for _ in range(rolls):
+            # Wait for the previous roll (dice + token movement) to settle
+            deadline = time.perf_counter() + 10.0
+            while (window.dice_animation.is_animating or window.token_renderer.moving_tokens) \
+                    and time.perf_counter() < deadline:
+                window.run_frame()
+            # Let the debounce window from echoed lines pass
+            for _ in range(10):
+                window.run_frame()
+
+            sent_at = emulator.press("Roll")
+            started = False
+            while time.perf_counter() - sent_at < timeout:
+                window.run_frame()
+                if window.dice_animation.is_animating:
+                    latencies.append(time.perf_counter() - sent_at)
+                    started = True
+                    break
+            if not started:
+                missed += 1  # Debounced, or the player was skipping a turn in jail
+    finally:
+        window.close()
+        pygame.quit()
+    return latencies, missed
+
+
+def measure_send_throughput(emulator, messages=100, names=("JARVIS", "ACADEMIC CENTER", "GO"), coalesce=False):
+    """
+    Send property names to the emulator as fast as possible.
+
+    Args:
+        coalesce: False = write every message directly (raw link throughput);
+                  True = go through the coalescing outbound queue like the game does
+                  (most messages are replaced before being written)
+
+    Returns:
+        (seconds spent inside send_property_name, seconds until the hub saw the last message,
+         messages delivered, bytes sent, outbound queue stats - empty without coalesce)
+    """
+    from src.utils.input_handler import InputHandler
+
+    handler = InputHandler(port=emulator.port, async_writes=coalesce)
+    handler.connect()
+    already_received = len(emulator.received_properties)
+    sent_bytes = 0
+    call_time = 0.0
+    start = time.perf_counter()
+    try:
+        for i in range(messages):
+            name = names[i % len(names)]
+            sent_bytes += len(f"Property: {name}\n")
+            t = time.perf_counter()
+            handler.send_property_name(name)
+            call_time += time.perf_counter() - t
+
+        # Wait for the hub to receive everything that was not coalesced away
+        # (or give up after the expected wire time x 3)
+        wire_time = sent_bytes * 10 / (emulator.baud_rate or 1e9)
+        deadline = time.perf_counter() + max(1.0, wire_time * 3)
+        while time.perf_counter() < deadline:
+            stats = handler.get_outbound_stats()
+            expected = messages if not stats else stats['written']
+            idle = not handler.outbound or not handler.outbound.pending
+            if idle and len(emulator.received_properties) - already_received >= expected:
+                break
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - start
+        delivered = len(emulator.received_properties) - already_received
+        stats = handler.get_outbound_stats()
+    finally:
+        handler.disconnect()
+    return call_time, elapsed, delivered, sent_bytes, stats
+
+
+def measure_burst_input(emulator, players=6, timeout=2.0):
+    """
+    Send one "P<n>,Roll" per player in a single unpaced write and time until
+    InputHandler has parsed them all (presses from different players are not debounced).
+
+    Returns:
+        (inputs parsed, seconds from the burst to the last parsed input)
+    """
+    from src.utils.input_handler import InputHandler
+
+    handler = InputHandler(port=emulator.port, async_writes=False)
+    handler.connect()
+    parsed = 0
+    try:
+        sent = emulator.send_burst([f"P{n},Roll" for n in range(1, players + 1)])
+        last = sent
+        deadline = sent + timeout
+        while parsed < players and time.perf_counter() < deadline:
+            has_input, _, _ = handler.read_input()
+            if has_input:
+                parsed += 1
+                last = time.perf_counter()
+            else:
+                time.sleep(0.0005)
+    finally:
+        handler.disconnect()
+    return parsed, last - sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Serial path using a pty hub emulator")
+    parser.add_argument("--rolls", type=int, default=20, help="Roll presses to time")
+    parser.add_argument("--messages", type=int, default=100, help="Property names to send")
+    parser.add_argument("--burst", type=int, default=6, help="Players pressing Roll in one burst (0 = skip)")
+    parser.add_argument("--baud", type=int, default=9600, help="Simulated baud rate (0 = unpaced)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Max random delay before each hub line (s)")
+    parser.add_argument("--seed", type=int, default=None, help="Jitter RNG seed")
+    args = parser.parse_args()
+
+    emulator = HubEmulator(baud_rate=args.baud or None, jitter=args.jitter, seed=args.seed)
+    emulator.start()
+    try:
+        latencies, missed = measure_roll_latency(emulator, args.rolls)
+        print(f"Roll -> dice animation start ({len(latencies)} samples, {missed} missed):")
+        for label, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+            print(f"  {label}: {percentile(latencies, fraction) * 1000:.1f} ms")
+        if latencies:
+            print(f"  max: {max(latencies) * 1000:.1f} ms")
+
+        # Echoes would be interleaved with the sends; measure the send path only
+        emulator.echo = False
+        call_time, elapsed, delivered, sent_bytes, _ = measure_send_throughput(emulator, args.messages)
+        print(f"send_property_name, direct writes: {args.messages} messages, {sent_bytes} bytes")
+        print(f"  time in send calls: {call_time * 1000:.2f} ms ({call_time / args.messages * 1e6:.1f} us/call)")
+        print(f"  delivered {delivered} in {elapsed * 1000:.1f} ms ({delivered / elapsed:,.0f} msg/s,"
+              f" {sent_bytes / elapsed:,.0f} bytes/s)")
+
+        call_time, elapsed, delivered, sent_bytes, stats = measure_send_throughput(emulator, args.messages,
+                                                                                   coalesce=True)
+        print(f"send_property_name, coalescing queue: {args.messages} messages")
+        print(f"  time in send calls: {call_time * 1000:.2f} ms ({call_time / args.messages * 1e6:.1f} us/call)")
+        print(f"  hub showed the latest name after {elapsed * 1000:.1f} ms ({delivered} written to the hub)")
+        if stats:
+            print(f"  outbound queue: {stats['written']} written, {stats['coalesced']} coalesced,"
+                  f" {stats['deduplicated']} deduplicated, {stats['bytes_written']} bytes,"
+                  f" max latency {stats['max_latency'] * 1000:.1f} ms")
+
+        if args.burst:
+            parsed, elapsed = measure_burst_input(emulator, args.burst)
+            print(f"Burst of {args.burst} presses in one write: {parsed} parsed in {elapsed * 1000:.1f} ms")
+    finally:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()